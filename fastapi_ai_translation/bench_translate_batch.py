@@ -0,0 +1,91 @@
+"""
+translate_batch 벤치마크: 한 번에 패딩(기존) vs 길이 버킷(TRANSLATE_BUCKETING)
+
+짧은 제목/카테고리 + 중간 길이 리뷰 + 긴 칼럼 본문이 섞인 요청을 만들어
+두 방식의 처리 시간과 tokens/sec(입력 토큰, 출력 토큰)를 비교합니다.
+
+사용 예 (fastapi_ai_translation 폴더에서, HF_MODEL 환경 변수의 모델 사용):
+    python bench_translate_batch.py
+    python bench_translate_batch.py --batch 48 --long 2 --repeat 3
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Ensure we can import from the app directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from translation.client import TranslationClient
+
+SHORT = ["음식점", "카페", "성심당", "해운대 해수욕장", "경복궁 야간 개장", "전주 한옥마을", "매일 09:00 - 21:00"]
+MEDIUM = [
+    "빵이 정말 맛있고 직원분들이 친절해요. 주말에는 줄이 길어서 오전에 가는 걸 추천합니다.",
+    "바다가 한눈에 보이는 숙소였고 조식도 깔끔했어요. 주차 공간이 조금 좁은 게 아쉬웠습니다.",
+    "야경이 예뻐서 사진 찍기 좋았어요. 입장료가 저렴하고 해설 프로그램도 있습니다.",
+]
+LONG_PARAGRAPH = (
+    "제주 동쪽 해안도로를 따라 하루 동안 돌아본 코스를 소개합니다. 아침에는 성산일출봉에 올라 해돋이를 보고, "
+    "근처 해녀의 집에서 전복죽으로 아침을 먹었습니다. 오후에는 섭지코지를 산책한 뒤 세화 해변의 작은 카페에서 "
+    "쉬었고, 저녁에는 김녕 해수욕장에서 노을을 보았습니다. 이동은 렌터카를 이용했고 각 장소 사이는 20분 안팎이라 "
+    "여유롭게 다닐 수 있었습니다. 여름에는 해변 주차장이 금방 차니 일찍 출발하는 것을 추천합니다. "
+)
+
+
+def build_workload(batch: int, long_count: int, seed: int = 42):
+    rng = random.Random(seed)
+    texts = [LONG_PARAGRAPH * rng.randint(2, 3) for _ in range(long_count)]
+    while len(texts) < batch:
+        texts.append(rng.choice(SHORT if rng.random() < 0.6 else MEDIUM))
+    rng.shuffle(texts)
+    return texts
+
+
+def run(client: TranslationClient, texts, source_lang: str, target_lang: str, bucketing: bool, repeat: int):
+    client.bucketing = bucketing
+    input_tokens = sum(len(row) for row in client.token_rows(texts, source_lang))
+
+    elapsed = []
+    outputs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        outputs = client.translate_batch(texts, source_lang, target_lang)
+        elapsed.append(time.perf_counter() - started)
+
+    output_tokens = sum(len(ids) for ids in client.tokenizer(outputs, add_special_tokens=False)["input_ids"])
+    best = min(elapsed)
+    return {
+        "seconds": best,
+        "input_tok_s": input_tokens / best,
+        "output_tok_s": output_tokens / best,
+        "output_tokens": output_tokens,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="translate_batch 길이 버킷 전/후 비교")
+    parser.add_argument("--batch", type=int, default=32, help="요청 1개의 문장 수")
+    parser.add_argument("--long", type=int, default=1, help="그중 긴 칼럼 본문 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--source", default="kor_Hang")
+    parser.add_argument("--target", default="eng_Latn")
+    args = parser.parse_args()
+
+    print("모델 로딩 중...")
+    client = TranslationClient()
+    texts = build_workload(args.batch, args.long)
+
+    # 예열
+    client.translate_batch(texts[:4], args.source, args.target)
+
+    print(f"모델: {client.model_name}, 문장 {len(texts)}개 (긴 본문 {args.long}개), 반복 {args.repeat}회")
+    print(f"{'mode':<10} {'seconds':>8} {'in tok/s':>9} {'out tok/s':>10} {'out tokens':>11}")
+    for label, bucketing in (("padded", False), ("bucketed", True)):
+        r = run(client, texts, args.source, args.target, bucketing, args.repeat)
+        print(f"{label:<10} {r['seconds']:>8.2f} {r['input_tok_s']:>9.1f} {r['output_tok_s']:>10.1f} "
+              f"{r['output_tokens']:>11}")
+
+
+if __name__ == "__main__":
+    main()
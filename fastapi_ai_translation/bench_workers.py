@@ -0,0 +1,157 @@
+"""
+멀티 워커 벤치마크: 워커 1 / 2 / 4개일 때 requests/sec 와 메모리 비교
+
+gunicorn -c gunicorn.conf.py 로 서버를 띄우고, 모든 워커의 /ready 가 통과한 뒤
+동시 클라이언트로 /api/ai/translate 를 호출합니다. (캐시에 걸리지 않도록 문장마다 번호를 붙임)
+메모리는 마스터 + 워커의 RSS 합계와 PSS 합계(공유 페이지를 프로세스 수로 나눈 값)를 함께 봅니다.
+fork-after-load 로 가중치를 공유하면 RSS 합계는 워커 수만큼 늘어 보여도 PSS 합계는 거의 그대로입니다.
+
+사용 예 (fastapi_ai_translation 폴더에서, Linux):
+    python bench_workers.py
+    python bench_workers.py --workers 1 2 4 --clients 8 --duration 30
+    python bench_workers.py --no-preload      # 워커마다 모델을 따로 로드할 때와 비교
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+API_KEY = os.getenv("AI_SERVICE_API_KEY", "secure-api-key-1234")
+
+TEXTS = [
+    "빵이 정말 맛있고 직원분들이 친절해요.",
+    "바다가 한눈에 보이는 숙소였고 조식도 깔끔했어요.",
+    "야경이 예뻐서 사진 찍기 좋았어요.",
+    "주말에는 줄이 길어서 오전에 가는 걸 추천합니다.",
+]
+
+
+def children_of(pid: int):
+    pids = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                pids.extend(int(p) for p in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def memory_kb(pid: int):
+    """(RSS, PSS) in kB"""
+    rss = pss = 0
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Rss:"):
+                    rss = int(line.split()[1])
+                elif line.startswith("Pss:"):
+                    pss = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, pss
+
+
+def wait_ready(base_url: str, workers: int, timeout: float) -> bool:
+    """서로 다른 워커 pid 가 workers 개 만큼 /ready 200 을 돌려줄 때까지 대기"""
+    ready_pids = set()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            r = requests.get(f"{base_url}/ready", timeout=2)
+            if r.status_code == 200:
+                ready_pids.add(r.json().get("pid"))
+                if len(ready_pids) >= workers:
+                    return True
+                continue
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def load(base_url: str, clients: int, duration: float):
+    counter = iter(range(10 ** 9))
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+    stop_at = time.time() + duration
+
+    def worker():
+        session = requests.Session()
+        session.headers["x-ai-api-key"] = API_KEY
+        while time.time() < stop_at:
+            with lock:
+                n = next(counter)
+            body = {"text": f"{TEXTS[n % len(TEXTS)]} ({n})", "source_lang": "kor_Hang", "target_lang": "eng_Latn"}
+            started = time.perf_counter()
+            try:
+                ok = session.post(f"{base_url}/api/ai/translate", json=body, timeout=120).status_code == 200
+            except requests.RequestException:
+                ok = False
+            with lock:
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    started = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.time() - started
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    return len(latencies) / elapsed, p95, errors[0]
+
+
+def run(workers: int, args):
+    port = args.port
+    env = dict(os.environ, TRANSLATE_WORKERS=str(workers), TRANSLATE_BIND=f"127.0.0.1:{port}",
+               TRANSLATE_PRELOAD="false" if args.no_preload else "true", AI_ENGINE="nllb")
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+                            cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        if not wait_ready(base_url, workers, args.startup_timeout):
+            print(f"{workers:>7}  워커 준비 시간 초과")
+            return
+        rps, p95, errors = load(base_url, args.clients, args.duration)
+        pids = [proc.pid] + children_of(proc.pid)
+        mem = [memory_kb(pid) for pid in pids]
+        rss = sum(m[0] for m in mem) / 1024
+        pss = sum(m[1] for m in mem) / 1024
+        print(f"{workers:>7} {rps:>8.1f} {p95 * 1000:>8.0f} {errors:>7} {rss:>11.0f} {pss:>11.0f}")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gunicorn 워커 수별 처리량/메모리 비교")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8, help="동시 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="워커 수별 부하 시간(초)")
+    parser.add_argument("--port", type=int, default=18003)
+    parser.add_argument("--startup-timeout", type=float, default=300.0)
+    parser.add_argument("--no-preload", action="store_true", help="fork 전에 모델을 로드하지 않음 (비교용)")
+    args = parser.parse_args()
+
+    print(f"preload={not args.no_preload}, clients={args.clients}, duration={args.duration}s, cpus={os.cpu_count()}")
+    print(f"{'workers':>7} {'req/s':>8} {'p95 ms':>8} {'errors':>7} {'RSS sum MB':>11} {'PSS sum MB':>11}")
+    for workers in args.workers:
+        run(workers, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+운영용 멀티 워커 실행 설정 (gunicorn + uvicorn 워커)
+
+    gunicorn -c gunicorn.conf.py main:app
+
+preload_app=True 이면 마스터가 main:app 을 import 하면서 NLLB 가중치를 한 번만 로드하고,
+그 뒤 fork 한 워커들이 읽기 전용 가중치 메모리를 copy-on-write 로 공유합니다.
+(워커 4개여도 모델 메모리는 거의 1벌. 비교: python bench_workers.py)
+
+- 마스터에서는 추론을 하지 않음 (OpenMP 스레드 풀이 fork 전에 만들어지지 않도록).
+  워밍업은 각 워커의 startup 에서 하고, 끝난 워커만 /ready 가 200 을 반환합니다.
+- 워커마다 torch intra-op 스레드 수를 고정해 워커끼리 코어를 두고 경쟁하지 않게 합니다.
+- PROMETHEUS_MULTIPROC_DIR (Dockerfile 에서 설정) 가 있으면 워커별 지표를 파일로 모아 /metrics 에서 합산합니다.
+"""
+import gc
+import os
+import shutil
+
+workers = int(os.getenv("TRANSLATE_WORKERS", "2"))
+worker_class = "uvicorn_worker.UvicornWorker"
+bind = os.getenv("TRANSLATE_BIND", "0.0.0.0:8003")
+preload_app = os.getenv("TRANSLATE_PRELOAD", "true").lower() == "true"
+# 긴 배치 번역 중에도 워커가 죽지 않도록 (uvicorn 워커의 heartbeat 는 이벤트 루프 기준)
+timeout = int(os.getenv("TRANSLATE_WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+
+# 워커당 torch 스레드 수 (기본: 코어 수 / 워커 수)
+TORCH_THREADS_PER_WORKER = int(os.getenv("TORCH_THREADS_PER_WORKER", "0")) or max(1, (os.cpu_count() or 1) // workers)
+
+# 마스터에서 torch/OpenMP 가 로드되기 전에 설정 (자식 프로세스도 그대로 물려받음)
+os.environ.setdefault("OMP_NUM_THREADS", str(TORCH_THREADS_PER_WORKER))
+os.environ.setdefault("MKL_NUM_THREADS", str(TORCH_THREADS_PER_WORKER))
+
+# preload 로 마스터가 main 을 import 할 때 지표 파일을 만들 수 있도록 폴더를 미리 준비
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if PROMETHEUS_MULTIPROC_DIR:
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def on_starting(server):
+    # 이전 실행(재시작된 컨테이너 등)의 지표 파일이 남아 있으면 합산에 섞이므로 비움
+    # (preload 중 마스터가 만든 파일도 지워지지만 마스터는 지표를 내보내지 않고, 워커는 fork 후 새 파일을 만듦)
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return
+    for name in os.listdir(PROMETHEUS_MULTIPROC_DIR):
+        path = os.path.join(PROMETHEUS_MULTIPROC_DIR, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+def when_ready(server):
+    # preload 된 객체(모델 포함)를 GC 추적 대상에서 빼서 fork 후 GC 가 페이지를 건드려 복사되는 것을 방지
+    if preload_app:
+        gc.freeze()
+    server.log.info(f"translation workers={workers}, preload={preload_app}, "
+                    f"torch threads/worker={TORCH_THREADS_PER_WORKER}")
+
+
+def post_fork(server, worker):
+    import torch
+
+    torch.set_num_threads(TORCH_THREADS_PER_WORKER)
+
+
+def child_exit(server, worker):
+    # prometheus 멀티 프로세스 모드 사용 시 종료된 워커의 지표 파일 정리
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
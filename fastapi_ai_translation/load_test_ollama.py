@@ -0,0 +1,117 @@
+"""
+OllamaAdapter 부하 테스트 (로컬 스텁 Ollama 서버 사용, 실제 모델 불필요)
+
+스텁 서버는 /api/generate 요청마다 --latency 초를 기다린 뒤 응답하고,
+--slow-every 번째 요청마다 --slow-latency 초를 기다려 타임아웃 → 원문 대체 동작도 확인합니다.
+설정별(순차 / 동시 요청 / 프롬프트 묶음)로 배치 처리 시간과 업스트림 요청 수를 비교합니다.
+
+사용 예 (fastapi_ai_translation 폴더에서):
+    python load_test_ollama.py
+    python load_test_ollama.py --texts 15 --latency 0.3 --batches 5
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ensure we can import from the app directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StubState:
+    latency = 0.2
+    slow_every = 0
+    slow_latency = 5.0
+    requests = 0
+    lock = threading.Lock()
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 로 연결 재사용 여부도 확인
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        with StubState.lock:
+            StubState.requests += 1
+            count = StubState.requests
+        slow = StubState.slow_every and count % StubState.slow_every == 0
+        time.sleep(StubState.slow_latency if slow else StubState.latency)
+
+        prompt = body.get("prompt", "")
+        if body.get("format"):
+            items = json.loads(prompt.split("Items:\n", 1)[1])
+            response = json.dumps({"translations": [{"index": it["index"], "text": f"[T] {it['text']}"}
+                                                    for it in items]}, ensure_ascii=False)
+        else:
+            original = prompt.split("Original: ", 1)[-1].rsplit("\nTranslation:", 1)[0]
+            response = f"[T] {original}"
+
+        payload = json.dumps({"model": body.get("model"), "response": response, "done": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except BrokenPipeError:
+            pass  # 어댑터가 타임아웃으로 먼저 끊은 요청
+
+
+def start_stub() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_case(label: str, texts, batches: int, concurrency: int, pack_size: int, timeout: float):
+    from translation.adapter import OllamaAdapter
+
+    adapter = OllamaAdapter(concurrency=concurrency, pack_size=pack_size, timeout=timeout)
+    StubState.requests = 0
+    fallbacks = 0
+    started = time.perf_counter()
+    for _ in range(batches):
+        results = adapter.translate_batch(texts, "kor_Hang", "eng_Latn")
+        assert len(results) == len(texts)
+        fallbacks += sum(1 for original, translated in zip(texts, results) if original == translated)
+    elapsed = time.perf_counter() - started
+    adapter.close()
+    print(f"{label:<22} {elapsed:>8.2f}s {elapsed / batches:>9.2f}s {StubState.requests:>9} {fallbacks:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OllamaAdapter 동시성/묶음 프롬프트 부하 테스트")
+    parser.add_argument("--texts", type=int, default=15, help="배치 1개의 텍스트 수")
+    parser.add_argument("--batches", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.2, help="스텁 응답 지연(초)")
+    parser.add_argument("--slow-every", type=int, default=7, help="N번째 요청마다 느린 응답 (0이면 없음)")
+    parser.add_argument("--slow-latency", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=1.0, help="어댑터 요청당 타임아웃(초)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pack", type=int, default=5)
+    args = parser.parse_args()
+
+    StubState.latency = args.latency
+    StubState.slow_every = args.slow_every
+    StubState.slow_latency = args.slow_latency
+    server = start_stub()
+    os.environ["OLLAMA_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+
+    texts = [f"테스트 문장 {i}" for i in range(args.texts)]
+    print(f"스텁 지연 {args.latency}s, {args.slow_every}번째마다 {args.slow_latency}s, 타임아웃 {args.timeout}s")
+    print(f"{'case':<22} {'total':>9} {'per batch':>10} {'requests':>9} {'fallbacks':>10}")
+    run_case("sequential (c=1)", texts, args.batches, 1, 1, args.timeout)
+    run_case(f"concurrent (c={args.concurrency})", texts, args.batches, args.concurrency, 1, args.timeout)
+    run_case(f"packed (c={args.concurrency}, p={args.pack})", texts, args.batches, args.concurrency, args.pack,
+             args.timeout)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
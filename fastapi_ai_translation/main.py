@@ -1,8 +1,11 @@
 import logging
 import os
+import threading
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from translation.router import router as translation_router, warmup_model
+from translation.router import router as translation_router, warmup_model, batcher, cache, client
+from translation.client import TranslationClient
+from translation.disk_cache import TRANSLATION_DISK_CACHE_WARM_ENTRIES
 from prometheus_fastapi_instrumentator import Instrumentator
 from dotenv import load_dotenv
 
@@ -14,6 +17,8 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="AI Translation Service")
+# PROMETHEUS_MULTIPROC_DIR 가 설정되면 (gunicorn 멀티 워커) /metrics 는 매 요청마다
+# MultiProcessCollector 레지스트리로 모든 워커의 지표 파일을 합쳐서 응답함
 Instrumentator().instrument(app).expose(app)
 
 # CORS Setup
@@ -35,7 +40,7 @@ AI_SERVICE_API_KEY = os.getenv("AI_SERVICE_API_KEY", "secure-api-key-1234")
 @app.middleware("http")
 async def verify_api_key(request: Request, call_next):
     # Health check endpoints usually don't need auth, but let's secure everything except health for safety
-    if request.url.path == "/health" or request.method == "OPTIONS":
+    if request.url.path in ("/health", "/ready") or request.method == "OPTIONS":
         return await call_next(request)
 
     api_key = request.headers.get("x-ai-api-key")
@@ -51,13 +56,68 @@ async def verify_api_key(request: Request, call_next):
 # Register Translation Router
 app.include_router(translation_router, prefix="/api/ai", tags=["translation"])
 
+# 이 워커의 모델 워밍업 완료 여부 (readiness probe)
+model_ready = False
+
+# 워밍업 실패 시 백그라운드 재시도 간격 (초, 실패할 때마다 2배, 최대값까지)
+TRANSLATE_WARMUP_RETRY_DELAY = float(os.getenv("TRANSLATE_WARMUP_RETRY_DELAY", "5"))
+TRANSLATE_WARMUP_RETRY_MAX_DELAY = float(os.getenv("TRANSLATE_WARMUP_RETRY_MAX_DELAY", "60"))
+_warmup_stop = threading.Event()
+
+
+def _retry_warmup():
+    """워밍업이 성공할 때까지 백오프하며 재시도 (성공하면 readiness 통과)"""
+    global model_ready
+    delay = TRANSLATE_WARMUP_RETRY_DELAY
+    while not _warmup_stop.wait(delay):
+        if warmup_model():
+            model_ready = True
+            return
+        delay = min(delay * 2, TRANSLATE_WARMUP_RETRY_MAX_DELAY)
+
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("AI \uBC88\uC5ED \uC11C\uBE44\uC2A4(\uD3EC\uD2B8 8003) \uC2DC\uC791...")
     # Add any model warm-up logic here if needed
     # The client initializes the model lazily or on import, check client.py behavior
-    warmup_model()
+    warmed_up = warmup_model()
+    # 번역 디스크 캐시 열기 + 최근 사용 항목을 메모리로 예열 (재시작 직후 같은 문장 재추론 방지)
+    if cache.disk is not None and cache.disk.open():
+        cache.warm_from_disk(TRANSLATION_DISK_CACHE_WARM_ENTRIES)
+    # 번역 메모리 캐시 만료 항목 정리 스레드
+    cache.start_sweeper()
+    # 단건 번역 마이크로 배치 스케줄러 (NLLB 엔진일 때만)
+    if batcher is not None:
+        batcher.start()
+    # readiness 는 이 프로세스 안의 NLLB 모델 워밍업만 기다림.
+    # 원격 엔진(Ollama/OpenAI)은 앱 로드가 끝나면 ready (원격 장애로 워커를 트래픽에서 빼지 않음)
+    global model_ready
+    model_ready = warmed_up or (client is not None and not isinstance(client, TranslationClient))
+    # 워밍업 실패 (Ollama/OpenAI 일시 장애 등) 시 백그라운드에서 성공할 때까지 재시도
+    if not warmed_up and client is not None:
+        threading.Thread(target=_retry_warmup, name="warmup-retry", daemon=True).start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    _warmup_stop.set()
+    cache.stop_sweeper()
+    # 대기 중인 디스크 캐시 기록을 마저 씀
+    if cache.disk is not None:
+        cache.disk.close()
+    if batcher is not None:
+        batcher.stop()
+    # LLM 어댑터의 연결 풀 정리 (Ollama, OpenAI)
+    if hasattr(client, "close"):
+        client.close()
 
 @app.get("/health")
 def health_check():
     return {"status": "ok", "service": "fastapi_ai_translation"}
+
+@app.get("/ready")
+def readiness_check():
+    """NLLB 엔진은 워밍업이 끝난 워커만 200 (그 전에는 503 으로 트래픽에서 제외), 원격 엔진은 앱 로드 후 200"""
+    if not model_ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up", "pid": os.getpid()})
+    return {"status": "ready", "service": "fastapi_ai_translation", "pid": os.getpid()}
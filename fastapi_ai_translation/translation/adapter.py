@@ -1,84 +1,202 @@
+import asyncio
+import json
 import os
-import requests
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+import httpx
+
+from .async_loop import BackgroundLoop
 
 logger = logging.getLogger(__name__)
 
+OLLAMA_CONCURRENCY = int(os.getenv("OLLAMA_CONCURRENCY", "4"))    # 동시에 보내는 요청 수
+OLLAMA_PACK_SIZE = int(os.getenv("OLLAMA_PACK_SIZE", "1"))        # 프롬프트 1개에 묶는 텍스트 수 (1이면 묶지 않음)
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "60"))         # 요청당 타임아웃(초), 초과 시 원문으로 대체
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "8"))
+
+# 여러 텍스트를 한 번에 번역할 때 Ollama 에 요구하는 출력 형식 (structured output)
+PACKED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "translations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    "text": {"type": "string"},
+                },
+                "required": ["index", "text"],
+            },
+        },
+    },
+    "required": ["translations"],
+}
+
+
 class OllamaAdapter:
-    """Adapter for Local LLM (Ollama) translation."""
+    """
+    Adapter for Local LLM (Ollama) translation.
+
+    연결 재사용을 위해 httpx.AsyncClient 하나를 전용 이벤트 루프 스레드에서 계속 사용하고,
+    동기 라우터에서는 translate / translate_batch 로 그 루프에 작업을 넘겨 결과를 기다립니다.
+    배치는 OLLAMA_CONCURRENCY 만큼 병렬로 보내며, OLLAMA_PACK_SIZE > 1 이면 여러 텍스트를
+    JSON 스키마 출력 프롬프트 하나로 묶어 왕복 횟수를 줄입니다.
+    """
 
-    def __init__(self):
+    def __init__(self, concurrency: int = OLLAMA_CONCURRENCY, pack_size: int = OLLAMA_PACK_SIZE,
+                 timeout: float = OLLAMA_TIMEOUT):
         self.ollama_url = os.getenv("OLLAMA_URL", "http://host.docker.internal:11434")
         self.model_name = os.getenv("OLLAMA_MODEL", "llama3")
-        logger.info(f"Initialized OllamaAdapter with URL={self.ollama_url}, Model={self.model_name}")
+        self.concurrency = max(1, concurrency)
+        self.pack_size = max(1, pack_size)
+        self.timeout = timeout
 
+        self._runner = BackgroundLoop("ollama-adapter")
+        logger.info(f"Initialized OllamaAdapter with URL={self.ollama_url}, Model={self.model_name}, "
+                    f"concurrency={self.concurrency}, pack_size={self.pack_size}")
+
+    # ---------------------------------------------------------
+    # 동기 진입점 (router 의 sync 핸들러용)
+    # ---------------------------------------------------------
     def translate(self, text: str, source_lang: str, target_lang: str, timeout: int = 60) -> str:
         """
         Ollama를 사용하여 단일 텍스트를 번역합니다.
         """
         if not text or not text.strip():
             return ""
+        return self._runner.run(self.translate_async(text, source_lang, target_lang, timeout))
+
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """
+        텍스트 목록을 번역합니다. 실패하거나 시간 초과된 텍스트는 원문으로 대체됩니다.
+        """
+        return self._runner.run(self.translate_batch_async(texts, source_lang, target_lang))
+
+    def close(self):
+        self._runner.stop(self._aclose())
+
+    async def _aclose(self):
+        http = self._runner.state.get("http")
+        if http is not None:
+            await http.aclose()
 
+    # ---------------------------------------------------------
+    # 비동기 구현
+    # ---------------------------------------------------------
+    def _client(self) -> httpx.AsyncClient:
+        """이벤트 루프 스레드 안에서만 호출 (루프에 묶인 객체를 지연 생성)"""
+        state = self._runner.state
+        if "http" not in state:
+            limits = httpx.Limits(max_connections=OLLAMA_MAX_CONNECTIONS,
+                                  max_keepalive_connections=OLLAMA_MAX_CONNECTIONS)
+            # 요청 타임아웃은 _generate 의 wait_for 가 담당 (httpx 타임아웃은 여유를 둔 안전장치)
+            state["http"] = httpx.AsyncClient(base_url=self.ollama_url, limits=limits,
+                                              timeout=httpx.Timeout(self.timeout + 30, connect=5.0))
+            state["semaphore"] = asyncio.Semaphore(self.concurrency)
+        return state["http"]
+
+    async def _generate(self, prompt: str, num_predict: int, output_format: Optional[dict] = None,
+                        temperature: float = 0.7, timeout: Optional[float] = None) -> str:
+        """/api/generate 호출. timeout 은 동시성 대기 시간을 빼고 요청 자체에만 적용"""
+        client = self._client()
+        payload = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "temperature": temperature,  # 창의성 (Creativity)
+                "num_predict": num_predict,
+            },
+        }
+        if output_format is not None:
+            payload["format"] = output_format
+        async with self._runner.state["semaphore"]:
+            response = await asyncio.wait_for(client.post("/api/generate", json=payload), timeout or self.timeout)
+        response.raise_for_status()
+        return response.json().get("response", "").strip()
+
+    async def translate_async(self, text: str, source_lang: str, target_lang: str,
+                              timeout: Optional[float] = None) -> str:
         prompt = self._build_prompt(text, source_lang, target_lang)
-        
         try:
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.7, # 창의성 (Creativity)
-                        "num_predict": 100
-                    }
-                },
-                timeout=timeout
-            )
-            response.raise_for_status()
-            result = response.json()
-            translated_text = result.get("response", "").strip()
-            
-            # 모델이 따옴표나 설명을 출력하는 경우 기본 정리
-            translated_text = self._clean_output(translated_text)
-            return translated_text
-
-        except requests.exceptions.RequestException as e:
+            translated_text = await self._generate(prompt, 100, timeout=timeout)
+        except httpx.HTTPError as e:
             logger.error(f"Ollama request failed: {e}")
             raise Exception(f"Ollama connection error: {e}")
+        # 모델이 따옴표나 설명을 출력하는 경우 기본 정리
+        return self._clean_output(translated_text)
+
+    async def _translate_or_original(self, text: str, source_lang: str, target_lang: str) -> str:
+        if not text or not text.strip():
+            return text
+        try:
+            return await self.translate_async(text, source_lang, target_lang)
+        except asyncio.TimeoutError:
+            logger.warning(f"Ollama timeout ({self.timeout}s), 원문 사용")
         except Exception as e:
-            logger.error(f"Ollama translation error: {e}")
-            raise
+            logger.warning(f"Ollama translation failed, 원문 사용: {e}")
+        return text  # Fallback to original on error
 
-    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
-        """
-        텍스트 목록을 번역합니다.
-        참고: LLM은 느리므로 배치 처리는 순차적 또는 병렬 스레드로 수행됩니다.
-        여기서는 단순성과 안정성을 위해 순차적으로 처리합니다.
-        """
-        results = []
-        for t in texts:
-            try:
-                results.append(self.translate(t, source_lang, target_lang))
-            except Exception:
-                results.append(t) # Fallback to original on error
+    async def _translate_packed(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """여러 텍스트를 프롬프트 1개로 번역. 빠진 index 는 하나씩 다시 번역"""
+        prompt = self._build_packed_prompt(texts, source_lang, target_lang)
+        by_index: Dict[int, str] = {}
+        try:
+            raw = await self._generate(prompt, 100 * len(texts), PACKED_SCHEMA, temperature=0.3)
+            for item in json.loads(raw).get("translations", []):
+                index, text = item.get("index"), item.get("text")
+                if isinstance(index, int) and 0 <= index < len(texts) and isinstance(text, str) and text.strip():
+                    by_index[index] = self._clean_output(text.strip())
+        except asyncio.TimeoutError:
+            logger.warning(f"Ollama packed timeout ({len(texts)} texts), 원문 사용")
+            return list(texts)
+        except Exception as e:
+            logger.warning(f"Ollama packed translation failed, 개별 번역으로 대체: {e}")
+
+        missing = [i for i in range(len(texts)) if i not in by_index]
+        if missing:
+            retried = await asyncio.gather(*[self._translate_or_original(texts[i], source_lang, target_lang)
+                                             for i in missing])
+            by_index.update(zip(missing, retried))
+        return [by_index[i] for i in range(len(texts))]
+
+    async def translate_batch_async(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        if not texts:
+            return []
+        if self.pack_size <= 1:
+            return list(await asyncio.gather(*[self._translate_or_original(t, source_lang, target_lang)
+                                               for t in texts]))
+
+        # 빈 문자열은 보내지 않고 그대로 둠
+        results = list(texts)
+        targets = [i for i, t in enumerate(texts) if t and t.strip()]
+        chunks = [targets[i:i + self.pack_size] for i in range(0, len(targets), self.pack_size)]
+        packed = await asyncio.gather(*[self._translate_packed([texts[i] for i in chunk], source_lang, target_lang)
+                                        for chunk in chunks])
+        for chunk, translated in zip(chunks, packed):
+            for i, text in zip(chunk, translated):
+                results[i] = text
         return results
 
+    # ---------------------------------------------------------
+    # 프롬프트
+    # ---------------------------------------------------------
+    _LANG_NAMES = {
+        "kor_Hang": "Korean",
+        "eng_Latn": "English",
+        "jpn_Jpan": "Japanese",
+        "zho_Hans": "Chinese",
+        "kor": "Korean",
+        "eng": "English",
+        "jpn": "Japanese"
+    }
+
     def _build_prompt(self, text: str, src: str, tgt: str) -> str:
         # 더 나은 프롬프팅을 위한 단순 매핑
-        lang_names = {
-            "kor_Hang": "Korean",
-            "eng_Latn": "English",
-            "jpn_Jpan": "Japanese",
-            "zho_Hans": "Chinese",
-            "kor": "Korean",
-            "eng": "English",
-            "jpn": "Japanese"
-        }
-        
-        src_name = lang_names.get(src, src)
-        tgt_name = lang_names.get(tgt, tgt)
+        src_name = self._LANG_NAMES.get(src, src)
+        tgt_name = self._LANG_NAMES.get(tgt, tgt)
 
         # 유튜브 쇼츠를 위한 프롬프트 엔지니어링
         return (
@@ -90,6 +208,19 @@ class OllamaAdapter:
             f"Translation:"
         )
 
+    def _build_packed_prompt(self, texts: List[str], src: str, tgt: str) -> str:
+        src_name = self._LANG_NAMES.get(src, src)
+        tgt_name = self._LANG_NAMES.get(tgt, tgt)
+        items = json.dumps([{"index": i, "text": t} for i, t in enumerate(texts)], ensure_ascii=False)
+        return (
+            f"You are a professional multi-lingual YouTube content creator. "
+            f"Translate each item's text from {src_name} to {tgt_name}. "
+            f"The translations must be natural, catchy, and appealing to {tgt_name} speakers. "
+            f"Return JSON {{\"translations\": [{{\"index\": <same index>, \"text\": <translation>}}]}} "
+            f"with exactly one entry per item and no explanations.\n\n"
+            f"Items:\n{items}"
+        )
+
     def _clean_output(self, text: str) -> str:
         # 존재하는 경우 주변 따옴표 제거
         if text.startswith('"') and text.endswith('"'):
@@ -0,0 +1,45 @@
+"""동기 라우터에서 LLM 어댑터의 코루틴을 실행하기 위한 전용 이벤트 루프 스레드."""
+
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Dict, Optional
+
+
+class BackgroundLoop:
+    """
+    이벤트 루프 스레드 하나를 계속 돌리고 run() 으로 코루틴을 넘겨 결과를 기다립니다.
+    루프는 처음 쓸 때 프로세스별로 만듭니다. gunicorn --preload 처럼 import 후 fork 되면
+    부모의 스레드는 자식에 없으므로 새로 만들고, 루프에 묶인 객체를 담는 state 도 비웁니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state: Dict[str, Any] = {}  # 루프에 묶인 객체 (async HTTP 클라이언트, 세마포어 등)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _ensure(self) -> asyncio.AbstractEventLoop:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._loop = asyncio.new_event_loop()
+                    threading.Thread(target=self._loop.run_forever, name=self.name, daemon=True).start()
+                    self.state = {}
+                    self._pid = os.getpid()
+        return self._loop
+
+    def run(self, coro: Awaitable):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure()).result()
+
+    def stop(self, cleanup: Optional[Awaitable] = None):
+        """cleanup 코루틴(클라이언트 종료 등)을 실행한 뒤 루프를 멈춤. 이 프로세스에서 쓴 적 없으면 아무것도 안 함."""
+        if self._pid != os.getpid():
+            if cleanup is not None:
+                cleanup.close()  # 실행하지 않은 코루틴 경고 방지
+            return
+        if cleanup is not None:
+            self.run(cleanup)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._pid = None
@@ -0,0 +1,140 @@
+"""동시 단건 번역 요청을 모아 한 번의 generate 로 처리하는 마이크로 배치 스케줄러."""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+TRANSLATE_BATCH_ENABLED = os.getenv("TRANSLATE_BATCH_ENABLED", "true").lower() == "true"
+TRANSLATE_BATCH_WINDOW_MS = float(os.getenv("TRANSLATE_BATCH_WINDOW_MS", "10"))  # 첫 요청 이후 모으는 시간
+TRANSLATE_BATCH_MAX_SIZE = int(os.getenv("TRANSLATE_BATCH_MAX_SIZE", "16"))      # generate 1회당 최대 문장 수
+TRANSLATE_REQUEST_TIMEOUT = float(os.getenv("TRANSLATE_REQUEST_TIMEOUT", "60"))  # 호출측 최대 대기(초)
+
+BATCH_SIZE = Histogram(
+    "translation_batch_size",
+    "generate 1회에 묶인 문장 수",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "translation_batch_queue_wait_seconds",
+    "요청이 대기열에 들어가서 generate 가 시작될 때까지 걸린 시간(초)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+GENERATE_SECONDS = Histogram(
+    "translation_batch_generate_seconds",
+    "배치 1개(언어쌍 1개)의 번역 시간(초)",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+QUEUE_DEPTH = Gauge("translation_batch_queue_depth", "대기 중인 단건 번역 요청 수", multiprocess_mode="livesum")
+BATCH_ERRORS = Counter("translation_batch_errors_total", "실패한 배치 수")
+
+# (text, source_lang, target_lang, future, enqueued_at)
+_Item = Tuple[str, str, str, Future, float]
+
+
+class MicroBatcher:
+    """
+    /translate 단건 요청을 짧은 시간(window) 동안 모아 (source_lang, target_lang) 별로
+    client.translate_batch 를 한 번씩 호출하고, 결과를 기다리는 호출측에 돌려줍니다.
+    추론은 전용 스레드 하나에서만 실행되므로 요청마다 generate 가 CPU 코어를 나눠 갖지 않습니다.
+    """
+
+    def __init__(self, client, window_ms: float = TRANSLATE_BATCH_WINDOW_MS,
+                 max_batch: int = TRANSLATE_BATCH_MAX_SIZE):
+        self.client = client
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[_Item]" = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="translation-batcher", daemon=True)
+            self._thread.start()
+            logger.info(f"마이크로 배치 스케줄러 시작 (window={self.window * 1000:.0f}ms, max_batch={self.max_batch})")
+
+    def stop(self):
+        self._stop.set()
+
+    def submit(self, text: str, source_lang: str, target_lang: str) -> Future:
+        if not self._thread or not self._thread.is_alive():
+            self.start()
+        future: Future = Future()
+        self._queue.put((text, source_lang, target_lang, future, time.perf_counter()))
+        QUEUE_DEPTH.set(self._queue.qsize())
+        return future
+
+    def translate(self, text: str, source_lang: str, target_lang: str,
+                  timeout: float = TRANSLATE_REQUEST_TIMEOUT) -> str:
+        """submit 후 결과를 기다림 (동기 핸들러용). 시간 초과 시 concurrent.futures.TimeoutError"""
+        return self.submit(text, source_lang, target_lang).result(timeout=timeout)
+
+    def _collect(self) -> List[_Item]:
+        """첫 요청을 기다린 뒤 window 가 끝나거나 max_batch 가 찰 때까지 모음"""
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        QUEUE_DEPTH.set(self._queue.qsize())
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            groups: Dict[Tuple[str, str], List[_Item]] = {}
+            for item in batch:
+                groups.setdefault((item[1], item[2]), []).append(item)
+
+            for (source_lang, target_lang), items in groups.items():
+                self._process(source_lang, target_lang, items)
+
+    def _process(self, source_lang: str, target_lang: str, items: List[_Item]):
+        started = time.perf_counter()
+        for item in items:
+            QUEUE_WAIT_SECONDS.observe(started - item[4])
+        BATCH_SIZE.observe(len(items))
+
+        # 같은 배치 안의 같은 문장은 한 번만 번역
+        texts = list(dict.fromkeys(item[0] for item in items))
+        try:
+            results = self.client.translate_batch(texts, source_lang, target_lang)
+            if len(results) != len(texts):
+                raise RuntimeError(f"translate_batch returned {len(results)} results for {len(texts)} texts")
+        except Exception as e:
+            BATCH_ERRORS.inc()
+            for item in items:
+                if not item[3].done():
+                    item[3].set_exception(e)
+            return
+        finally:
+            GENERATE_SECONDS.observe(time.perf_counter() - started)
+
+        translated = dict(zip(texts, results))
+        for text, _, _, future, _ in items:
+            if not future.done():
+                future.set_result(translated[text])
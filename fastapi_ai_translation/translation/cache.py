@@ -1,32 +1,163 @@
-"""번역 결과를 간단히 메모리에 캐싱하는 유틸."""
+"""번역 결과를 메모리에 캐싱하는 유틸 (항목 수/바이트 제한 LRU + TTL, 선택적으로 디스크 2차 캐시)."""
 
+import hashlib
+import logging
+import os
+import sys
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional, Tuple
 
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "50000"))
+TRANSLATION_CACHE_MAX_BYTES = int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64MB
+TRANSLATION_CACHE_SWEEP_INTERVAL = float(os.getenv("TRANSLATION_CACHE_SWEEP_INTERVAL", "60"))  # 만료 정리 주기(초)
+
+# 항목당 고정 오버헤드 (OrderedDict 노드, 튜플, float 등 대략치)
+_ENTRY_OVERHEAD = 200
+
+CACHE_HITS = Counter("translation_cache_hits_total", "번역 메모리 캐시 hit")
+CACHE_MISSES = Counter("translation_cache_misses_total", "번역 메모리 캐시 miss")
+CACHE_EVICTIONS = Counter("translation_cache_evictions_total", "번역 메모리 캐시에서 제거된 항목 수", ["reason"])
+# 메모리 캐시는 워커마다 따로 있으므로 멀티 프로세스 모드에서는 살아 있는 워커 합계
+CACHE_BYTES = Gauge("translation_cache_bytes", "번역 메모리 캐시 사용량(바이트, 추정)", multiprocess_mode="livesum")
+CACHE_ENTRIES = Gauge("translation_cache_entries", "번역 메모리 캐시 항목 수", multiprocess_mode="livesum")
+
 
 class TranslationCache:
-    """단순 메모리 캐시(TTL 적용)."""
+    """
+    메모리 캐시(TTL + LRU).
+    - 키는 원문 전체가 아니라 (src, tgt, text) 의 해시(16바이트)라 긴 리뷰 본문도 키 크기가 일정
+    - 항목 수(max_entries)와 번역문 바이트(max_bytes) 두 한도를 넘으면 가장 오래 안 쓴 항목부터 제거
+    - 만료 항목은 조회 시 + 백그라운드 정리 스레드(start_sweeper)에서 제거
+    - disk(DiskTranslationCache) 가 있으면 메모리 miss 시 디스크에서 읽어 올리고, 저장은 디스크에도 (write-behind)
+    """
 
-    def __init__(self, ttl_seconds: int = 0):
+    def __init__(self, ttl_seconds: int = 0, max_entries: int = TRANSLATION_CACHE_MAX_ENTRIES,
+                 max_bytes: int = TRANSLATION_CACHE_MAX_BYTES, disk=None):
         self.ttl = ttl_seconds
-        self.store = {}  # key -> (expiry_ts, translated_text, provider)
+        self.disk = disk
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store: "OrderedDict[bytes, Tuple[float, str, str]]" = OrderedDict()  # key -> (expiry_ts, translated_text, provider)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
 
-    def make_key(self, text: str, src: str, tgt: str) -> str:
-        """텍스트/언어 조합으로 캐시 키 생성."""
-        return f"{src}|{tgt}|{text}"
+    def make_key(self, text: str, src: str, tgt: str) -> bytes:
+        """텍스트/언어 조합으로 캐시 키 생성 (고정 길이 해시)."""
+        return hashlib.blake2b(f"{src}|{tgt}|{text}".encode("utf-8"), digest_size=16).digest()
+
+    @staticmethod
+    def _entry_size(key: bytes, translated_text: str, provider: str) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(translated_text) + sys.getsizeof(provider) + _ENTRY_OVERHEAD
+
+    def _remove(self, key: bytes, reason: str):
+        """락을 잡은 상태에서 호출."""
+        entry = self.store.pop(key, None)
+        if entry is not None:
+            self._bytes -= self._entry_size(key, entry[1], entry[2])
+            CACHE_EVICTIONS.labels(reason=reason).inc()
+
+    def _update_gauges(self):
+        CACHE_BYTES.set(self._bytes)
+        CACHE_ENTRIES.set(len(self.store))
 
     def get(self, text: str, src: str, tgt: str) -> Optional[Tuple[str, str]]:
         """캐시 조회: 없거나 만료 시 None, 있으면 (번역문, provider)."""
         key = self.make_key(text, src, tgt)
-        if key not in self.store:
-            return None
-        expiry, translated_text, provider = self.store[key]
-        if expiry < time.time():
-            self.store.pop(key, None)
-            return None
-        return translated_text, provider
+        with self._lock:
+            entry = self.store.get(key)
+            if entry is not None and entry[0] < time.time():
+                self._remove(key, "expired")
+                self._update_gauges()
+                entry = None
+            if entry is not None:
+                self.store.move_to_end(key)
+        if entry is not None:
+            CACHE_HITS.inc()
+            return entry[1], entry[2]
+
+        CACHE_MISSES.inc()
+        # 2차 캐시 (read-through): 찾으면 메모리로 올림
+        hit = self.disk.get(key) if self.disk is not None else None
+        if hit is not None:
+            self._put(key, hit[0], hit[1])
+        return hit
 
     def set(self, text: str, src: str, tgt: str, translated_text: str, provider: str):
         """캐시에 번역 결과 저장."""
         key = self.make_key(text, src, tgt)
-        self.store[key] = (time.time() + self.ttl, translated_text, provider)
+        self._put(key, translated_text, provider)
+        if self.disk is not None:
+            self.disk.put(key, src, tgt, translated_text, provider)
+
+    def _put(self, key: bytes, translated_text: str, provider: str):
+        size = self._entry_size(key, translated_text, provider)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self.store.pop(key, None)
+            if old is not None:
+                self._bytes -= self._entry_size(key, old[1], old[2])
+            self.store[key] = (time.time() + self.ttl, translated_text, provider)
+            self._bytes += size
+            while len(self.store) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self.store)), "capacity")
+            self._update_gauges()
+
+    def warm_from_disk(self, limit: int) -> int:
+        """디스크 캐시에서 최근 사용 항목을 메모리로 미리 올림 (서버 시작 시). 올린 수 반환."""
+        if self.disk is None:
+            return 0
+        rows = self.disk.recent(min(limit, self.max_entries))
+        # 오래된 것부터 넣어 가장 최근 항목이 LRU 의 끝(가장 늦게 제거)에 오도록
+        for key, translated_text, provider in reversed(rows):
+            self._put(key, translated_text, provider)
+        if rows:
+            logger.info(f"번역 캐시 예열: 디스크에서 {len(rows)}건")
+        return len(rows)
+
+    def sweep(self) -> int:
+        """만료된 항목 일괄 제거. 제거한 수 반환."""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (expiry, _, _) in self.store.items() if expiry < now]
+            for key in expired:
+                self._remove(key, "expired")
+            self._update_gauges()
+        if expired:
+            logger.debug(f"번역 캐시 만료 항목 {len(expired)}건 정리")
+        return len(expired)
+
+    def start_sweeper(self, interval: float = TRANSLATION_CACHE_SWEEP_INTERVAL):
+        """백그라운드 만료 정리 스레드 시작 (서버 시작 시 1회)."""
+        if self._sweeper and self._sweeper.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logger.warning(f"번역 캐시 정리 실패: {e}")
+
+        self._sweeper = threading.Thread(target=run, name="translation-cache-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {"entries": len(self.store), "bytes": self._bytes,
+                     "max_entries": self.max_entries, "max_bytes": self.max_bytes, "ttl": self.ttl}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
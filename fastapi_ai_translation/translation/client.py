@@ -1,7 +1,7 @@
 """Local transformers-based translator (NLLB-200 by default)."""
 
 import os
-from typing import Optional, Dict, Set
+from typing import Optional, Dict, List, Set, Tuple
 
 from dotenv import load_dotenv
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
@@ -15,6 +15,15 @@ except ImportError:
 
 load_dotenv()
 
+# Length-bucketed batching (translate_batch)
+TRANSLATE_BUCKETING = os.getenv("TRANSLATE_BUCKETING", "true").lower() == "true"
+TRANSLATE_BUCKET_MAX_SIZE = int(os.getenv("TRANSLATE_BUCKET_MAX_SIZE", "32"))        # rows per sub-batch
+TRANSLATE_BUCKET_MAX_TOKENS = int(os.getenv("TRANSLATE_BUCKET_MAX_TOKENS", "4096"))  # padded input tokens per sub-batch
+# max_new_tokens = input_length * RATIO + MARGIN, capped at TRANSLATE_MAX_NEW_TOKENS
+TRANSLATE_NEW_TOKENS_RATIO = float(os.getenv("TRANSLATE_NEW_TOKENS_RATIO", "2.0"))
+TRANSLATE_NEW_TOKENS_MARGIN = int(os.getenv("TRANSLATE_NEW_TOKENS_MARGIN", "10"))
+TRANSLATE_MAX_NEW_TOKENS = int(os.getenv("TRANSLATE_MAX_NEW_TOKENS", "256"))
+
 
 class TranslationClient:
     """Thin wrapper around an NLLB seq2seq model with lang validation."""
@@ -33,6 +42,9 @@ class TranslationClient:
         self.lang_map = self._init_lang_map()
         self._ensure_lang_code_ids()
         self.supported_langs: Set[str] = set(getattr(self.tokenizer, "lang_code_to_id", {}).keys())
+        # source_lang -> (prefix ids, suffix ids); filled lazily, read-only afterwards
+        self._lang_special_tokens: Dict[str, Tuple[List[int], List[int]]] = {}
+        self.bucketing = TRANSLATE_BUCKETING
 
     def _ensure_lang_code_ids(self):
         """Ensure lang_code_to_id exists even when only additional_special_tokens are present."""
@@ -70,6 +82,91 @@ class TranslationClient:
         key = code.lower()
         return self.lang_map.get(key, code)
 
+    def _special_tokens_for(self, source_lang: str) -> Tuple[List[int], List[int]]:
+        """
+        (prefix, suffix) special token ids for a source language, cached per language.
+        Mirrors NllbTokenizer.set_src_lang_special_tokens without touching tokenizer state:
+        legacy -> [tokens] </s> [src_lang], otherwise -> [src_lang] [tokens] </s>
+        """
+        special = self._lang_special_tokens.get(source_lang)
+        if special is not None:
+            return special
+
+        lang_id = self.tokenizer.lang_code_to_id.get(source_lang)
+        if lang_id is None:
+            raise ValueError(f"Unsupported source_lang: {source_lang}")
+        eos = [self.tokenizer.eos_token_id]
+        if getattr(self.tokenizer, "legacy_behaviour", False):
+            special = ([], eos + [lang_id])
+        else:
+            special = ([lang_id], eos)
+        self._lang_special_tokens[source_lang] = special
+        return special
+
+    def token_rows(self, texts: List[str], source_lang: str, max_length: int = 512) -> List[List[int]]:
+        """
+        Tokenize texts for the given source language without mutating self.tokenizer.src_lang,
+        so concurrent requests (or one batch scheduler) can mix language pairs without a lock.
+        Each row is truncated to max_length including special tokens.
+        """
+        prefix, suffix = self._special_tokens_for(source_lang)
+        budget = max_length - len(prefix) - len(suffix)
+        encoded = self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [prefix + ids[:budget] + suffix for ids in encoded]
+
+    def pad_rows(self, rows: List[List[int]]) -> Dict[str, torch.Tensor]:
+        """Right-pad token rows to the longest one (same as padding=True)."""
+        width = max(len(row) for row in rows)
+        pad_id = self.tokenizer.pad_token_id
+        input_ids = torch.full((len(rows), width), pad_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(rows), width), dtype=torch.long)
+        for i, row in enumerate(rows):
+            input_ids[i, :len(row)] = torch.tensor(row, dtype=torch.long)
+            attention_mask[i, :len(row)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+    def encode_inputs(self, texts: List[str], source_lang: str, max_length: int = 512) -> Dict[str, torch.Tensor]:
+        """token_rows + pad_rows (thread-safe equivalent of tokenizer(..., padding=True, truncation=True))."""
+        return self.pad_rows(self.token_rows(texts, source_lang, max_length))
+
+    def max_new_tokens_for(self, input_length: int) -> int:
+        """Output budget derived from the input length instead of a fixed max_length for every text."""
+        budget = int(input_length * TRANSLATE_NEW_TOKENS_RATIO) + TRANSLATE_NEW_TOKENS_MARGIN
+        return max(1, min(budget, TRANSLATE_MAX_NEW_TOKENS))
+
+    def length_buckets(self, rows: List[List[int]]) -> List[List[int]]:
+        """
+        Indices of rows sorted by token length and split into sub-batches, so a long column body
+        does not make every short title in the request pay for full-length padding.
+        A bucket closes when it is full, would exceed the padded token budget,
+        or the next row is more than twice as long as the bucket's shortest row.
+        """
+        order = sorted(range(len(rows)), key=lambda i: len(rows[i]))
+        buckets: List[List[int]] = []
+        current: List[int] = []
+        for i in order:
+            length = len(rows[i])
+            if current:
+                shortest = len(rows[current[0]])
+                if (len(current) >= TRANSLATE_BUCKET_MAX_SIZE
+                        or (len(current) + 1) * length > TRANSLATE_BUCKET_MAX_TOKENS
+                        or length > max(shortest * 2, shortest + 8)):
+                    buckets.append(current)
+                    current = []
+            current.append(i)
+        if current:
+            buckets.append(current)
+        return buckets
+
+    def _generate(self, rows: List[List[int]], forced_bos: int, max_new_tokens: int) -> List[str]:
+        with torch.no_grad():
+            generated = self.model.generate(
+                **self.pad_rows(rows),
+                forced_bos_token_id=forced_bos,
+                max_new_tokens=max_new_tokens,
+            )
+        return self.tokenizer.batch_decode(generated, skip_special_tokens=True)
+
     def _get_forced_bos(self, target_lang: str) -> Optional[int]:
         lang_map = getattr(self.tokenizer, "lang_code_to_id", None)
         if lang_map and target_lang in lang_map:
@@ -93,15 +190,12 @@ class TranslationClient:
             if hasattr(self.tokenizer, "src_lang") and source_lang not in self.supported_langs:
                 raise ValueError(f"Unsupported source_lang: {source_lang}")
 
-        # Set source language for NLLB tokenizers
-        if hasattr(self.tokenizer, "src_lang"):
-            self.tokenizer.src_lang = source_lang
-
         # Guard: require lang_code_to_id for NLLB models
         if not getattr(self.tokenizer, "lang_code_to_id", None):
             raise ValueError(f"Tokenizer has no lang_code_to_id; model may not be NLLB. model={self.model_name}")
 
-        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
+        # Source language goes in as explicit prefix/suffix tokens (no shared tokenizer.src_lang mutation)
+        rows = self.token_rows([text], source_lang)
         forced_bos = self._get_forced_bos(target_lang)
 
         # Fallback to English if target_lang not supported
@@ -110,13 +204,7 @@ class TranslationClient:
             if forced_bos is None:
                 raise ValueError(f"Unsupported target_lang: {target_lang} (model={self.model_name})")
 
-        with torch.no_grad():
-            generated = self.model.generate(
-                **inputs,
-                forced_bos_token_id=forced_bos,
-                max_length=256,
-            )
-        return self.tokenizer.decode(generated[0], skip_special_tokens=True)
+        return self._generate(rows, forced_bos, self.max_new_tokens_for(len(rows[0])))[0]
 
     def translate_batch(self, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
         """
@@ -135,27 +223,27 @@ class TranslationClient:
             if hasattr(self.tokenizer, "src_lang") and source_lang not in self.supported_langs:
                 raise ValueError(f"Unsupported source_lang: {source_lang}")
 
-        if hasattr(self.tokenizer, "src_lang"):
-            self.tokenizer.src_lang = source_lang
-
         # Guard
         if not getattr(self.tokenizer, "lang_code_to_id", None):
              # Fallback to single loop if something is wrong with tokenizer
             return [self.translate(t, source_lang, target_lang) for t in texts]
 
-        # Batch Tokenization
-        inputs = self.tokenizer(texts, return_tensors="pt", padding=True, truncation=True, max_length=512)
+        # Batch Tokenization (thread-safe, see token_rows)
+        rows = self.token_rows(texts, source_lang)
         forced_bos = self._get_forced_bos(target_lang)
         
         if forced_bos is None:
              forced_bos = self._get_forced_bos("eng_Latn")
 
-        with torch.no_grad():
-            generated = self.model.generate(
-                **inputs,
-                forced_bos_token_id=forced_bos,
-                max_length=256,
-            )
-        
-        # Batch Decode
-        return self.tokenizer.batch_decode(generated, skip_special_tokens=True)
+        if not self.bucketing:
+            # Single batch padded to the longest text (previous behaviour, kept for benchmarks)
+            return self._generate(rows, forced_bos, TRANSLATE_MAX_NEW_TOKENS)
+
+        # Length buckets: sorted sub-batches, each with its own output budget, then restore order
+        results: List[str] = [""] * len(texts)
+        for bucket in self.length_buckets(rows):
+            bucket_rows = [rows[i] for i in bucket]
+            longest = max(len(row) for row in bucket_rows)
+            for i, translated in zip(bucket, self._generate(bucket_rows, forced_bos, self.max_new_tokens_for(longest))):
+                results[i] = translated
+        return results
@@ -0,0 +1,298 @@
+"""번역 결과 디스크 캐시 (SQLite WAL). 재시작/새 파드에서도 이미 번역한 문장은 추론하지 않도록 하는 2차 캐시."""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_DISK_CACHE_ENABLED = os.getenv("TRANSLATION_DISK_CACHE_ENABLED", "true").lower() == "true"
+TRANSLATION_DISK_CACHE_PATH = os.getenv("TRANSLATION_DISK_CACHE_PATH", "data/translation_cache.sqlite3")
+TRANSLATION_DISK_CACHE_MAX_BYTES = int(os.getenv("TRANSLATION_DISK_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))  # 512MB
+TRANSLATION_DISK_CACHE_WARM_ENTRIES = int(os.getenv("TRANSLATION_DISK_CACHE_WARM_ENTRIES", "5000"))  # 시작 시 메모리로 올릴 수
+TRANSLATION_DISK_CACHE_FLUSH_MS = float(os.getenv("TRANSLATION_DISK_CACHE_FLUSH_MS", "500"))  # write-behind 모으는 시간
+# 사용량은 기록할 때마다 증감으로 추적하고, 다른 워커의 기록까지 반영하려고 이 횟수의 flush 마다 DB 에서 다시 합계
+TRANSLATION_DISK_CACHE_RESYNC_FLUSHES = int(os.getenv("TRANSLATION_DISK_CACHE_RESYNC_FLUSHES", "120"))
+
+# 한도를 넘으면 이 비율까지 줄임 (매 쓰기마다 지우지 않도록 여유를 둠)
+_EVICT_TARGET_RATIO = 0.9
+_EVICT_CHUNK = 1000
+_WRITE_QUEUE_SIZE = 10000
+_ROW_OVERHEAD = 64  # 키, 언어 코드, 타임스탬프 등 대략치
+
+DISK_HITS = Counter("translation_disk_cache_hits_total", "번역 디스크 캐시 hit")
+DISK_MISSES = Counter("translation_disk_cache_misses_total", "번역 디스크 캐시 miss")
+DISK_WRITES = Counter("translation_disk_cache_writes_total", "디스크 캐시에 기록한 번역 수")
+DISK_DROPPED = Counter("translation_disk_cache_dropped_total", "쓰기 대기열이 가득 차 버린 기록 수")
+DISK_EVICTIONS = Counter("translation_disk_cache_evictions_total", "용량 초과로 디스크 캐시에서 제거된 항목 수")
+# 디스크 캐시 파일은 워커가 함께 쓰므로 합계가 아니라 최댓값
+DISK_BYTES = Gauge("translation_disk_cache_bytes", "번역 디스크 캐시 사용량(바이트, 추정)", multiprocess_mode="livemax")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    namespace TEXT NOT NULL,        -- 엔진:모델 (엔진을 바꾸면 이전 번역은 쓰지 않고 LRU 로 밀려남)
+    key BLOB NOT NULL,              -- blake2b(src|tgt|text), TranslationCache.make_key 와 동일
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS translations_last_used_idx ON translations (last_used);
+"""
+
+_UPSERT_SQL = """
+INSERT INTO translations (namespace, key, source_lang, target_lang, translated_text, provider, size, last_used)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (namespace, key) DO UPDATE SET
+    translated_text = excluded.translated_text,
+    provider = excluded.provider,
+    size = excluded.size,
+    last_used = excluded.last_used
+"""
+
+_TOUCH_SQL = "UPDATE translations SET last_used = ? WHERE namespace = ? AND key = ? AND last_used < ?"
+
+_SIZE_SQL = "SELECT size FROM translations WHERE namespace = ? AND key = ?"
+
+# ("put", row) | ("touch", (last_used, namespace, key, last_used))
+_Op = Tuple[str, tuple]
+
+
+class DiskTranslationCache:
+    """
+    TranslationCache 의 2차 캐시.
+    - 조회(read-through): 메모리 miss 일 때만 디스크에서 찾고, 찾으면 메모리로 올림
+    - 저장(write-behind): 요청 스레드는 대기열에 넣기만 하고, 기록 스레드가 모아서 한 트랜잭션으로 씀
+    - 전체 크기가 max_bytes 를 넘으면 last_used 가 오래된 항목부터 제거
+      (크기는 기록마다 증감으로 추적, 주기적으로/제거 직전에만 전체 합계를 다시 계산)
+    - WAL 모드라 gunicorn 워커 여러 개가 같은 파일을 동시에 읽고 쓸 수 있음
+    연결/스레드는 open() 에서 만듦 (fork 이후 워커의 startup 에서 호출).
+    """
+
+    def __init__(self, path: str = TRANSLATION_DISK_CACHE_PATH, namespace: str = "",
+                 max_bytes: int = TRANSLATION_DISK_CACHE_MAX_BYTES,
+                 flush_ms: float = TRANSLATION_DISK_CACHE_FLUSH_MS):
+        self.path = path
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_ms / 1000
+        self._local = threading.local()
+        self._queue: "queue.Queue[_Op]" = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._bytes = 0
+        self._flushes_since_resync = 0
+        self.enabled = False
+
+    # ---------------------------------------------------------
+    # 연결 / 수명 주기
+    # ---------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # WAL 에서는 커밋마다 fsync 하지 않아도 손상되지 않음
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결 (sqlite3 연결은 스레드 간 공유하지 않음)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def open(self) -> bool:
+        """DB 파일/스키마 준비 + 기록 스레드 시작. 실패하면 디스크 캐시 없이 동작."""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._conn()
+            conn.executescript(_SCHEMA)
+            self._bytes = self._total_bytes(conn)
+            DISK_BYTES.set(self._bytes)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"번역 디스크 캐시를 열 수 없어 메모리 캐시만 사용: {self.path} ({e})")
+            return False
+
+        self.enabled = True
+        self._stop.clear()
+        self._writer = threading.Thread(target=self._run_writer, name="translation-disk-cache-writer", daemon=True)
+        self._writer.start()
+        logger.info(f"번역 디스크 캐시: {self.path} ({self._bytes / 1024 / 1024:.1f}MB, namespace={self.namespace})")
+        return True
+
+    def close(self):
+        """남은 기록을 모두 쓰고 종료."""
+        if not self.enabled:
+            return
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join(timeout=10)
+        self.enabled = False
+
+    # ---------------------------------------------------------
+    # 조회 / 저장 (요청 스레드)
+    # ---------------------------------------------------------
+    def get(self, key: bytes) -> Optional[Tuple[str, str]]:
+        """(번역문, provider) 또는 None. 조회 시각 갱신은 기록 스레드에 맡김."""
+        if not self.enabled:
+            return None
+        try:
+            row = self._conn().execute(
+                "SELECT translated_text, provider FROM translations WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"번역 디스크 캐시 조회 실패: {e}")
+            return None
+        if row is None:
+            DISK_MISSES.inc()
+            return None
+        DISK_HITS.inc()
+        now = time.time()
+        self._enqueue(("touch", (now, self.namespace, key, now - 60)))  # 1분 안에 갱신된 항목은 다시 쓰지 않음
+        return row[0], row[1]
+
+    def put(self, key: bytes, src: str, tgt: str, translated_text: str, provider: str):
+        if not self.enabled:
+            return
+        size = len(translated_text.encode("utf-8")) + len(key) + _ROW_OVERHEAD
+        self._enqueue(("put", (self.namespace, key, src, tgt, translated_text, provider, size, time.time())))
+
+    def _enqueue(self, op: _Op):
+        try:
+            self._queue.put_nowait(op)
+        except queue.Full:
+            DISK_DROPPED.inc()
+
+    def recent(self, limit: int = TRANSLATION_DISK_CACHE_WARM_ENTRIES) -> List[Tuple[bytes, str, str]]:
+        """최근에 쓴 순서대로 [(key, 번역문, provider)] (시작 시 메모리 캐시 예열용)."""
+        if not self.enabled or limit <= 0:
+            return []
+        try:
+            return self._conn().execute(
+                "SELECT key, translated_text, provider FROM translations WHERE namespace = ? "
+                "ORDER BY last_used DESC LIMIT ?",
+                (self.namespace, limit),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"번역 디스크 캐시 예열 실패: {e}")
+            return []
+
+    # ---------------------------------------------------------
+    # 기록 스레드
+    # ---------------------------------------------------------
+    def _run_writer(self):
+        conn = self._conn()
+        while True:
+            stopping = self._stop.is_set()
+            ops = self._drain(block=not stopping)
+            if ops:
+                try:
+                    self._flush(conn, ops)
+                except sqlite3.Error as e:
+                    logger.warning(f"번역 디스크 캐시 기록 실패 ({len(ops)}건): {e}")
+            elif stopping:
+                break
+        conn.close()
+        self._local.conn = None
+
+    def _drain(self, block: bool) -> List[_Op]:
+        """첫 항목 이후 flush_interval 동안 들어온 것까지 모아서 반환."""
+        ops: List[_Op] = []
+        try:
+            ops.append(self._queue.get(timeout=self.flush_interval) if block else self._queue.get_nowait())
+        except queue.Empty:
+            return ops
+        deadline = time.monotonic() + self.flush_interval
+        while len(ops) < _WRITE_QUEUE_SIZE:
+            remaining = deadline - time.monotonic()
+            try:
+                ops.append(self._queue.get(timeout=remaining) if block and remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return ops
+
+    def _flush(self, conn: sqlite3.Connection, ops: List[_Op]):
+        # 같은 키를 여러 번 저장했으면 마지막 것만
+        puts: Dict[Tuple[str, bytes], tuple] = {}
+        touches = []
+        for kind, row in ops:
+            if kind == "put":
+                puts[(row[0], row[1])] = row
+            else:
+                touches.append(row)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            added = 0
+            if puts:
+                # upsert 로 바뀌는 행은 기존 크기를 빼고 새 크기를 더함 (기본 키 조회라 테이블 스캔 없음)
+                for (namespace, key), row in puts.items():
+                    old = conn.execute(_SIZE_SQL, (namespace, key)).fetchone()
+                    added += row[6] - (old[0] if old else 0)
+                conn.executemany(_UPSERT_SQL, list(puts.values()))
+            if touches:
+                conn.executemany(_TOUCH_SQL, touches)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        DISK_WRITES.inc(len(puts))
+
+        if puts:
+            self._bytes += added
+            self._flushes_since_resync += 1
+            # 다른 워커도 같은 파일에 쓰므로 가끔, 그리고 제거하기 전에는 DB 에서 합계를 다시 계산
+            if self._bytes > self.max_bytes or self._flushes_since_resync >= TRANSLATION_DISK_CACHE_RESYNC_FLUSHES:
+                self._bytes = self._total_bytes(conn)
+                self._flushes_since_resync = 0
+            if self._bytes > self.max_bytes:
+                self._evict(conn)
+            DISK_BYTES.set(self._bytes)
+
+    @staticmethod
+    def _total_bytes(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection):
+        """last_used 가 오래된 항목부터 max_bytes * 0.9 아래로 내려갈 때까지 제거 (모든 namespace 대상)."""
+        target = int(self.max_bytes * _EVICT_TARGET_RATIO)
+        removed = 0
+        while self._bytes > target:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT rowid, size FROM translations ORDER BY last_used LIMIT ?", (_EVICT_CHUNK,)
+                ).fetchall()
+                if not rows:
+                    conn.execute("COMMIT")
+                    break
+                victims = []
+                for rowid, size in rows:
+                    if self._bytes <= target:
+                        break
+                    victims.append((rowid,))
+                    self._bytes -= size
+                conn.executemany("DELETE FROM translations WHERE rowid = ?", victims)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            removed += len(victims)
+        DISK_EVICTIONS.inc(removed)
+        logger.info(f"번역 디스크 캐시 용량 초과로 {removed}건 제거 (현재 {self._bytes / 1024 / 1024:.1f}MB)")
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "path": self.path, "namespace": self.namespace,
+                "bytes": self._bytes, "max_bytes": self.max_bytes, "pending_writes": self._queue.qsize()}
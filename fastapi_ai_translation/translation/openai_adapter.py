@@ -1,108 +1,218 @@
+import asyncio
+import json
 import os
 import logging
-from openai import OpenAI
+from typing import Dict, List
+
+from openai import AsyncOpenAI
+
+from .async_loop import BackgroundLoop
 
 logger = logging.getLogger("uvicorn")
 
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "4"))                      # 동시에 보내는 배치 요청 수
+OPENAI_BATCH_TOKEN_BUDGET = int(os.getenv("OPENAI_BATCH_TOKEN_BUDGET", "2000"))     # 요청 1개에 담는 원문 토큰 수(추정)
+OPENAI_BATCH_MAX_ITEMS = int(os.getenv("OPENAI_BATCH_MAX_ITEMS", "40"))             # 요청 1개에 담는 최대 문장 수
+OPENAI_BATCH_RETRIES = int(os.getenv("OPENAI_BATCH_RETRIES", "1"))                  # 응답에서 빠진 index 재요청 횟수
+OPENAI_MAX_OUTPUT_TOKENS = int(os.getenv("OPENAI_MAX_OUTPUT_TOKENS", "8192"))
+
+# 배치 응답 형식 (structured output): 입력 index 와 같은 index 로 돌려받아 순서/개수가 어긋나도 정확히 매칭
+BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "translations",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "translations": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "index": {"type": "integer"},
+                            "text": {"type": "string"},
+                        },
+                        "required": ["index", "text"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["translations"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 보수적으로 추정 (한글 1글자 ≈ 1토큰, 영문 3바이트 ≈ 1토큰)."""
+    return max(1, len(text.encode("utf-8")) // 3)
+
+
 class OpenAIAdapter:
-    def __init__(self):
+    """
+    OpenAI 번역 어댑터.
+    배치는 JSON 스키마 출력(index 포함)으로 요청 1개에 여러 문장을 보내고, 토큰 예산을 넘으면 여러 요청으로 나눠
+    공유 AsyncOpenAI 클라이언트로 동시에 보냅니다. 응답에서 빠진 index 만 다시 요청하고, 그래도 없으면 원문을 사용합니다.
+    """
+
+    def __init__(self, concurrency: int = OPENAI_CONCURRENCY, token_budget: int = OPENAI_BATCH_TOKEN_BUDGET,
+                 max_items: int = OPENAI_BATCH_MAX_ITEMS):
         self.api_key = os.getenv("OPENAI_API_KEY")
         if not self.api_key:
-            raise ValueError("OPENAI_API_KEY \uD658\uACBD \uBCC0\uC218\uAC00 \uC124\uC815\uB418\uC9C0 \uC54A\uC558\uC2B5\uB2C8\uB2E4.")
-        self.client = OpenAI(api_key=self.api_key, timeout=30.0) # 30초 타임아웃 설정
+            raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini") # Default to cost-effective 4o-mini
-        
+        self.concurrency = max(1, concurrency)
+        self.token_budget = token_budget
+        self.max_items = max(1, max_items)
+        self._runner = BackgroundLoop("openai-adapter")
+
         logger.info(f"OpenAI Adapter initialized with model: {self.model}")
 
+    # ---------------------------------------------------------
+    # 동기 진입점 (router 의 sync 핸들러용)
+    # ---------------------------------------------------------
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
         """
         Translates a single text using OpenAI.
         """
+        return self._runner.run(self.translate_async(text, source_lang, target_lang))
+
+    def translate_batch(self, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+        """
+        Translates a batch of texts. 번역하지 못한 항목은 원문으로 대체됩니다.
+        """
+        return self._runner.run(self.translate_batch_async(texts, source_lang, target_lang))
+
+    def close(self):
+        self._runner.stop(self._aclose())
+
+    async def _aclose(self):
+        client = self._runner.state.get("client")
+        if client is not None:
+            await client.close()
+
+    # ---------------------------------------------------------
+    # 비동기 구현
+    # ---------------------------------------------------------
+    def _client(self) -> AsyncOpenAI:
+        """이벤트 루프 스레드 안에서만 호출 (루프에 묶인 객체를 지연 생성)"""
+        state = self._runner.state
+        if "client" not in state:
+            state["client"] = AsyncOpenAI(api_key=self.api_key, timeout=30.0) # 30초 타임아웃 설정
+            state["semaphore"] = asyncio.Semaphore(self.concurrency)
+        return state["client"]
+
+    async def translate_async(self, text: str, source_lang: str, target_lang: str) -> str:
+        client = self._client()
         try:
             system_prompt = self._get_system_prompt(target_lang)
             user_prompt = f"Source Language: {source_lang}\nText: {text}"
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3, # Lower temperature for accuracy
-                max_tokens=256
-            )
+            async with self._runner.state["semaphore"]:
+                response = await client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.3, # Lower temperature for accuracy
+                    max_tokens=256
+                )
             return response.choices[0].message.content.strip()
         except Exception as e:
             logger.error(f"OpenAI Translation Error: {e}")
             raise e
 
-    def translate_batch(self, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
-        """
-        Translates a batch of texts.
-        """
-        try:
-            system_prompt = self._get_system_prompt(target_lang)
-            system_prompt += "\n\nIMPORTANT: Return ONLY the translated texts, one per line. Do not include numbering or bullet points."
-            
-            # Join texts with newlines
-            user_prompt = f"Source: {source_lang}\nTranslate these items (keep order):\n" + "\n".join(texts)
-            
-            print(f"DEBUG: OpenAI Prompt: {user_prompt}", flush=True)
-
-            response = self.client.chat.completions.create(
+    def _chunks(self, indexes: List[int], texts: List[str]) -> List[List[int]]:
+        """원문 토큰 추정치 합이 token_budget, 문장 수가 max_items 를 넘지 않게 나눔 (긴 문장 1개는 단독 요청)."""
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        used = 0
+        for i in indexes:
+            tokens = estimate_tokens(texts[i])
+            if current and (used + tokens > self.token_budget or len(current) >= self.max_items):
+                chunks.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _request_chunk(self, items: Dict[int, str], source_lang: str, target_lang: str) -> Dict[int, str]:
+        """{index: 원문} -> {index: 번역문}. 응답에 없거나 비어 있는 index 는 결과에서 빠짐."""
+        client = self._client()
+        payload = json.dumps({"source_language": self._map_lang_code(source_lang),
+                              "items": [{"index": i, "text": t} for i, t in items.items()]}, ensure_ascii=False)
+        # 출력은 원문보다 길 수 있으므로 여유 있게 (CJK <-> 영어)
+        max_tokens = min(OPENAI_MAX_OUTPUT_TOKENS,
+                         sum(estimate_tokens(t) for t in items.values()) * 3 + 20 * len(items) + 50)
+
+        async with self._runner.state["semaphore"]:
+            response = await client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
+                    {"role": "system", "content": self._get_system_prompt(target_lang, batch=True)},
+                    {"role": "user", "content": payload}
                 ],
                 temperature=0.1, # Lower temperature for accuracy
-                timeout=30.0
+                max_tokens=max_tokens,
+                response_format=BATCH_RESPONSE_FORMAT,
             )
-            
-            result_text = response.choices[0].message.content.strip()
-            print(f"DEBUG: OpenAI Response: {result_text}", flush=True)
-            
-            # Try to parse as JSON first (fallback if OpenAI ignores instructions)
-            translations = []
-            if result_text.startswith('{') or result_text.startswith('['):
-                try:
-                    import json
-                    parsed = json.loads(result_text)
-                    if isinstance(parsed, dict) and "translations" in parsed:
-                        translations = parsed["translations"]
-                    elif isinstance(parsed, list):
-                        translations = parsed
-                    else:
-                        logger.warning(f"Unexpected JSON format: {result_text}")
-                except json.JSONDecodeError:
-                    logger.warning("JSON 응답 파싱 실패, 라인 파싱으로 대체합니다.")
-            
-            # If JSON parsing failed or wasn't JSON, parse line by line
-            if not translations:
-                translations = [line.strip() for line in result_text.split('\n') if line.strip()]
-            
-            # Handle empty response (OpenAI couldn't translate)
-            if not translations or len(translations) == 0:
-                logger.warning(f"OpenAI returned empty translations. Using original texts as fallback.")
-                return texts
-            
-            # Validate count
-            if len(translations) != len(texts):
-                logger.warning(f"Translation count mismatch: Expected {len(texts)}, got {len(translations)}. Padding/Truncating.")
-                # Pad with original if too short
-                while len(translations) < len(texts):
-                    translations.append(texts[len(translations)])
-                # Truncate if too long
-                translations = translations[:len(texts)]
-            
-            # CRITICAL: Ensure all elements are strings
-            translations = [str(t) if t is not None else "" for t in translations]
-                
-            return translations
-                
-        except Exception as e:
-            logger.error(f"OpenAI Batch Translation Error: {e}", exc_info=True)
-            return texts
+
+        message = response.choices[0].message
+        if getattr(message, "refusal", None) or not message.content:
+            logger.warning(f"OpenAI batch returned no content (finish_reason={response.choices[0].finish_reason})")
+            return {}
+        try:
+            parsed = json.loads(message.content)
+        except json.JSONDecodeError:
+            # max_tokens 에 걸려 JSON 이 잘린 경우 등
+            logger.warning(f"OpenAI batch JSON 파싱 실패 (finish_reason={response.choices[0].finish_reason})")
+            return {}
+
+        translated: Dict[int, str] = {}
+        for item in parsed.get("translations", []):
+            index, text = item.get("index"), item.get("text")
+            if index in items and isinstance(text, str) and text.strip():
+                translated[index] = text.strip()
+        return translated
+
+    async def _translate_chunk(self, indexes: List[int], texts: List[str], source_lang: str,
+                               target_lang: str) -> Dict[int, str]:
+        """청크 1개 번역. 빠진 index 만 OPENAI_BATCH_RETRIES 회까지 다시 요청."""
+        translated: Dict[int, str] = {}
+        missing = indexes
+        for attempt in range(OPENAI_BATCH_RETRIES + 1):
+            try:
+                translated.update(await self._request_chunk({i: texts[i] for i in missing}, source_lang, target_lang))
+            except Exception as e:
+                # SDK 가 일시적 오류는 이미 재시도함
+                logger.error(f"OpenAI Batch Translation Error: {e}")
+                break
+            missing = [i for i in missing if i not in translated]
+            if not missing:
+                break
+            if attempt < OPENAI_BATCH_RETRIES:
+                logger.info(f"OpenAI batch missing {len(missing)}/{len(indexes)} items, retrying those")
+        if missing:
+            logger.warning(f"OpenAI batch: {len(missing)} items left untranslated, using original texts")
+        return translated
+
+    async def translate_batch_async(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        # 빈 문자열은 보내지 않고 그대로 둠
+        targets = [i for i, t in enumerate(texts) if t and t.strip()]
+        if not targets:
+            return list(texts)
+        chunks = self._chunks(targets, texts)
+        results = await asyncio.gather(*[self._translate_chunk(chunk, texts, source_lang, target_lang)
+                                         for chunk in chunks])
+        translated: Dict[int, str] = {}
+        for result in results:
+            translated.update(result)
+        return [translated.get(i, text) for i, text in enumerate(texts)]
 
     def _map_lang_code(self, code: str) -> str:
         mapping = {
@@ -114,9 +224,10 @@ class OpenAIAdapter:
         }
         return mapping.get(code, code)
 
-    def _get_system_prompt(self, target_lang: str) -> str:
+    def _get_system_prompt(self, target_lang: str, batch: bool = False) -> str:
+        """batch=True 면 인덱스 JSON 입력 규칙(6번)을 추가 (단건 translate_async 는 일반 텍스트 입력)"""
         target_lang_name = self._map_lang_code(target_lang)
-        return (
+        prompt = (
              f"You are a professional translator specializing in Korean Travel Content.\n"
              f"Translate the given text into {target_lang_name}.\n\n"
              f"Rules:\n"
@@ -125,5 +236,9 @@ class OpenAIAdapter:
              f"3. **For English:** Translate Korean text into natural English. Proper nouns can be transliterated (e.g., 'Jebidabang Cafe').\n"
              f"4. **Untranslatable Text:** If the text is nonsense, random characters, or cannot be meaningfully translated, return the ORIGINAL text exactly as-is. Do NOT attempt to translate gibberish.\n"
              f"5. **No Explanations:** Return ONLY the translated text (or original if untranslatable).\n"
-             f"6. **Batch Requests:** Return a strictly valid JSON object: {{ \"translations\": [ \"string1\", \"string2\" ] }}. Each element must be a non-empty string.\n"
         )
+        if batch:
+            prompt += (
+                 f"6. **Batch Requests:** The input is JSON with indexed items. Return exactly one translation per item with the same index. Each item's text may contain line breaks; keep them. Each text must be a non-empty string.\n"
+            )
+        return prompt
@@ -1,19 +1,25 @@
 """Translation API: local transformers inference with in-memory cache."""
 
+import json
 import logging
 import os
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from .client import TranslationClient
 from .adapter import OllamaAdapter
 from .openai_adapter import OpenAIAdapter
 from .cache import TranslationCache
+from .disk_cache import DiskTranslationCache, TRANSLATION_DISK_CACHE_ENABLED
+from .batcher import MicroBatcher, TRANSLATE_BATCH_ENABLED, TRANSLATE_REQUEST_TIMEOUT
+from .segmenter import split_segments
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# In-memory cache (TTL 5 minutes)
-cache = TranslationCache(ttl_seconds=300)
+# 스트리밍 번역에서 LLM 어댑터(배치 스케줄러 미사용)로 한 번에 보낼 세그먼트 수
+TRANSLATE_STREAM_CHUNK = int(os.getenv("TRANSLATE_STREAM_CHUNK", "8"))
 
 try:
     engine = os.getenv("AI_ENGINE", "ollama")  # Default to Ollama now
@@ -30,6 +36,16 @@ except Exception as e:
     logger.error(f"TranslationClient init failed (engine={os.getenv('AI_ENGINE')}): {e}", exc_info=True)
     client = None
 
+# In-memory cache (TTL 5 minutes) + 디스크 2차 캐시 (엔진/모델별로 구분)
+_cache_namespace = f"{os.getenv('AI_ENGINE', 'ollama')}:{getattr(client, 'model_name', None) or getattr(client, 'model', '')}"
+cache = TranslationCache(
+    ttl_seconds=300,
+    disk=DiskTranslationCache(namespace=_cache_namespace) if TRANSLATION_DISK_CACHE_ENABLED else None,
+)
+
+# NLLB(로컬 모델)일 때만 동시 단건 요청을 모아 배치로 추론 (LLM 어댑터는 자체 호출 방식 사용)
+batcher = MicroBatcher(client) if TRANSLATE_BATCH_ENABLED and isinstance(client, TranslationClient) else None
+
 
 def warmup_model():
     """
@@ -43,8 +59,10 @@ def warmup_model():
             # Translate a simple "Hello" to force model loading
             client.translate("Hello", "eng_Latn", "kor_Hang")
             logger.info("\uBAA8\uB378 \uC6CC\uC5C5 \uC644\uB8CC!")
+            return True
         except Exception as e:
             logger.warning(f"Model warm-up failed (non-critical): {e}")
+    return False
 
 class TranslateRequest(BaseModel):
     text: str
@@ -76,12 +94,18 @@ def translate(req: TranslateRequest):
         return {"translated_text": translated_text, "cached": True, "provider": provider}
 
     try:
-        translated = client.translate(text, req.source_lang, req.target_lang)
+        if batcher is not None:
+            translated = batcher.translate(text, req.source_lang, req.target_lang)
+        else:
+            translated = client.translate(text, req.source_lang, req.target_lang)
         cache.set(text, req.source_lang, req.target_lang, translated, provider="local-transformers")
         return {"translated_text": translated, "cached": False, "provider": "local-transformers"}
     except ValueError as e:
         logger.warning("번역 검증 오류: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
+    except FutureTimeoutError:
+        logger.error("번역 대기 시간 초과")
+        raise HTTPException(status_code=504, detail="Translation timed out")
     except Exception as e:
         logger.error("로컬 번역 실패: %s", e)
         raise HTTPException(status_code=502, detail=f"Translation failed: {e}")
@@ -108,22 +132,139 @@ def translate_batch(req: TranslateBatchRequest):
         raise HTTPException(status_code=500, detail="번역 클라이언트가 초기화되지 않았습니다.")
     
     if not req.texts:
-        return {"translations": [], "provider": "local-transformers"}
+        return {"translations": [], "provider": "local-transformers", "cached": 0, "computed": 0}
 
-    # Filter out empty strings to save compute, but maintain order?
-    # For simplicity, we just pass everything to the client, let it handle empty checks if needed,
-    # but client.translate_batch might error on empty. 
-    # Let's simple pass-through. The client handles empty lists, but maybe not empty in list for some tokenizers.
-    
-    print(f"DEBUG: translate_batch called with {len(req.texts)} texts. Client Type: {type(client)}", flush=True)
+    # 1. 중복 제거 + 항목별 캐시 조회 ("음식점", "카페", 영업시간 줄 등은 같은 요청 안에서도 반복됨)
+    #    빈 문자열은 번역하지 않고 그대로 돌려줌
+    translated_by_text = {}
+    misses = []
+    hits = set()
+    for text in req.texts:
+        if not text or not text.strip() or text in translated_by_text:
+            continue
+        hit = cache.get(text, req.source_lang, req.target_lang)
+        if hit:
+            translated_by_text[text] = hit[0]
+            hits.add(text)
+        else:
+            translated_by_text[text] = None
+            misses.append(text)
 
-    try:
-        translated_list = client.translate_batch(req.texts, req.source_lang, req.target_lang)
-        print(f"DEBUG: Client returned: {translated_list}", flush=True)
-        return {"translations": translated_list, "provider": "local-transformers-batch"}
-    except ValueError as e:
-        logger.warning("배치 번역 검증 오류: %s", e)
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error("배치 번역 실패: %s", e)
-        raise HTTPException(status_code=502, detail=f"Batch translation failed: {e}")
+    # 2. 캐시에 없는 고유 문장만 엔진으로
+    if misses:
+        try:
+            computed = client.translate_batch(misses, req.source_lang, req.target_lang)
+        except ValueError as e:
+            logger.warning("배치 번역 검증 오류: %s", e)
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error("배치 번역 실패: %s", e)
+            raise HTTPException(status_code=502, detail=f"Batch translation failed: {e}")
+        if len(computed) != len(misses):
+            logger.error("배치 번역 결과 수 불일치: %d != %d", len(computed), len(misses))
+            raise HTTPException(status_code=502, detail="Batch translation returned a wrong number of items")
+
+        for text, translated in zip(misses, computed):
+            translated_by_text[text] = translated
+            # 원문이 그대로 돌아온 경우(어댑터 실패 시 원문 대체 포함)는 캐시하지 않음
+            if translated and translated != text:
+                cache.set(text, req.source_lang, req.target_lang, translated, provider="local-transformers")
+
+    # 3. 원래 순서대로 복원
+    translations = [translated_by_text.get(text) or text for text in req.texts]
+
+    return {
+        "translations": translations,
+        "provider": "local-transformers-batch",
+        "cached": sum(1 for text in req.texts if text in hits),  # 캐시에서 바로 채운 항목 수
+        "computed": len(misses),     # 엔진으로 보낸 고유 문장 수
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _translate_segments(segments, source_lang: str, target_lang: str):
+    """
+    세그먼트를 순서대로 번역해 (index, 번역문, cached) 를 하나씩 내보냄.
+    NLLB 는 전부 배치 스케줄러에 한 번에 넣어 묶어서 추론하고, 앞 세그먼트부터 결과가 나오는 대로 반환.
+    """
+    texts = [segment for segment, _ in segments]
+    hits = {i: cache.get(text, source_lang, target_lang) for i, text in enumerate(texts)}
+
+    if batcher is not None:
+        futures = {i: batcher.submit(text, source_lang, target_lang)
+                   for i, text in enumerate(texts) if not hits[i]}
+        for i, text in enumerate(texts):
+            if hits[i]:
+                yield i, hits[i][0], True
+                continue
+            translated = futures[i].result(timeout=TRANSLATE_REQUEST_TIMEOUT)
+            # 실패/원문 그대로인 결과는 캐시하지 않음 (/translate/batch 와 동일)
+            if translated and translated != text:
+                cache.set(text, source_lang, target_lang, translated, provider="local-transformers")
+            yield i, translated, False
+        return
+
+    for start in range(0, len(texts), TRANSLATE_STREAM_CHUNK):
+        indexes = range(start, min(start + TRANSLATE_STREAM_CHUNK, len(texts)))
+        misses = [i for i in indexes if not hits[i]]
+        computed = dict(zip(misses, client.translate_batch([texts[i] for i in misses], source_lang, target_lang)
+                                    if misses else []))
+        for i in indexes:
+            if hits[i]:
+                yield i, hits[i][0], True
+                continue
+            translated = computed.get(i) or texts[i]
+            if translated != texts[i]:
+                cache.set(texts[i], source_lang, target_lang, translated, provider="local-transformers")
+            yield i, translated, False
+
+
+@router.post("/translate/stream")
+def translate_stream(req: TranslateRequest):
+    """
+    POST /api/ai/translate/stream  (긴 칼럼/섹션 본문용, text/event-stream)
+    문단/문장 단위로 나눠 번역하고 앞에서부터 순서대로 보냅니다. 512 토큰에서 잘리지 않고 전체가 번역됩니다.
+    events:
+      start   {"segments": N}
+      segment {"index": i, "translated_text": "...", "separator": " " | "\n" | "\n\n" | "", "cached": bool}
+      done    {"segments": N}
+      error   {"detail": "..."}   (중간 실패 시, 이후 세그먼트는 오지 않음)
+    번역문 + separator 를 순서대로 이어 붙이면 원래 문단 구조가 복원됩니다.
+    """
+    if client is None:
+        raise HTTPException(status_code=500, detail="번역 클라이언트가 초기화되지 않았습니다.")
+
+    segments = split_segments(req.text)
+    if not segments:
+        raise HTTPException(status_code=400, detail="텍스트가 필요합니다.")
+
+    # 스트림을 열기 전에 언어 코드 검증 (열린 뒤에는 상태 코드를 바꿀 수 없음)
+    if isinstance(client, TranslationClient) and client.supported_langs:
+        for lang in (req.source_lang, req.target_lang):
+            if client._normalize_lang(lang) not in client.supported_langs:
+                raise HTTPException(status_code=400, detail=f"Unsupported language: {lang}")
+
+    def events():
+        yield _sse("start", {"segments": len(segments)})
+        try:
+            for index, translated, cached in _translate_segments(segments, req.source_lang, req.target_lang):
+                yield _sse("segment", {
+                    "index": index,
+                    "translated_text": translated,
+                    "separator": segments[index][1],
+                    "cached": cached,
+                })
+        except Exception as e:
+            logger.error("스트리밍 번역 실패: %s", e)
+            yield _sse("error", {"detail": f"Translation failed: {e}"})
+            return
+        yield _sse("done", {"segments": len(segments)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,66 @@
+"""긴 본문(칼럼, 섹션 내용)을 문단/문장 단위로 나누는 유틸 (스트리밍 번역용)."""
+
+import os
+import re
+from typing import List, Tuple
+
+# 한 세그먼트 최대 글자 수 (NLLB 입력 512 토큰 안에 충분히 들어가는 길이)
+TRANSLATE_SEGMENT_MAX_CHARS = int(os.getenv("TRANSLATE_SEGMENT_MAX_CHARS", "400"))
+
+# 문단 구분: 빈 줄 또는 줄바꿈 (구분자는 결과에 그대로 보존)
+_PARAGRAPH_RE = re.compile(r"(\s*\n\s*)")
+# 문장 끝: . ! ? … 와 CJK 마침표 뒤의 공백 (한국어 "~다." "~요." 도 마침표로 끝남)
+_SENTENCE_RE = re.compile(r"(?<=[.!?…。！？])(\s+)")
+# 너무 긴 문장은 쉼표/공백 기준으로 자름
+_SOFT_BREAK_RE = re.compile(r"(?<=[,，、;:])\s+|\s+")
+
+
+def _hard_split(sentence: str, max_chars: int) -> List[str]:
+    """max_chars 를 넘는 문장을 쉼표/공백 경계에서 잘라 여러 조각으로."""
+    pieces: List[str] = []
+    current = ""
+    for word in _SOFT_BREAK_RE.split(sentence):
+        if not word:
+            continue
+        candidate = f"{current} {word}" if current else word
+        if len(candidate) <= max_chars:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        # 공백 없이 긴 덩어리는 글자 수로 자름
+        while len(word) > max_chars:
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        current = word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_segments(text: str, max_chars: int = TRANSLATE_SEGMENT_MAX_CHARS) -> List[Tuple[str, str]]:
+    """
+    text -> [(세그먼트, 뒤에 붙일 구분자), ...]
+    번역된 세그먼트를 순서대로 이어 붙이고 구분자를 넣으면 원래 문단 구조가 복원됩니다.
+    """
+    segments: List[Tuple[str, str]] = []
+    parts = _PARAGRAPH_RE.split(text or "")
+    # parts = [문단, 구분자, 문단, 구분자, ...]
+    for p in range(0, len(parts), 2):
+        paragraph = parts[p].strip()
+        if not paragraph:
+            continue
+        separator = parts[p + 1] if p + 1 < len(parts) else ""
+        paragraph_sep = "\n\n" if separator.count("\n") >= 2 else ("\n" if separator else "")
+
+        sentences = [s for s in _SENTENCE_RE.split(paragraph)[::2] if s.strip()]
+        pieces: List[str] = []
+        for sentence in sentences:
+            pieces.extend(_hard_split(sentence, max_chars) if len(sentence) > max_chars else [sentence])
+
+        for i, piece in enumerate(pieces):
+            segments.append((piece, " " if i + 1 < len(pieces) else paragraph_sep))
+
+    if segments:
+        segments[-1] = (segments[-1][0], "")
+    return segments
@@ -0,0 +1,200 @@
+# fastapi_app/async_search.py
+"""
+비동기 검색 API (/search/async)
+
+/search 와 같은 랭킹/상세/번역 결과를 asyncpg + httpx 로 처리합니다.
+- 모델 인코딩은 크기가 정해진 스레드 풀(SEARCH_ENCODE_WORKERS)에서 실행 (이벤트 루프를 막지 않음)
+- 랭킹 이후 카테고리별 상세 조회 + 번역을 asyncio.gather 로 동시에 실행
+- 요청 단위 마감 시간(SEARCH_DEADLINE_MS)은 인코딩부터 적용. 마감을 넘긴 카테고리는 기다리지 않고
+  랭킹 결과만으로 응답하며 degraded=True, degraded_categories 에 표시
+  (인코딩/랭킹 단계에서 넘기면 빈 결과 + degraded_categories=["ranking"])
+- asyncpg 풀 크기는 DB_ASYNC_POOL_MAX (psycopg2 풀과 합쳐 DB_POOL_MAX, database.py 참고)
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from fastapi import APIRouter, HTTPException
+from prometheus_client import Counter
+from pydantic import BaseModel
+
+from database import DB_HOST, DB_NAME, DB_USER, DB_PASS, DB_POOL_MIN, DB_ASYNC_POOL_MAX
+from hydration import HYDRATED_GROUPS, HYDRATION_SECONDS, apply_details, detail_json_sql
+from keyword_index import like_pattern
+from query_cache import query_cache
+from result_cache import search_result_cache, result_refs
+from search_queries import RANKING_SQL, TRANSLATION_GROUPS, group_ranked_rows, ranking_params, to_asyncpg
+from search_translation import translate_item_groups_async
+from vector_index import vector_index, VECTOR_SEARCH_CANDIDATES
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DEADLINE_MS = int(os.getenv("SEARCH_DEADLINE_MS", "1500"))          # 요청 전체 마감 시간(ms)
+SEARCH_ENCODE_WORKERS = int(os.getenv("SEARCH_ENCODE_WORKERS", "2"))        # 인코딩 스레드 수
+SEARCH_TRANSLATE_TIMEOUT = float(os.getenv("SEARCH_TRANSLATE_TIMEOUT", "10"))  # 번역 서버 호출 타임아웃(초)
+
+DEGRADED_TOTAL = Counter(
+    "search_async_degraded_total",
+    "/search/async 에서 마감 시간 초과 또는 오류로 상세/번역이 빠진 카테고리 수",
+    ["category", "reason"],
+)
+
+router = APIRouter()
+
+_model_getter: Callable = lambda: None
+_apool = None
+_http_client = None
+_encode_executor: Optional[ThreadPoolExecutor] = None
+
+# 그룹 키 -> (entity_type, 번역 필드)
+_TRANSLATION_BY_GROUP = {group: (entity_type, fields) for group, entity_type, fields in TRANSLATION_GROUPS}
+
+
+class AsyncSearchRequest(BaseModel):
+    query: str
+    lang: str = None  # 타겟 언어 (예: eng_Latn, kor_Hang, jpn_Jpan, zho_Hans)
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    deadline_ms: Optional[int] = None  # 요청별 마감 시간(ms), 없으면 SEARCH_DEADLINE_MS
+
+
+async def _init_connection(conn):
+    """커넥션마다 vector 타입 등록 + json 을 파이썬 객체로 디코딩"""
+    from pgvector.asyncpg import register_vector
+
+    await register_vector(conn)
+    await conn.set_type_codec("json", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+async def init_async_search(model_getter: Callable):
+    """서버 시작 시 asyncpg 풀, 번역용 httpx 클라이언트, 인코딩 스레드 풀 준비"""
+    global _model_getter, _apool, _http_client, _encode_executor
+    import asyncpg
+    import httpx
+
+    _model_getter = model_getter
+    _encode_executor = ThreadPoolExecutor(max_workers=SEARCH_ENCODE_WORKERS, thread_name_prefix="search-encode")
+    _http_client = httpx.AsyncClient(timeout=httpx.Timeout(SEARCH_TRANSLATE_TIMEOUT, connect=3.0))
+    try:
+        _apool = await asyncpg.create_pool(
+            host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASS,
+            min_size=min(DB_POOL_MIN, DB_ASYNC_POOL_MAX), max_size=DB_ASYNC_POOL_MAX, init=_init_connection,
+        )
+        logger.info("✅ 비동기 검색용 asyncpg 풀 준비 완료")
+    except Exception as e:
+        logger.error(f"❌ asyncpg 풀 생성 실패 (/search/async 비활성): {e}")
+
+
+async def close_async_search():
+    global _apool, _http_client, _encode_executor
+    if _apool is not None:
+        await _apool.close()
+        _apool = None
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _encode_executor is not None:
+        _encode_executor.shutdown(wait=False)
+        _encode_executor = None
+
+
+async def _hydrate_group(group: str, items: List[dict]):
+    ids = [item["id"] for item in items]
+    sql, args = to_asyncpg(f"SELECT {detail_json_sql(group)}", {"ids": ids})
+    started = time.perf_counter()
+    rows = await _apool.fetchval(sql, *args)
+    HYDRATION_SECONDS.labels(category=group).observe(time.perf_counter() - started)
+    apply_details(group, items, {r["id"]: r for r in (rows or [])})
+
+
+async def _rank(request: AsyncSearchRequest, model):
+    """쿼리 벡터 변환 + 랭킹 SQL. 랭킹 결과 행 반환"""
+    loop = asyncio.get_running_loop()
+    # 1. 쿼리 벡터 변환 (캐시 hit 이면 즉시, miss 면 인코딩 스레드 풀에서)
+    query_vector = await loop.run_in_executor(_encode_executor, query_cache.get_or_encode, request.query, model)
+    sql, args = to_asyncpg(RANKING_SQL, ranking_params(query_vector, like_pattern(request.query),
+                                                       VECTOR_SEARCH_CANDIDATES))
+
+    # 2. 랭킹 (SET LOCAL 이 적용되도록 트랜잭션 안에서)
+    async with _apool.acquire() as conn:
+        async with conn.transaction():
+            for statement in vector_index.search_param_statements(request.ef_search, request.probes):
+                await conn.execute(statement)
+            return await conn.fetch(sql, *args)
+
+
+async def _process_group(group: str, items: List[dict], lang: Optional[str]) -> bool:
+    """카테고리 하나의 상세 조회 -> 번역. 번역 서버 호출이 모두 성공했으면 True"""
+    if group in HYDRATED_GROUPS:
+        await _hydrate_group(group, items)
+    if lang and group in _TRANSLATION_BY_GROUP:
+        entity_type, fields = _TRANSLATION_BY_GROUP[group]
+        return await translate_item_groups_async([(items, entity_type, fields)], lang, _apool, _http_client)
+    return True
+
+
+@router.post("/search/async")
+async def search_grouped_async(request: AsyncSearchRequest):
+    logger.info(f"🔍 비동기 하이브리드 검색 요청: {request.query}")
+
+    model = _model_getter()
+    if model is None:
+        raise HTTPException(status_code=500, detail="모델 로딩 중입니다.")
+    if _apool is None:
+        raise HTTPException(status_code=503, detail="비동기 검색용 DB 풀이 준비되지 않았습니다.")
+
+    # 응답 캐시 (/search 와 공유, result_cache.py)
+    cache_key = search_result_cache.make_key(request.query, request.lang, request.ef_search, request.probes)
+    cached = search_result_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached, degraded=False, degraded_categories=[])
+    cache_generation = search_result_cache.generation()
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (request.deadline_ms or SEARCH_DEADLINE_MS) / 1000
+
+    try:
+        # 1~2. 인코딩 + 랭킹도 같은 마감 시간 안에서 (넘기면 빈 결과를 degraded 로 응답, 캐시하지 않음)
+        rows = await asyncio.wait_for(_rank(request, model), timeout=max(deadline - loop.time(), 0))
+    except asyncio.TimeoutError:
+        logger.warning(f"검색 마감 시간 초과 (인코딩/랭킹): {request.query}")
+        DEGRADED_TOTAL.labels(category="ranking", reason="timeout").inc()
+        grouped_results = group_ranked_rows([])
+        grouped_results["degraded"] = True
+        grouped_results["degraded_categories"] = ["ranking"]
+        return grouped_results
+    except Exception as e:
+        logger.error(f"검색 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # 3. 결과 그룹화
+    grouped_results = group_ranked_rows(rows)
+
+    # 4. 카테고리별 상세 조회 + 번역을 동시에, 남은 마감 시간 안에서만 대기
+    groups = [g for g in grouped_results if g != "others" and grouped_results[g]]
+    remaining = max(deadline - loop.time(), 0)
+    outcomes = await asyncio.gather(*[
+        asyncio.wait_for(_process_group(g, grouped_results[g], request.lang), timeout=remaining)
+        for g in groups
+    ], return_exceptions=True)
+
+    degraded_categories = []
+    for group, outcome in zip(groups, outcomes):
+        if isinstance(outcome, BaseException):
+            reason = "timeout" if isinstance(outcome, asyncio.TimeoutError) else "error"
+            if reason == "error":
+                logger.error(f"[{group}] 상세/번역 처리 실패: {outcome}")
+            DEGRADED_TOTAL.labels(category=group, reason=reason).inc()
+            degraded_categories.append(group)
+
+    # 마감 시간 안에 모두 끝난 결과만 캐시 (degraded 응답은 캐시하지 않음)
+    if not degraded_categories and all(outcomes):
+        search_result_cache.put(cache_key, dict(grouped_results), result_refs(rows), cache_generation)
+
+    grouped_results["degraded"] = bool(degraded_categories)
+    grouped_results["degraded_categories"] = degraded_categories
+    return grouped_results
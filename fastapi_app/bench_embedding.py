@@ -0,0 +1,99 @@
+"""
+임베딩 백엔드 벤치마크 (CPU 전용 검색 노드용)
+
+백엔드별로 로딩 시간, fp32 대비 코사인 유사도, 단건(/search 검색어) 지연,
+배치(/index-data/batch 본문) 처리량을 측정해 표로 출력합니다.
+
+사용 예 (fastapi_app 폴더에서):
+    python bench_embedding.py
+    python bench_embedding.py --backends torch torch-int8 onnx-int8 --threads 4 --runs 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Ensure we can import from the app directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from embedding_backend import (BACKENDS, EMBEDDING_COSINE_TOLERANCE, EMBEDDING_MODEL, VERIFY_SENTENCES,
+                               cosine_agreement, load_backend)
+
+QUERIES = ["서울", "부산 맛집", "제주 카페", "경주 한옥", "Seoul", "Busan beach", "전주 비빔밥", "강릉 바다"]
+DOCUMENT = ("해운대 해수욕장 근처에서 일몰을 보기 좋은 카페와 산책로를 소개합니다. "
+            "주차는 공영주차장을 이용하면 되고, 주말에는 사람이 많으니 오전 방문을 추천합니다.")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bench(model, runs: int, batch_size: int):
+    # 예열 (첫 호출의 그래프/세션 초기화 비용 제외)
+    model.encode(QUERIES, show_progress_bar=False)
+
+    latencies = []
+    for i in range(runs):
+        started = time.perf_counter()
+        model.encode(QUERIES[i % len(QUERIES)], show_progress_bar=False)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    docs = [f"{DOCUMENT} #{i}" for i in range(batch_size * 4)]
+    started = time.perf_counter()
+    model.encode(docs, batch_size=batch_size, show_progress_bar=False)
+    throughput = len(docs) / (time.perf_counter() - started)
+
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "docs_per_s": throughput,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 백엔드별 인코딩 지연/처리량 비교")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--model", default=EMBEDDING_MODEL)
+    parser.add_argument("--runs", type=int, default=100, help="단건 인코딩 반복 횟수")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=0, help="torch 스레드 수 (0이면 기본값)")
+    args = parser.parse_args()
+
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    print(f"모델: {args.model}, CPU: {os.cpu_count()}개, 허용 코사인: {EMBEDDING_COSINE_TOLERANCE}")
+    reference = load_backend("torch", args.model)
+    reference_vectors = reference.encode(VERIFY_SENTENCES, convert_to_numpy=True, show_progress_bar=False)
+
+    rows = []
+    for backend in args.backends:
+        started = time.perf_counter()
+        try:
+            model = reference if backend == "torch" else load_backend(backend, args.model)
+        except Exception as e:
+            print(f"[{backend}] 로딩 실패: {e}")
+            continue
+        load_s = time.perf_counter() - started
+
+        vectors = model.encode(VERIFY_SENTENCES, convert_to_numpy=True, show_progress_bar=False)
+        min_sim, mean_sim = cosine_agreement(reference_vectors, vectors)
+        result = bench(model, args.runs, args.batch_size)
+        rows.append((backend, load_s, min_sim, mean_sim, result))
+
+    print()
+    print(f"{'backend':<11} {'load(s)':>8} {'cos min':>8} {'cos mean':>9} {'p50(ms)':>8} {'p95(ms)':>8} "
+          f"{'p99(ms)':>8} {'docs/s':>8}  check")
+    for backend, load_s, min_sim, mean_sim, r in rows:
+        check = "OK" if min_sim >= EMBEDDING_COSINE_TOLERANCE else "FAIL"
+        print(f"{backend:<11} {load_s:>8.1f} {min_sim:>8.4f} {mean_sim:>9.4f} {r['p50_ms']:>8.2f} "
+              f"{r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['docs_per_s']:>8.1f}  {check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,207 @@
 # fastapi_app/database.py
-import psycopg2
+import logging
 import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+DB_HOST = os.getenv("DB_HOST", "db")
+DB_NAME = os.getenv("DB_NAME", "korea_travel_db")
+DB_USER = os.getenv("DB_USER", "myuser")
+DB_PASS = os.getenv("DB_PASSWORD", "mypassword")
+
+# 커넥션 풀 설정 (프로세스 단위)
+# DB_POOL_MAX 는 프로세스가 여는 Postgres 커넥션 전체 한도이며 psycopg2 풀(/search 등)과
+# asyncpg 풀(/search/async)이 나눠 씀: psycopg2 = DB_POOL_MAX - DB_ASYNC_POOL_MAX
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))  # 서버 시작 시 미리 열어둘 커넥션 수
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_ASYNC_POOL_MAX = min(int(os.getenv("DB_ASYNC_POOL_MAX", str(max(DB_POOL_MAX // 3, 1)))), DB_POOL_MAX - 1)
+DB_SYNC_POOL_MAX = DB_POOL_MAX - DB_ASYNC_POOL_MAX
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # 빈 커넥션 대기 최대 시간(초)
+
+# ---------------------------------------------------------
+# 풀 메트릭 (Instrumentator가 노출하는 /metrics 에 함께 표시됨)
+# ---------------------------------------------------------
+POOL_IN_USE = Gauge("search_db_pool_in_use", "대여 중인 DB 커넥션 수")
+POOL_OPEN = Gauge("search_db_pool_open", "풀이 열어둔 DB 커넥션 수")
+POOL_WAITS = Counter("search_db_pool_waits_total", "빈 커넥션이 없어 대기한 횟수")
+POOL_TIMEOUTS = Counter("search_db_pool_timeouts_total", "대기 시간 초과로 대여에 실패한 횟수")
+POOL_CHECKOUT_SECONDS = Histogram(
+    "search_db_pool_checkout_seconds",
+    "커넥션 대여에 걸린 시간(초)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
 
 def get_db_connection():
+    """풀을 거치지 않는 단발성 커넥션 (관리 작업/스크립트용)"""
     return psycopg2.connect(
-        host=os.getenv("DB_HOST", "db"),
-        database=os.getenv("DB_NAME", "korea_travel_db"),
-        user=os.getenv("DB_USER", "myuser"),
-        password=os.getenv("DB_PASSWORD", "mypassword")
+        host=DB_HOST,
+        database=DB_NAME,
+        user=DB_USER,
+        password=DB_PASS
     )
 
-# DB_HOST = os.getenv("DB_HOST", "db")
-# DB_NAME = os.getenv("DB_NAME", "korea_travel_db")
-# DB_USER = os.getenv("DB_USER", "myuser")
-# DB_PASS = os.getenv("DB_PASSWORD", "mypassword")
+
+class PoolTimeoutError(Exception):
+    """DB_POOL_TIMEOUT 안에 빈 커넥션을 얻지 못한 경우"""
+
+
+_vector_extension_ready = False
+
+
+def _prepare_connection(conn):
+    """vector 확장 생성(프로세스당 1회) + register_vector(커넥션당 1회)"""
+    global _vector_extension_ready
+    from pgvector.psycopg2 import register_vector
+
+    if not _vector_extension_ready:
+        with conn.cursor() as cur:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+        conn.commit()
+        _vector_extension_ready = True
+    register_vector(conn)
+
+
+class DBPool:
+    """
+    프로세스 전역 커넥션 풀.
+    - 커넥션은 필요할 때 최대 maxconn 개까지 열고, 반납된 커넥션은 닫지 않고 재사용
+    - 새 커넥션을 열 때 한 번만 pgvector 설정(_prepare_connection)을 수행
+    - 빈 커넥션이 없으면 timeout 까지 대기하며 대기 횟수/대여 지연을 메트릭으로 기록
+    """
+
+    def __init__(self, maxconn: int = DB_SYNC_POOL_MAX, minconn: int = DB_POOL_MIN, timeout: float = DB_POOL_TIMEOUT):
+        self.maxconn = maxconn
+        self.minconn = minconn
+        self.timeout = timeout
+        self._idle = []      # 반납된 커넥션 (LIFO: 최근 쓴 커넥션부터 재사용)
+        self._opened = 0     # 현재 열려 있는 커넥션 수 (대여 중 + 유휴)
+        self._cond = threading.Condition()
+
+    def _open(self):
+        conn = get_db_connection()
+        try:
+            _prepare_connection(conn)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def warmup(self):
+        """minconn 개수만큼 미리 열어둠 (서버 시작 시 호출)"""
+        conns = [self.getconn() for _ in range(max(self.minconn - self._opened, 0))]
+        for conn in conns:
+            self.putconn(conn)
+
+    def getconn(self):
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._opened < self.maxconn:
+                    # 연결은 락 밖에서 열도록 자리만 예약
+                    self._opened += 1
+                    conn = None
+                    break
+                # 빈 커넥션이 없으면 반납될 때까지 대기
+                if not waited:
+                    POOL_WAITS.inc()
+                    waited = True
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    POOL_TIMEOUTS.inc()
+                    raise PoolTimeoutError(f"DB 커넥션 대기 시간 초과 ({self.timeout}s)")
+                self._cond.wait(remaining)
+
+        if conn is None:
+            try:
+                conn = self._open()
+            except Exception:
+                with self._cond:
+                    self._opened -= 1
+                    self._cond.notify()
+                raise
+            POOL_OPEN.set(self._opened)
+
+        POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+        POOL_IN_USE.inc()
+        return conn
+
+    def putconn(self, conn):
+        POOL_IN_USE.dec()
+        # 트랜잭션이 열려 있으면 정리하고, 끊어진 커넥션은 폐기
+        broken = conn.closed != 0
+        if not broken:
+            status = conn.info.transaction_status
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                broken = True
+            elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+
+        with self._cond:
+            if broken:
+                self._opened -= 1
+                try:
+                    conn.close()
+                except psycopg2.Error:
+                    pass
+            else:
+                self._idle.append(conn)
+            POOL_OPEN.set(self._opened)
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "open": self._opened,
+                "idle": len(self._idle),
+                "in_use": self._opened - len(self._idle),
+                "max": self.maxconn,
+            }
+
+    def closeall(self):
+        with self._cond:
+            for conn in self._idle:
+                try:
+                    conn.close()
+                except psycopg2.Error:
+                    pass
+            self._opened -= len(self._idle)
+            self._idle.clear()
+            POOL_OPEN.set(self._opened)
+
+
+db_pool = DBPool()
+
+
+@contextmanager
+def pooled_connection():
+    """
+    풀에서 커넥션을 빌려주고, 블록이 끝나면 반납합니다.
+    예외가 나면 롤백 후 반납하고, 커넥션 자체가 끊어졌으면 폐기합니다.
+    """
+    conn = db_pool.getconn()
+    try:
+        yield conn
+    except Exception:
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                pass
+        raise
+    finally:
+        db_pool.putconn(conn)
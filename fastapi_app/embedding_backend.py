@@ -0,0 +1,141 @@
+# fastapi_app/embedding_backend.py
+"""
+검색용 임베딩 모델 로더 (추론 백엔드 선택)
+
+EMBEDDING_BACKEND 로 같은 모델(paraphrase-multilingual-MiniLM-L12-v2)을 다른 방식으로 띄웁니다.
+- torch       : 기본 fp32 PyTorch (기존 동작)
+- torch-int8  : PyTorch 동적 int8 양자화 (nn.Linear 만, 추가 의존성 없음)
+- onnx        : ONNX Runtime (sentence-transformers backend="onnx", optimum[onnxruntime] 필요)
+- onnx-int8   : ONNX 동적 int8 양자화 모델 (처음 한 번 export 후 EMBEDDING_ONNX_DIR 에 저장해 재사용)
+
+fp32 이외 백엔드는 시작 시 fp32 모델과 같은 문장을 인코딩해 코사인 유사도가
+EMBEDDING_COSINE_TOLERANCE 이상인지 확인하고, 미달이면 fp32 로 되돌립니다.
+(search_vectors 에 이미 저장된 fp32 임베딩과 같은 공간이어야 검색 품질이 유지되므로)
+어느 백엔드든 반환 객체는 .encode() 를 그대로 제공합니다.
+"""
+import logging
+import os
+import time
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()       # torch | torch-int8 | onnx | onnx-int8
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR", "/app/models/embedding-onnx")
+EMBEDDING_ONNX_QUANT = os.getenv("EMBEDDING_ONNX_QUANT", "avx2")          # arm64 | avx2 | avx512 | avx512_vnni
+EMBEDDING_COSINE_TOLERANCE = float(os.getenv("EMBEDDING_COSINE_TOLERANCE", "0.99"))
+EMBEDDING_VERIFY = os.getenv("EMBEDDING_VERIFY", "true").lower() == "true"
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+# 정확도 비교용 문장 (검색어 + 색인되는 본문 형태를 섞음)
+VERIFY_SENTENCES = [
+    "서울", "부산 맛집", "제주도 오름 추천", "경주 한옥 숙소",
+    "Seoul night view", "Busan seafood market", "東京から釜山への旅行", "首尔的咖啡馆",
+    "성심당 대전광역시 중구 대종로480번길 15 빵집",
+    "해운대 해수욕장 근처에서 일몰을 보기 좋은 카페와 산책로를 소개합니다.",
+    "A quiet guesthouse near Jeonju Hanok Village with traditional breakfast.",
+]
+
+
+def _load_torch(model_name: str, device: Optional[str] = None):
+    """device=None 이면 SentenceTransformer 가 직접 선택 (GPU 가 있으면 GPU, 기존 동작)"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name, device=device)
+
+
+def _load_torch_int8(model_name: str):
+    import torch
+    # 동적 int8 양자화는 CPU 전용
+    model = _load_torch(model_name, device="cpu")
+    # 가중치가 대부분인 Linear 층만 int8 로, 활성값은 실행 시 동적으로 양자화
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_onnx(model_name: str):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name, device="cpu", backend="onnx")
+
+
+def _load_onnx_int8(model_name: str):
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    file_name = f"model_qint8_{EMBEDDING_ONNX_QUANT}.onnx"
+    local_path = os.path.join(EMBEDDING_ONNX_DIR, "onnx", file_name)
+    if not os.path.exists(local_path):
+        # 최초 1회: fp32 ONNX 로 export -> 동적 int8 양자화 -> EMBEDDING_ONNX_DIR 에 저장
+        logger.info(f"ONNX int8 모델 생성 중 ({EMBEDDING_ONNX_QUANT}) -> {EMBEDDING_ONNX_DIR}")
+        onnx_model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+        onnx_model.save_pretrained(EMBEDDING_ONNX_DIR)
+        export_dynamic_quantized_onnx_model(onnx_model, EMBEDDING_ONNX_QUANT, EMBEDDING_ONNX_DIR)
+    return SentenceTransformer(EMBEDDING_ONNX_DIR, device="cpu", backend="onnx",
+                               model_kwargs={"file_name": f"onnx/{file_name}"})
+
+
+_LOADERS = {
+    "torch": _load_torch,
+    "torch-int8": _load_torch_int8,
+    "onnx": _load_onnx,
+    "onnx-int8": _load_onnx_int8,
+}
+
+
+def load_backend(backend: str, model_name: str = EMBEDDING_MODEL):
+    if backend not in _LOADERS:
+        raise ValueError(f"지원하지 않는 EMBEDDING_BACKEND: {backend} (가능: {', '.join(BACKENDS)})")
+    return _LOADERS[backend](model_name)
+
+
+def cosine_agreement(reference, candidate) -> Tuple[float, float]:
+    """같은 문장들의 두 임베딩 행렬 -> (최소, 평균) 코사인 유사도"""
+    import numpy as np
+
+    ref = np.array(reference, dtype=np.float32)
+    cand = np.array(candidate, dtype=np.float32)
+    ref /= np.linalg.norm(ref, axis=1, keepdims=True)
+    cand /= np.linalg.norm(cand, axis=1, keepdims=True)
+    sims = (ref * cand).sum(axis=1)
+    return float(sims.min()), float(sims.mean())
+
+
+def verify_against_reference(model, reference_model, sentences: Sequence[str] = VERIFY_SENTENCES,
+                             tolerance: float = EMBEDDING_COSINE_TOLERANCE) -> Tuple[bool, float, float]:
+    """fp32 기준 모델 대비 코사인 유사도가 tolerance 이상인지 -> (통과 여부, 최소, 평균)"""
+    sentences = list(sentences)
+    reference = reference_model.encode(sentences, convert_to_numpy=True, show_progress_bar=False)
+    candidate = model.encode(sentences, convert_to_numpy=True, show_progress_bar=False)
+    min_sim, mean_sim = cosine_agreement(reference, candidate)
+    return min_sim >= tolerance, min_sim, mean_sim
+
+
+def load_embedding_model(backend: str = EMBEDDING_BACKEND, model_name: str = EMBEDDING_MODEL,
+                         extra_sentences: Optional[List[str]] = None):
+    """
+    설정된 백엔드로 모델 로드. fp32 가 아니면 기준 모델과 비교해 허용 오차를 넘으면 fp32 로 대체.
+    반환값: (model, 실제 사용 중인 백엔드 이름)
+    """
+    if backend == "torch":
+        return _load_torch(model_name), "torch"
+
+    started = time.perf_counter()
+    try:
+        model = load_backend(backend, model_name)
+    except Exception as e:
+        logger.error(f"❌ 임베딩 백엔드 '{backend}' 로딩 실패, fp32 torch 로 대체: {e}")
+        return _load_torch(model_name), "torch"
+    logger.info(f"임베딩 백엔드 '{backend}' 로딩 ({time.perf_counter() - started:.1f}s)")
+
+    if not EMBEDDING_VERIFY:
+        return model, backend
+
+    reference = _load_torch(model_name)
+    ok, min_sim, mean_sim = verify_against_reference(model, reference, VERIFY_SENTENCES + (extra_sentences or []))
+    if ok:
+        logger.info(f"✅ '{backend}' fp32 대비 코사인 유사도 min={min_sim:.4f} mean={mean_sim:.4f}")
+        del reference
+        return model, backend
+
+    logger.warning(f"⚠️ '{backend}' fp32 대비 코사인 유사도 min={min_sim:.4f} < {EMBEDDING_COSINE_TOLERANCE}, "
+                   f"fp32 torch 로 대체")
+    return reference, "torch"
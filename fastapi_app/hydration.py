@@ -0,0 +1,184 @@
+# fastapi_app/hydration.py
+"""
+검색 결과 상세 정보(썸네일, 제목, 평점 등) 일괄 조회
+
+랭킹 이후 places/shorts/columns/plans/reviews 의 상세 행을 카테고리마다 따로 조회하지 않고
+카테고리별 JSON 집계를 SELECT 목록에 나란히 둔 쿼리 1개(왕복 1회)로 가져옵니다.
+grouped_results 형태({"places": [...], "shorts": [...], ...})만 맞추면 다른 검색 진입점에서도 재사용 가능.
+"""
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client import Histogram
+
+from database import pooled_connection
+
+logger = logging.getLogger(__name__)
+
+HYDRATION_SECONDS = Histogram(
+    "search_hydration_seconds",
+    "검색 결과 상세 조회 시간(초, category=all 은 DB 왕복 전체)",
+    ["category"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# grouped_results 키 순서 = SELECT 목록 순서
+HYDRATED_GROUPS = ["places", "shorts", "columns", "plans", "reviews"]
+
+# 카테고리별 상세 조회 (ids 파라미터 하나). /search/async 는 카테고리마다 따로 실행
+DETAIL_SQL = {
+    "places": """
+        SELECT p.id, p.thumbnail_urls, p.average_rating, p.review_count, p.name, p.address, p.source_lang,
+               (SELECT r.image_url FROM place_reviews r
+                WHERE r.place_id = p.id AND r.image_url IS NOT NULL AND r.image_url != ''
+                ORDER BY r.created_at DESC
+                LIMIT 1) AS review_image
+        FROM places p
+        WHERE p.id = ANY(%(ids)s::bigint[])""",
+    "shorts": """
+        SELECT id, thumbnail_url, title, content, source_lang
+        FROM shortforms WHERE id = ANY(%(ids)s::bigint[])""",
+    "columns": """
+        SELECT id, thumbnail_url, title
+        FROM local_columns WHERE id = ANY(%(ids)s::bigint[])""",
+    "plans": """
+        SELECT id, title, description
+        FROM travel_plans WHERE id = ANY(%(ids)s::bigint[])""",
+    "reviews": """
+        SELECT id, content, source_lang, rating
+        FROM place_reviews WHERE id = ANY(%(ids)s::bigint[])""",
+}
+
+
+def detail_json_sql(group: str, param: str = "ids") -> str:
+    """카테고리 상세 행을 JSON 배열 하나로 집계하는 스칼라 서브쿼리"""
+    body = DETAIL_SQL[group].replace("%(ids)s", f"%({param})s")
+    return f"(SELECT COALESCE(json_agg(x), '[]'::json) FROM ({body}\n    ) x)"
+
+
+# PostgreSQL 은 SELECT 목록을 왼쪽부터 평가하므로, 각 집계 사이의 clock_timestamp() 차이가
+# 카테고리별 서버 측 조회 시간이 됩니다.
+HYDRATION_SQL = "SELECT\n    clock_timestamp() AS t0,\n" + "".join(
+    f"    {detail_json_sql(group, group)} AS {group}_json,\n    clock_timestamp() AS t{i + 1}"
+    + (",\n" if i + 1 < len(HYDRATED_GROUPS) else "\n")
+    for i, group in enumerate(HYDRATED_GROUPS)
+)
+
+def fetch_details(cur, ids_by_group: Dict[str, List[int]]) -> Tuple[Dict[str, Dict[int, dict]], Dict[str, float]]:
+    """
+    카테고리별 id 목록 -> ({그룹: {id: 상세 행}}, {그룹: 서버 조회 ms})
+    id 가 없는 카테고리도 빈 배열로 조회하므로 항상 쿼리 1회
+    """
+    params = {group: list(ids_by_group.get(group) or []) for group in HYDRATED_GROUPS}
+    started = time.perf_counter()
+    cur.execute(HYDRATION_SQL, params)
+    row = cur.fetchone()
+    HYDRATION_SECONDS.labels(category="all").observe(time.perf_counter() - started)
+
+    # row = (t0, places_json, t1, shorts_json, t2, columns_json, t3, plans_json, t4, reviews_json, t5)
+    details = {}
+    timings = {}
+    for i, group in enumerate(HYDRATED_GROUPS):
+        t_before, rows, t_after = row[i * 2], row[i * 2 + 1], row[i * 2 + 2]
+        details[group] = {r["id"]: r for r in (rows or [])}
+        elapsed = (t_after - t_before).total_seconds()
+        timings[group] = round(elapsed * 1000, 3)
+        if params[group]:
+            HYDRATION_SECONDS.labels(category=group).observe(elapsed)
+    return details, timings
+
+
+def _apply_places(items, rows):
+    for item in items:
+        info = rows.get(item["id"], {})
+        urls = info.get("thumbnail_urls")
+        thumb = info.get("review_image")
+        if not thumb and urls and isinstance(urls, list) and len(urls) > 0:
+            thumb = urls[0]
+        rating = info.get("average_rating")
+        item["thumbnail_url"] = thumb
+        item["average_rating"] = float(rating) if rating else 0.0
+        item["review_count"] = info.get("review_count") or 0
+        item["name"] = info.get("name")
+        item["address"] = info.get("address")
+        item["source_lang"] = info.get("source_lang") or "kor_Hang"
+
+
+def _apply_shorts(items, rows):
+    for item in items:
+        info = rows.get(item["id"], {})
+        item["thumbnail_url"] = info.get("thumbnail_url")
+        item["title"] = info.get("title")
+        item["content"] = info.get("content")
+        item["source_lang"] = info.get("source_lang") or "kor_Hang"
+
+
+def _apply_columns(items, rows):
+    for item in items:
+        info = rows.get(item["id"], {})
+        item["thumbnail_url"] = info.get("thumbnail_url")
+        item["title"] = info.get("title")
+
+
+def _apply_plans(items, rows):
+    for item in items:
+        info = rows.get(item["id"], {})
+        item["title"] = info.get("title")
+        item["description"] = info.get("description")
+        item["source_lang"] = "kor_Hang"  # Plans는 source_lang 필드가 없으므로 기본값
+
+
+def _apply_reviews(items, rows):
+    for item in items:
+        info = rows.get(item["id"], {})
+        if info.get("content"):
+            item["content"] = info.get("content")
+        item["source_lang"] = info.get("source_lang") or "kor_Hang"
+        item["rating"] = info.get("rating", 5)
+
+
+_APPLIERS = {
+    "places": _apply_places,
+    "shorts": _apply_shorts,
+    "columns": _apply_columns,
+    "plans": _apply_plans,
+    "reviews": _apply_reviews,
+}
+
+
+def apply_details(group: str, items: List[dict], rows: Dict[int, dict]):
+    """상세 행({id: 행})을 해당 카테고리 아이템들에 채워 넣음 (제자리 수정)"""
+    _APPLIERS[group](items, rows)
+
+
+def hydrate_grouped_results(grouped_results: Dict[str, List[dict]], conn=None) -> Optional[Dict[str, float]]:
+    """
+    grouped_results 의 각 항목에 상세 정보를 채워 넣습니다. (제자리 수정)
+    conn 을 주면 그 커넥션을, 없으면 풀에서 하나 빌려 사용.
+    반환값: 카테고리별 조회 시간(ms), 조회할 항목이 없으면 None
+    """
+    ids_by_group = {
+        group: [item["id"] for item in grouped_results.get(group, [])]
+        for group in HYDRATED_GROUPS
+    }
+    if not any(ids_by_group.values()):
+        return None
+
+    if conn is None:
+        with pooled_connection() as pooled:
+            cur = pooled.cursor()
+            details, timings = fetch_details(cur, ids_by_group)
+            cur.close()
+    else:
+        cur = conn.cursor()
+        details, timings = fetch_details(cur, ids_by_group)
+        cur.close()
+
+    for group in HYDRATED_GROUPS:
+        items = grouped_results.get(group)
+        if items:
+            apply_details(group, items, details[group])
+
+    logger.debug(f"검색 결과 상세 조회 시간(ms): {timings}")
+    return timings
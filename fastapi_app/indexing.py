@@ -0,0 +1,232 @@
+# fastapi_app/indexing.py
+"""
+대량 색인(Index Data) 백그라운드 워커
+
+- /index-data/batch 로 들어온 텍스트를 큐에 쌓고 즉시 job_id 를 돌려줌 (202)
+- 워커 스레드가 큐에서 최대 INDEX_BATCH_SIZE 개씩 모아 SentenceTransformer 로 한 번에 인코딩
+- 결과는 multi-row INSERT ... ON CONFLICT 한 번으로 upsert
+- job 상태는 /index-data/jobs/{job_id} 로 조회
+"""
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+from psycopg2.extras import execute_values
+
+from database import pooled_connection
+from result_cache import search_result_cache
+
+logger = logging.getLogger(__name__)
+
+INDEX_BATCH_SIZE = int(os.getenv("INDEX_BATCH_SIZE", "256"))           # 한 번에 인코딩/저장할 최대 건수
+INDEX_BATCH_WAIT = float(os.getenv("INDEX_BATCH_WAIT", "0.2"))         # 배치를 채우려고 기다리는 시간(초)
+INDEX_ENCODE_BATCH_SIZE = int(os.getenv("INDEX_ENCODE_BATCH_SIZE", "64"))  # model.encode 내부 배치 크기
+INDEX_QUEUE_MAX = int(os.getenv("INDEX_QUEUE_MAX", "50000"))           # 대기열 최대 건수
+INDEX_JOB_HISTORY = int(os.getenv("INDEX_JOB_HISTORY", "1000"))        # 보관할 job 상태 개수
+
+INDEX_QUEUE_DEPTH = Gauge("search_index_queue_depth", "색인 대기열에 쌓인 건수")
+INDEX_ITEMS = Counter("search_index_items_total", "배치 색인 처리 건수", ["result"])
+INDEX_BATCH_SECONDS = Histogram("search_index_batch_seconds", "배치 1회 인코딩+저장 시간(초)")
+
+UPSERT_SQL = """
+    INSERT INTO search_vectors (target_id, category, content, embedding)
+    VALUES %s
+    ON CONFLICT (target_id, category)
+    DO UPDATE SET content = EXCLUDED.content, embedding = EXCLUDED.embedding
+"""
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 새 job 을 받을 수 없는 경우"""
+
+
+class IndexingWorker:
+    """in-process 색인 큐 + 배치 인코딩 워커"""
+
+    def __init__(self, batch_size: int = INDEX_BATCH_SIZE, batch_wait: float = INDEX_BATCH_WAIT,
+                 max_queue: int = INDEX_QUEUE_MAX):
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._queue: "queue.Queue[Tuple[str, int, str, str]]" = queue.Queue(maxsize=max_queue)
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self._model_getter: Optional[Callable] = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------------------------------------------------------
+    # 수명 주기
+    # ---------------------------------------------------------
+    def start(self, model_getter: Callable):
+        """model_getter: 현재 로딩된 SentenceTransformer 를 돌려주는 함수"""
+        self._model_getter = model_getter
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="index-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ---------------------------------------------------------
+    # job 등록 / 조회
+    # ---------------------------------------------------------
+    def submit(self, items: List[Tuple[int, str, str]]) -> Dict:
+        """items: (id, category, content) 목록. job 정보를 반환"""
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "queued",   # queued | running | done | failed
+            "total": len(items),
+            "done": 0,
+            "failed": 0,
+            "errors": [],
+            "created_at": time.time(),
+            "finished_at": None,
+        }
+        # /index-data/batch 는 threadpool 에서 동시에 실행되므로 용량 확인 ~ job 등록 ~ 적재를 한 번에 처리
+        # (소비자는 워커 스레드뿐이라 잠금 안에서 확인한 여유 공간은 줄어들지 않음 → put_nowait 가 Full 이 되지 않음)
+        with self._submit_lock:
+            if self._queue.qsize() + len(items) > self._queue.maxsize:
+                raise QueueFullError(f"색인 대기열이 가득 찼습니다. (최대 {self._queue.maxsize}건)")
+
+            with self._jobs_lock:
+                self._jobs[job_id] = job
+                self._evict_finished_jobs()
+
+            for target_id, category, content in items:
+                self._queue.put_nowait((job_id, target_id, category, content))
+            depth = self._queue.qsize()
+
+        INDEX_QUEUE_DEPTH.set(depth)
+        return dict(job, queue_depth=depth)
+
+    def _evict_finished_jobs(self):
+        """오래된 job 기록 정리 (_jobs_lock 안에서 호출). 아직 처리 중인 job 은 남겨 둠"""
+        excess = len(self._jobs) - INDEX_JOB_HISTORY
+        if excess <= 0:
+            return
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in ("done", "failed")]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            return dict(job, errors=list(job["errors"])) if job else None
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    # ---------------------------------------------------------
+    # 워커 루프
+    # ---------------------------------------------------------
+    def _collect_batch(self) -> List[Tuple[str, int, str, str]]:
+        """첫 건을 기다린 뒤 batch_wait 동안 batch_size 까지 모음"""
+        try:
+            first = self._queue.get(timeout=1.0)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        INDEX_QUEUE_DEPTH.set(self._queue.qsize())
+        return batch
+
+    def _run(self):
+        # 모델 로딩 전에 꺼낸 배치는 큐에 되돌리지 않고 여기 보관 후 재시도
+        # (이 스레드가 유일한 소비자라 꽉 찬 큐에 blocking put 하면 스스로 멈춤)
+        pending: List[Tuple[str, int, str, str]] = []
+        while not self._stop.is_set():
+            batch = pending or self._collect_batch()
+            pending = []
+            if not batch:
+                continue
+            model = self._model_getter() if self._model_getter else None
+            if model is None:
+                # 모델 로딩 전이면 잠시 후 같은 배치로 다시 시도 (순서 유지)
+                pending = batch
+                self._stop.wait(1.0)
+                continue
+            self._process(model, batch)
+
+    def _process(self, model, batch: List[Tuple[str, int, str, str]]):
+        started = time.perf_counter()
+        job_ids = {entry[0] for entry in batch}
+        self._update_jobs(job_ids, status="running")
+
+        # 같은 배치 안에 (target_id, category) 가 중복되면 ON CONFLICT 가 실패하므로 마지막 값만 사용
+        latest: "OrderedDict[Tuple[int, str], Tuple[str, str]]" = OrderedDict()
+        for job_id, target_id, category, content in batch:
+            latest.pop((target_id, category), None)
+            latest[(target_id, category)] = (job_id, content)
+
+        keys = list(latest.keys())
+        texts = [latest[k][1] for k in keys]
+        try:
+            embeddings = model.encode(
+                texts,
+                batch_size=INDEX_ENCODE_BATCH_SIZE,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+            rows = [(tid, cat, text, emb) for (tid, cat), text, emb in zip(keys, texts, embeddings)]
+            with pooled_connection() as conn:
+                cur = conn.cursor()
+                execute_values(cur, UPSERT_SQL, rows, page_size=len(rows))
+                conn.commit()
+                cur.close()
+            search_result_cache.invalidate_many([(cat, tid, text) for (tid, cat), text in zip(keys, texts)])
+        except Exception as e:
+            logger.error(f"❌ 배치 색인 실패 ({len(batch)}건): {e}")
+            INDEX_ITEMS.labels(result="failed").inc(len(batch))
+            self._count(batch, failed=True, error=str(e))
+            return
+
+        INDEX_ITEMS.labels(result="done").inc(len(batch))
+        INDEX_BATCH_SECONDS.observe(time.perf_counter() - started)
+        self._count(batch, failed=False)
+        logger.info(f"배치 색인 완료: {len(rows)}건 ({time.perf_counter() - started:.2f}s)")
+
+    def _update_jobs(self, job_ids, **fields):
+        with self._jobs_lock:
+            for job_id in job_ids:
+                job = self._jobs.get(job_id)
+                if job and job["status"] == "queued":
+                    job.update(fields)
+
+    def _count(self, batch, failed: bool, error: Optional[str] = None):
+        per_job: Dict[str, int] = {}
+        for entry in batch:
+            per_job[entry[0]] = per_job.get(entry[0], 0) + 1
+
+        with self._jobs_lock:
+            for job_id, count in per_job.items():
+                job = self._jobs.get(job_id)
+                if not job:
+                    continue
+                if failed:
+                    job["failed"] += count
+                    if error and len(job["errors"]) < 10:
+                        job["errors"].append(error)
+                else:
+                    job["done"] += count
+                if job["done"] + job["failed"] >= job["total"]:
+                    job["status"] = "failed" if job["failed"] and not job["done"] else "done"
+                    job["finished_at"] = time.time()
+
+
+indexing_worker = IndexingWorker()
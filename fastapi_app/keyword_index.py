@@ -0,0 +1,136 @@
+# fastapi_app/keyword_index.py
+"""
+하이브리드 검색의 키워드(ILIKE) 절반을 위한 pg_trgm 인덱스 관리
+
+- '%검색어%' 형태의 ILIKE 는 B-tree 로는 처리가 안 돼 매 요청 전체 테이블을 스캔하므로
+  pg_trgm GIN 인덱스를 만들어 인덱스 조회로 바꿉니다.
+- places / shortforms / local_columns 는 Django 가 소유한 테이블이라 Django 마이그레이션 대신
+  이 모듈이 search_schema_migrations 테이블에 적용 이력을 남기며 한 번씩만 적용합니다.
+- CREATE INDEX CONCURRENTLY 를 쓰므로 쓰기를 막지 않고, 서버 시작 시 백그라운드에서 실행됩니다.
+
+참고: 트라이그램은 3글자 단위라 2글자 검색어("서울")는 인덱스로 후보를 좁히지 못하고
+      인덱스 전체를 훑게 됩니다. (결과는 동일, 속도 이점만 줄어듦)
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# (마이그레이션 ID, SQL) - 순서대로 한 번만 적용. 이미 적용된 ID 는 수정하지 말고 새 ID 를 추가할 것
+MIGRATIONS: List[Tuple[str, str]] = [
+    ("0001_pg_trgm_extension",
+     "CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+    ("0002_search_vectors_content_trgm",
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_search_vectors_content_trgm "
+     "ON search_vectors USING gin (content gin_trgm_ops)"),
+    ("0003_places_name_trgm",
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_places_name_trgm "
+     "ON places USING gin (name gin_trgm_ops)"),
+    ("0004_places_address_trgm",
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_places_address_trgm "
+     "ON places USING gin (address gin_trgm_ops)"),
+    ("0005_shortforms_title_trgm",
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_shortforms_title_trgm "
+     "ON shortforms USING gin (title gin_trgm_ops)"),
+    ("0006_shortforms_content_trgm",
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_shortforms_content_trgm "
+     "ON shortforms USING gin (content gin_trgm_ops)"),
+    ("0007_local_columns_title_trgm",
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_local_columns_title_trgm "
+     "ON local_columns USING gin (title gin_trgm_ops)"),
+    ("0008_local_columns_content_trgm",
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_local_columns_content_trgm "
+     "ON local_columns USING gin (content gin_trgm_ops)"),
+    # NOT EXISTS 안티조인(search_vectors.target_id = X.id AND category = '...')은
+    # init_db 의 idx_target_category (target_id, category) Unique Index 로 처리됨
+]
+
+
+def like_pattern(query: str) -> str:
+    """ILIKE 용 '%검색어%' 패턴 (사용자가 입력한 %, _ 는 문자 그대로 취급)"""
+    escaped = (query or "").replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class KeywordIndexMigrator:
+    """MIGRATIONS 를 순서대로 적용하고 적용 이력을 관리"""
+
+    def __init__(self, migrations: List[Tuple[str, str]] = MIGRATIONS):
+        self.migrations = migrations
+        self.state: Dict = {
+            "status": "pending",   # pending | running | done | failed
+            "applied": [],
+            "last_error": None,
+            "finished_at": None,
+        }
+        self._lock = threading.Lock()
+
+    def start(self):
+        """서버 시작을 막지 않도록 백그라운드 스레드에서 적용"""
+        threading.Thread(target=self.apply, name="keyword-index-migrator", daemon=True).start()
+
+    def _invalid_index_name(self, sql: str):
+        marker = "IF NOT EXISTS "
+        if "CREATE INDEX CONCURRENTLY" not in sql or marker not in sql:
+            return None
+        return sql.split(marker, 1)[1].split()[0]
+
+    def apply(self) -> bool:
+        if not self._lock.acquire(blocking=False):
+            return False
+        self.state.update(status="running", last_error=None)
+        conn = None
+        try:
+            # CONCURRENTLY 는 트랜잭션 밖에서만 가능하므로 autocommit 전용 커넥션 사용
+            conn = get_db_connection()
+            conn.autocommit = True
+            cur = conn.cursor()
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS search_schema_migrations (
+                    id VARCHAR(100) PRIMARY KEY,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+            """)
+            cur.execute("SELECT id FROM search_schema_migrations")
+            applied = {row[0] for row in cur.fetchall()}
+
+            for migration_id, sql in self.migrations:
+                if migration_id in applied:
+                    continue
+                # 이전 CONCURRENTLY 빌드가 실패했으면 INVALID 인덱스가 남아
+                # IF NOT EXISTS 가 건너뛰므로 먼저 정리
+                index_name = self._invalid_index_name(sql)
+                if index_name:
+                    cur.execute("""
+                        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                        WHERE c.relname = %s AND NOT i.indisvalid
+                    """, (index_name,))
+                    if cur.fetchone():
+                        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+                started = time.time()
+                cur.execute(sql)
+                cur.execute("INSERT INTO search_schema_migrations (id) VALUES (%s) ON CONFLICT DO NOTHING",
+                            (migration_id,))
+                applied.add(migration_id)
+                logger.info(f"✅ 키워드 인덱스 마이그레이션 적용: {migration_id} ({time.time() - started:.1f}s)")
+
+            cur.close()
+            self.state.update(status="done", applied=sorted(applied), finished_at=time.time())
+            return True
+        except Exception as e:
+            # 예: Django 마이그레이션 전이라 대상 테이블이 없음 -> 다음 시작 때 다시 시도
+            logger.error(f"❌ 키워드 인덱스 마이그레이션 실패: {e}")
+            self.state.update(status="failed", last_error=str(e))
+            return False
+        finally:
+            if conn:
+                conn.close()
+            self._lock.release()
+
+
+keyword_migrator = KeywordIndexMigrator()
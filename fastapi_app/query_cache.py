@@ -0,0 +1,147 @@
+# fastapi_app/query_cache.py
+"""
+검색어 임베딩 LRU 캐시
+
+/search 트래픽은 "서울", "부산 맛집" 같은 소수의 반복 검색어가 대부분이므로
+정규화된 검색어 -> 384차원 벡터(float32)를 메모리에 보관해 모델 추론을 건너뜁니다.
+- 항목 수(QUERY_CACHE_MAX_ENTRIES)와 바이트(QUERY_CACHE_MAX_BYTES) 두 가지 한도로 제한
+- hit/miss/eviction 카운터와 사용 바이트를 /metrics 에 노출
+- 서버 시작 시 시드 검색어로 미리 채울 수 있음 (QUERY_CACHE_WARMUP)
+"""
+import logging
+import os
+import sys
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "10000"))
+QUERY_CACHE_MAX_BYTES = int(os.getenv("QUERY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # 32MB
+QUERY_CACHE_WARMUP = os.getenv("QUERY_CACHE_WARMUP", "true").lower() == "true"
+
+# 기본 시드: 인기 도시(fastapi_places 의 CITY_NAMES 와 동일) 한글/영문명
+DEFAULT_SEED_QUERIES = [
+    "서울", "부산", "제주", "대전", "대구", "인천", "광주", "수원", "전주", "경주",
+    "Seoul", "Busan", "Jeju", "Daejeon", "Daegu", "Incheon", "Gwangju", "Suwon", "Jeonju", "Gyeongju",
+]
+
+# 항목당 고정 오버헤드 (OrderedDict 노드, ndarray 헤더 등 대략치)
+_ENTRY_OVERHEAD = 200
+
+CACHE_HITS = Counter("search_query_embedding_cache_hits_total", "검색어 임베딩 캐시 hit")
+CACHE_MISSES = Counter("search_query_embedding_cache_misses_total", "검색어 임베딩 캐시 miss")
+CACHE_EVICTIONS = Counter("search_query_embedding_cache_evictions_total", "한도 초과로 제거된 항목 수")
+CACHE_BYTES = Gauge("search_query_embedding_cache_bytes", "캐시가 사용 중인 메모리(바이트, 추정)")
+CACHE_ENTRIES = Gauge("search_query_embedding_cache_entries", "캐시 항목 수")
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용 정규화: NFC + 연속 공백 하나로.
+    토크나이저가 대소문자를 구분해 "Seoul" 과 "seoul" 의 벡터가 다르므로 소문자로 바꾸지 않음
+    """
+    if not query:
+        return ""
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+def load_seed_queries() -> List[str]:
+    """QUERY_CACHE_SEED (쉼표 구분) 가 있으면 그것을, 없으면 기본 시드 사용"""
+    raw = os.getenv("QUERY_CACHE_SEED")
+    if raw:
+        return [q.strip() for q in raw.split(",") if q.strip()]
+    return list(DEFAULT_SEED_QUERIES)
+
+
+class QueryEmbeddingCache:
+    """정규화 검색어 -> float32 벡터 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int = QUERY_CACHE_MAX_ENTRIES, max_bytes: int = QUERY_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._store: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry_size(key: str, vector: np.ndarray) -> int:
+        return sys.getsizeof(key) + vector.nbytes + _ENTRY_OVERHEAD
+
+    def get(self, query: str) -> Optional[np.ndarray]:
+        key = normalize_query(query)
+        with self._lock:
+            vector = self._store.get(key)
+            if vector is None:
+                CACHE_MISSES.inc()
+                return None
+            self._store.move_to_end(key)
+        CACHE_HITS.inc()
+        return vector
+
+    def put(self, query: str, vector) -> np.ndarray:
+        key = normalize_query(query)
+        compact = np.ascontiguousarray(vector, dtype=np.float32).reshape(-1)
+        compact.setflags(write=False)   # 캐시된 벡터가 호출측에서 수정되지 않도록
+        size = self._entry_size(key, compact)
+        if size > self.max_bytes:
+            return compact
+
+        with self._lock:
+            old = self._store.pop(key, None)
+            if old is not None:
+                self._bytes -= self._entry_size(key, old)
+            self._store[key] = compact
+            self._bytes += size
+            # 한도를 넘으면 가장 오래 안 쓴 항목부터 제거
+            while len(self._store) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, old_vec = self._store.popitem(last=False)
+                self._bytes -= self._entry_size(old_key, old_vec)
+                CACHE_EVICTIONS.inc()
+            CACHE_BYTES.set(self._bytes)
+            CACHE_ENTRIES.set(len(self._store))
+        return compact
+
+    def get_or_encode(self, query: str, model) -> np.ndarray:
+        """
+        캐시에 있으면 그대로, 없으면 model.encode 후 저장.
+        정규화는 캐시 키에만 쓰고 인코딩은 원래 검색어로
+        """
+        vector = self.get(query)
+        if vector is not None:
+            return vector
+        return self.put(query, model.encode(query))
+
+    def warm(self, model, queries: Iterable[str]) -> int:
+        """시드 검색어를 한 번의 배치 인코딩으로 미리 채움 (키가 같은 검색어는 처음 것만)"""
+        originals: "OrderedDict[str, str]" = OrderedDict()
+        for q in queries:
+            key = normalize_query(q)
+            if key and key not in originals:
+                originals[key] = q
+        if not originals:
+            return 0
+        vectors = model.encode(list(originals.values()), convert_to_numpy=True, show_progress_bar=False)
+        for query, vector in zip(originals.values(), vectors):
+            self.put(query, vector)
+        return len(originals)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._store), "bytes": self._bytes,
+                    "max_entries": self.max_entries, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+            self._bytes = 0
+            CACHE_BYTES.set(0)
+            CACHE_ENTRIES.set(0)
+
+
+query_cache = QueryEmbeddingCache()
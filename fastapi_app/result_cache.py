@@ -0,0 +1,164 @@
+# fastapi_app/result_cache.py
+"""
+검색 응답 캐시 ((검색어, 언어) -> 그룹화된 결과)
+
+"서울", "부산 맛집" 같은 인기 검색어는 랭킹/상세/번역 전체를 메모리에서 바로 돌려줍니다.
+- TTL(SEARCH_RESULT_CACHE_TTL) + 항목 수(SEARCH_RESULT_CACHE_MAX_ENTRIES) LRU 제한
+- (category, target_id) -> 그 항목을 포함한 캐시 키 역색인을 두어,
+  Django search_signals 가 보내는 /index-data, /delete-data (및 배치 색인) 때
+  해당 항목이 들어 있는 캐시만 정확히 지웁니다.
+- 새로 색인된 글은 아직 어떤 캐시에도 없으므로, 본문에 검색어가 들어 있는(키워드 일치) 캐시도 함께 지웁니다.
+  벡터 유사도만으로 새로 순위에 들 결과는 TTL 이 지나야 반영됩니다.
+
+캐시된 값은 여러 요청이 공유하므로 꺼낸 뒤 수정하지 말 것.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from query_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RESULT_CACHE_ENABLED = os.getenv("SEARCH_RESULT_CACHE_ENABLED", "true").lower() == "true"
+SEARCH_RESULT_CACHE_TTL = float(os.getenv("SEARCH_RESULT_CACHE_TTL", "60"))  # 초
+SEARCH_RESULT_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_RESULT_CACHE_MAX_ENTRIES", "2000"))
+
+RESULT_CACHE_HITS = Counter("search_result_cache_hits_total", "검색 응답 캐시 hit")
+RESULT_CACHE_MISSES = Counter("search_result_cache_misses_total", "검색 응답 캐시 miss")
+RESULT_CACHE_EVICTIONS = Counter("search_result_cache_evictions_total", "TTL 만료/한도 초과로 제거된 항목 수")
+RESULT_CACHE_INVALIDATIONS = Counter("search_result_cache_invalidations_total", "색인/삭제로 무효화된 항목 수")
+RESULT_CACHE_ENTRIES = Gauge("search_result_cache_entries", "검색 응답 캐시 항목 수")
+
+CacheKey = Tuple[str, str, Optional[int], Optional[int]]
+Ref = Tuple[str, int]  # (category, target_id)
+
+
+def result_refs(rows) -> Set[Ref]:
+    """랭킹 결과 행(target_id, category, ...) -> 역색인용 (category, target_id) 집합"""
+    return {(r[1], r[0]) for r in rows}
+
+
+class SearchResultCache:
+    """(검색어, 언어, ANN 파라미터) -> 결과 TTL/LRU 캐시 + (category, target_id) 역색인 (스레드 안전)"""
+
+    def __init__(self, ttl: float = SEARCH_RESULT_CACHE_TTL, max_entries: int = SEARCH_RESULT_CACHE_MAX_ENTRIES,
+                 enabled: bool = SEARCH_RESULT_CACHE_ENABLED):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        # key -> (만료 시각, 결과, refs)
+        self._store: "OrderedDict[CacheKey, Tuple[float, dict, Set[Ref]]]" = OrderedDict()
+        self._refs: Dict[Ref, Set[CacheKey]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query: str, lang: Optional[str], ef_search: Optional[int] = None,
+                 probes: Optional[int] = None) -> CacheKey:
+        return (normalize_query(query), lang or "", ef_search, probes)
+
+    def generation(self) -> int:
+        """
+        조회 시작 전에 받아 두었다가 put() 에 넘김.
+        조회 도중 무효화가 있었으면 (이미 낡았을 수 있는) 그 결과는 저장하지 않음
+        """
+        return self._generation
+
+    def get(self, key: CacheKey) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(key)
+                    RESULT_CACHE_EVICTIONS.inc()
+                RESULT_CACHE_MISSES.inc()
+                return None
+            self._store.move_to_end(key)
+        RESULT_CACHE_HITS.inc()
+        return entry[1]
+
+    def put(self, key: CacheKey, value: dict, refs: Iterable[Ref], generation: int) -> bool:
+        if not self.enabled or not key[0]:
+            return False
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._remove(key)
+            refs = set(refs)
+            self._store[key] = (time.monotonic() + self.ttl, value, refs)
+            for ref in refs:
+                self._refs.setdefault(ref, set()).add(key)
+            while len(self._store) > self.max_entries:
+                self._remove(next(iter(self._store)))
+                RESULT_CACHE_EVICTIONS.inc()
+            RESULT_CACHE_ENTRIES.set(len(self._store))
+        return True
+
+    def _remove(self, key: CacheKey) -> bool:
+        """락을 잡은 상태에서 호출"""
+        entry = self._store.pop(key, None)
+        if entry is None:
+            return False
+        for ref in entry[2]:
+            keys = self._refs.get(ref)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._refs[ref]
+        return True
+
+    def invalidate(self, category: str, target_id: int, content: Optional[str] = None) -> int:
+        return self.invalidate_many([(category, target_id, content)])
+
+    def invalidate_many(self, items: Iterable[Tuple[str, int, Optional[str]]]) -> int:
+        """
+        색인/삭제된 (category, target_id, content) 목록에 영향받는 캐시 항목만 제거.
+        content 가 있으면 검색어가 본문에 들어 있는 항목(새로 키워드 일치하게 된 검색)도 제거
+        """
+        items = list(items)
+        if not items:
+            return 0
+        with self._lock:
+            self._generation += 1
+            doomed: Set[CacheKey] = set()
+            contents = []
+            for category, target_id, content in items:
+                doomed.update(self._refs.get((category, target_id), ()))
+                if content:
+                    contents.append(normalize_query(content).lower())
+            if contents:
+                # 키워드 검색(ILIKE)은 대소문자를 구분하지 않으므로 비교도 소문자로
+                for key in self._store:
+                    if any(key[0].lower() in text for text in contents):
+                        doomed.add(key)
+
+            removed = sum(1 for key in doomed if self._remove(key))
+            RESULT_CACHE_ENTRIES.set(len(self._store))
+        if removed:
+            RESULT_CACHE_INVALIDATIONS.inc(removed)
+            logger.debug(f"검색 응답 캐시 무효화: {removed}건")
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"enabled": self.enabled, "entries": len(self._store), "refs": len(self._refs),
+                    "max_entries": self.max_entries, "ttl": self.ttl}
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._store.clear()
+            self._refs.clear()
+            RESULT_CACHE_ENTRIES.set(0)
+
+
+search_result_cache = SearchResultCache()
@@ -0,0 +1,151 @@
+# fastapi_app/search_queries.py
+"""
+/search 랭킹 쿼리와 결과 그룹화 (동기 /search 와 비동기 /search/async 공용)
+
+쿼리는 psycopg2 의 이름 있는 파라미터(%(name)s)로 작성하고,
+asyncpg 에서는 to_asyncpg() 로 $1, $2 ... 위치 파라미터로 바꿔 씁니다.
+"""
+import re
+from typing import Dict, List, Tuple
+
+# - places, shortforms, local_columns 테이블 실시간 조회 포함
+# - ILIKE 는 pg_trgm GIN 인덱스(keyword_index.py), NOT EXISTS 는 idx_target_category 로 처리
+RANKING_SQL = """
+WITH ai_nearest AS (
+    -- [1-a] 벡터 유사도 상위 후보 (ORDER BY ... LIMIT 형태여야 ANN 인덱스 사용)
+    SELECT target_id, category, content,
+           (embedding <=> %(vector)s::vector) as distance
+    FROM search_vectors
+    ORDER BY embedding <=> %(vector)s::vector
+    LIMIT %(candidates)s
+),
+ai_results AS (
+    -- [1] 검색 엔진 인덱스 테이블 조회 (유사도 후보 + 키워드 일치 행)
+    SELECT target_id, category, content, distance,
+           CASE WHEN content ILIKE %(pattern)s THEN 0 ELSE 1 END as match_priority
+    FROM ai_nearest
+    UNION
+    SELECT target_id, category, content,
+           (embedding <=> %(vector)s::vector) as distance,
+           0 as match_priority
+    FROM search_vectors
+    WHERE content ILIKE %(pattern)s
+),
+direct_places_results AS (
+    -- [2] 장소 테이블 실시간 조회
+    SELECT id as target_id, 'place' as category, name || ' ' || address as content,
+           0.45 as distance,
+           0 as match_priority
+    FROM places
+    WHERE (name ILIKE %(pattern)s OR address ILIKE %(pattern)s)
+    AND NOT EXISTS (
+        SELECT 1 FROM search_vectors sv
+        WHERE sv.target_id = places.id AND sv.category = 'place'
+    )
+),
+direct_shorts_results AS (
+    -- [3] 숏츠 테이블 실시간 조회
+    SELECT id as target_id, 'shortform' as category, title || ' ' || COALESCE(content, '') as content,
+           0.45 as distance,
+           0 as match_priority
+    FROM shortforms
+    WHERE (title ILIKE %(pattern)s OR content ILIKE %(pattern)s)
+    AND NOT EXISTS (
+        SELECT 1 FROM search_vectors sv
+        WHERE sv.target_id = shortforms.id AND sv.category = 'shortform'
+    )
+),
+direct_columns_results AS (
+    -- [4] 칼럼 테이블 실시간 조회
+    SELECT id as target_id, 'localcolumn' as category, title || ' ' || SUBSTRING(content, 1, 300) as content,
+           0.45 as distance,
+           0 as match_priority
+    FROM local_columns
+    WHERE (title ILIKE %(pattern)s OR content ILIKE %(pattern)s)
+    AND NOT EXISTS (
+        SELECT 1 FROM search_vectors sv
+        WHERE sv.target_id = local_columns.id AND sv.category = 'localcolumn'
+    )
+),
+combined AS (
+    SELECT * FROM ai_results
+    UNION ALL
+    SELECT * FROM direct_places_results
+    UNION ALL
+    SELECT * FROM direct_shorts_results
+    UNION ALL
+    SELECT * FROM direct_columns_results
+),
+ranked AS (
+    SELECT *,
+           ROW_NUMBER() OVER(
+               PARTITION BY category
+               ORDER BY match_priority ASC, distance ASC
+           ) as group_rank
+    FROM combined
+    WHERE distance < 0.5 OR match_priority = 0
+)
+SELECT target_id, category, content, distance, match_priority
+FROM ranked
+WHERE group_rank <= 15
+ORDER BY match_priority ASC, distance ASC;
+"""
+
+# search_vectors.category -> 응답 그룹 키 (없는 카테고리는 others)
+CATEGORY_GROUPS = {
+    "place": "places",
+    "review": "reviews",
+    "plan": "plans",
+    "shortform": "shorts",
+    "localcolumn": "columns",
+}
+
+# 번역 대상: (그룹 키, translation_entries.entity_type, 번역할 필드)
+TRANSLATION_GROUPS = [
+    ("places", "place", ["name", "address"]),
+    ("shorts", "shortform", ["title", "content"]),
+    ("plans", "travel_plan", ["title", "description"]),
+    ("reviews", "place_review", ["content"]),
+]
+
+_NAMED_PARAM = re.compile(r"%\((\w+)\)s")
+
+
+def ranking_params(query_vector, text_pattern: str, candidates: int) -> Dict:
+    return {"vector": query_vector, "pattern": text_pattern, "candidates": candidates}
+
+
+def to_asyncpg(sql: str, params: Dict) -> Tuple[str, List]:
+    """%(name)s 쿼리 -> ($n 쿼리, 인자 목록). 같은 이름은 같은 $n 을 재사용"""
+    order: List[str] = []
+
+    def replace(match):
+        name = match.group(1)
+        if name not in order:
+            order.append(name)
+        return f"${order.index(name) + 1}"
+
+    return _NAMED_PARAM.sub(replace, sql), [params[name] for name in order]
+
+
+def group_ranked_rows(rows) -> Dict[str, List[dict]]:
+    """랭킹 결과 행 -> {"places": [...], "reviews": [...], ...}"""
+    grouped_results = {
+        "places": [],
+        "reviews": [],
+        "plans": [],
+        "shorts": [],
+        "columns": [],
+        "others": []
+    }
+
+    for r in rows:
+        item = {
+            "id": r[0],
+            "content": r[2],
+            "distance": float(r[3]),
+            "is_keyword_match": True if r[4] == 0 else False
+        }
+        grouped_results[CATEGORY_GROUPS.get(r[1], "others")].append(item)
+
+    return grouped_results
@@ -0,0 +1,314 @@
+# fastapi_app/search_translation.py
+"""
+검색 결과 번역 처리 (translation_entries 캐시 + FastAPI 번역 서버)
+
+동기(/search, psycopg2)와 비동기(/search/async, asyncpg + httpx) 경로가
+같은 단계 함수(_collect_pending, _apply_cache_rows, _group_misses, _build_cache_rows)를 공유합니다.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from psycopg2.extras import execute_values
+
+from database import pooled_connection
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# 번역 관련 설정
+# ---------------------------------------------------------
+FASTAPI_TRANSLATE_URL = os.getenv("FASTAPI_TRANSLATE_URL", "http://fastapi-ai-translation:8003/api/ai/translate")
+FASTAPI_TRANSLATE_BATCH_URL = os.getenv("FASTAPI_TRANSLATE_BATCH_URL", f"{FASTAPI_TRANSLATE_URL}/batch")
+AI_SERVICE_API_KEY = os.getenv("AI_SERVICE_API_KEY", "secure-api-key-1234")
+TRANSLATE_BATCH_CHUNK = int(os.getenv("TRANSLATE_BATCH_CHUNK", "64"))  # 배치 번역 1회당 최대 문장 수
+
+# (entity_type, entity_id, field) -> (item, source_lang, original_text)
+Pending = Dict[Tuple[str, int, str], Tuple[dict, str, str]]
+
+
+def parse_cached_translation(cached_text: str) -> str:
+    """캐시된 번역 데이터 파싱 (JSON 형식인 경우 실제 텍스트 추출)"""
+    if not cached_text:
+        return cached_text
+
+    # JSON 형식인지 확인
+    if cached_text.strip().startswith('{'):
+        try:
+            data = json.loads(cached_text)
+            # { "translations": ["..."] } 형식
+            if "translations" in data and isinstance(data["translations"], list):
+                return data["translations"][0] if data["translations"] else cached_text
+            # { "translated_text": "..." } 형식
+            if "translated_text" in data:
+                return data["translated_text"]
+        except (json.JSONDecodeError, IndexError, KeyError):
+            pass
+
+    return cached_text
+
+
+def _parse_batch_response(data: dict, texts: List[str]) -> Optional[List[str]]:
+    translations = data.get("translations")
+    if not isinstance(translations, list) or len(translations) != len(texts):
+        logger.error(f"Translation batch API returned {len(translations or [])} items for {len(texts)} texts")
+        return None
+    return [parse_cached_translation(t) if t else "" for t in translations]
+
+
+def call_translate_batch_api(texts: List[str], source_lang: str, target_lang: str, timeout: int = 60) -> Optional[List[str]]:
+    """FastAPI 번역 서버 배치 호출 (/translate/batch). 실패하면 None"""
+    if not texts:
+        return []
+
+    payload = {
+        "texts": texts,
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+    }
+
+    try:
+        headers = {"x-ai-api-key": AI_SERVICE_API_KEY}
+        resp = requests.post(FASTAPI_TRANSLATE_BATCH_URL, json=payload, headers=headers, timeout=(3, timeout))
+        resp.raise_for_status()
+        return _parse_batch_response(resp.json(), texts)
+    except Exception as e:
+        logger.error(f"Translation batch API error: {e}")
+        return None
+
+
+async def call_translate_batch_api_async(http_client, texts: List[str], source_lang: str, target_lang: str) -> Optional[List[str]]:
+    """call_translate_batch_api 의 httpx.AsyncClient 버전. 실패하면 None"""
+    if not texts:
+        return []
+
+    payload = {
+        "texts": texts,
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+    }
+
+    try:
+        headers = {"x-ai-api-key": AI_SERVICE_API_KEY}
+        resp = await http_client.post(FASTAPI_TRANSLATE_BATCH_URL, json=payload, headers=headers)
+        resp.raise_for_status()
+        return _parse_batch_response(resp.json(), texts)
+    except Exception as e:
+        logger.error(f"Translation batch API error: {e}")
+        return None
+
+
+# ---------------------------------------------------------
+# 단계 함수 (동기/비동기 공용)
+# ---------------------------------------------------------
+def _collect_pending(groups: List[tuple], target_lang: str) -> Pending:
+    """번역이 필요 없는 필드는 바로 채우고, 나머지를 (entity_type, entity_id, field) 키로 모음"""
+    pending: Pending = {}
+    for items, entity_type, fields in groups:
+        for item in items or []:
+            entity_id = item.get("id")
+            if not entity_id:
+                continue
+
+            # 원본 언어 추정 (기본값: 한국어)
+            source_lang = item.get("source_lang", "kor_Hang")
+
+            for field in fields:
+                original_text = item.get(field, "")
+                # 원본 언어와 타겟 언어가 같거나 빈 값이면 번역 불필요
+                if source_lang == target_lang:
+                    item[f"{field}_translated"] = original_text or ""
+                elif not original_text:
+                    item[f"{field}_translated"] = ""
+                else:
+                    pending[(entity_type, entity_id, field)] = (item, source_lang, original_text)
+    return pending
+
+
+def _apply_cache_rows(pending: Pending, cache_rows) -> None:
+    """캐시 Hit 을 아이템에 반영하고 pending 에서 제거"""
+    for entity_type, entity_id, field, translated_text in cache_rows:
+        entry = pending.pop((entity_type, entity_id, field), None)
+        if entry:
+            # 캐시 Hit - JSON 형식인 경우 파싱
+            entry[0][f"{field}_translated"] = parse_cached_translation(translated_text)
+
+
+def _group_misses(pending: Pending) -> List[Tuple[str, List[str]]]:
+    """캐시 Miss 를 원본 언어별로 묶고 같은 문장은 한 번만, 배치 크기로 나눔"""
+    by_source: Dict[str, List[str]] = {}
+    for item, source_lang, original_text in pending.values():
+        texts = by_source.setdefault(source_lang, [])
+        if original_text not in texts:
+            texts.append(original_text)
+
+    chunks = []
+    for source_lang, texts in by_source.items():
+        for start in range(0, len(texts), TRANSLATE_BATCH_CHUNK):
+            chunks.append((source_lang, texts[start:start + TRANSLATE_BATCH_CHUNK]))
+    return chunks
+
+
+def _build_cache_rows(pending: Pending, translated_map: Dict[Tuple[str, str], str], target_lang: str) -> List[tuple]:
+    """번역 결과를 아이템에 반영하고 저장할 캐시 행 목록 반환 (실패/동일 결과는 저장 안 함)"""
+    rows = []
+    for (entity_type, entity_id, field), (item, source_lang, original_text) in pending.items():
+        translated = translated_map.get((source_lang, original_text)) or original_text
+        item[f"{field}_translated"] = translated
+
+        if translated != original_text:
+            text_hash = hashlib.sha256(original_text.encode("utf-8")).hexdigest()
+            rows.append((entity_type, entity_id, field, source_lang, target_lang, text_hash, translated, "fastapi", "nllb"))
+    return rows
+
+
+# ---------------------------------------------------------
+# 동기 경로 (psycopg2 풀 + requests)
+# ---------------------------------------------------------
+PROBE_SQL = """
+    SELECT entity_type, entity_id, field, translated_text FROM translation_entries
+    WHERE (entity_type, entity_id, field, target_lang) IN %s
+"""
+
+UPSERT_SQL = """
+    INSERT INTO translation_entries
+    (entity_type, entity_id, field, source_lang, target_lang, source_hash, translated_text, provider, model, created_at, updated_at, last_used_at)
+    VALUES %s
+    ON CONFLICT (entity_type, entity_id, field, target_lang) DO UPDATE
+    SET translated_text = EXCLUDED.translated_text, source_hash = EXCLUDED.source_hash, updated_at = NOW(), last_used_at = NOW()
+"""
+UPSERT_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW(), NOW())"
+
+
+def translate_item_groups(groups: List[tuple], target_lang: str, conn=None):
+    """
+    여러 카테고리의 검색 결과를 한 번에 번역 처리
+    groups: [(items, entity_type, fields), ...]
+
+    1. translation_entries 캐시를 (entity_type, entity_id, field, target_lang) IN (...) 쿼리 1회로 조회
+    2. 캐시 miss 는 원본 언어별로 모아 /translate/batch 호출 (같은 문장은 한 번만)
+    3. 새 번역은 multi-row upsert 1회 + commit 1회로 저장
+    반환값: 번역 서버 호출이 모두 성공했으면 True (실패한 필드는 원문 유지)
+    conn 을 주지 않으면 조회/저장 때만 풀에서 빌려 씀 (번역 API 대기 중에는 커넥션을 잡지 않음)
+    """
+    if not target_lang:
+        return True
+
+    pending = _collect_pending(groups, target_lang)
+    if not pending:
+        return True
+
+    # 1. 캐시 일괄 조회
+    keys = tuple((entity_type, entity_id, field, target_lang) for entity_type, entity_id, field in pending)
+    if conn is None:
+        with pooled_connection() as pooled:
+            cur = pooled.cursor()
+            cur.execute(PROBE_SQL, (keys,))
+            cache_rows = cur.fetchall()
+            cur.close()
+    else:
+        cur = conn.cursor()
+        cur.execute(PROBE_SQL, (keys,))
+        cache_rows = cur.fetchall()
+        cur.close()
+
+    _apply_cache_rows(pending, cache_rows)
+    if not pending:
+        return True
+
+    # 2. 캐시 Miss -> 원본 언어별 배치 번역
+    translated_map = {}  # (source_lang, 원문) -> 번역문
+    complete = True
+    for source_lang, chunk in _group_misses(pending):
+        results = call_translate_batch_api(chunk, source_lang, target_lang)
+        if results is None:
+            complete = False
+            continue  # 실패 시 원문 유지
+        for original_text, translated in zip(chunk, results):
+            translated_map[(source_lang, original_text)] = translated
+
+    rows = _build_cache_rows(pending, translated_map, target_lang)
+    if not rows:
+        return complete
+
+    # 3. 캐시 일괄 저장
+    try:
+        if conn is None:
+            with pooled_connection() as pooled:
+                cur = pooled.cursor()
+                execute_values(cur, UPSERT_SQL, rows, template=UPSERT_TEMPLATE, page_size=len(rows))
+                pooled.commit()
+                cur.close()
+        else:
+            cur = conn.cursor()
+            execute_values(cur, UPSERT_SQL, rows, template=UPSERT_TEMPLATE, page_size=len(rows))
+            conn.commit()
+            cur.close()
+    except Exception as e:
+        logger.error(f"Cache save error: {e}")
+        if conn is not None:
+            conn.rollback()
+    return complete
+
+
+# ---------------------------------------------------------
+# 비동기 경로 (asyncpg 풀 + httpx)
+# ---------------------------------------------------------
+ASYNC_PROBE_SQL = """
+    SELECT entity_type, entity_id, field, translated_text FROM translation_entries
+    WHERE (entity_type, entity_id, field, target_lang) IN (
+        SELECT * FROM unnest($1::text[], $2::bigint[], $3::text[], $4::text[])
+    )
+"""
+
+ASYNC_UPSERT_SQL = """
+    INSERT INTO translation_entries
+    (entity_type, entity_id, field, source_lang, target_lang, source_hash, translated_text, provider, model, created_at, updated_at, last_used_at)
+    SELECT t.*, NOW(), NOW(), NOW()
+    FROM unnest($1::text[], $2::bigint[], $3::text[], $4::text[], $5::text[], $6::text[], $7::text[], $8::text[], $9::text[]) AS t
+    ON CONFLICT (entity_type, entity_id, field, target_lang) DO UPDATE
+    SET translated_text = EXCLUDED.translated_text, source_hash = EXCLUDED.source_hash, updated_at = NOW(), last_used_at = NOW()
+"""
+
+
+async def translate_item_groups_async(groups: List[tuple], target_lang: str, apool, http_client):
+    """translate_item_groups 의 비동기 버전 (조회 1회 + 원본 언어별 배치 번역 + 저장 1회)"""
+    if not target_lang:
+        return True
+
+    pending = _collect_pending(groups, target_lang)
+    if not pending:
+        return True
+
+    keys = list(pending.keys())
+    cache_rows = await apool.fetch(
+        ASYNC_PROBE_SQL,
+        [k[0] for k in keys], [k[1] for k in keys], [k[2] for k in keys], [target_lang] * len(keys),
+    )
+    _apply_cache_rows(pending, [tuple(r) for r in cache_rows])
+    if not pending:
+        return True
+
+    translated_map = {}
+    complete = True
+    for source_lang, chunk in _group_misses(pending):
+        results = await call_translate_batch_api_async(http_client, chunk, source_lang, target_lang)
+        if results is None:
+            complete = False
+            continue
+        for original_text, translated in zip(chunk, results):
+            translated_map[(source_lang, original_text)] = translated
+
+    rows = _build_cache_rows(pending, translated_map, target_lang)
+    if not rows:
+        return complete
+
+    try:
+        columns = list(zip(*rows))
+        await apool.execute(ASYNC_UPSERT_SQL, *[list(col) for col in columns])
+    except Exception as e:
+        logger.error(f"Cache save error: {e}")
+    return complete
@@ -0,0 +1,69 @@
+"""
+임베딩 백엔드 정확도 테스트
+
+int8 / ONNX 백엔드가 fp32 torch 와 같은 임베딩 공간인지 확인합니다.
+(VERIFY_SENTENCES 의 fp32 대비 최소 코사인 유사도 >= EMBEDDING_COSINE_TOLERANCE)
+모델을 내려받을 수 없거나 (오프라인) 백엔드 의존성(optimum[onnxruntime] 등)이 없으면 skip 합니다.
+
+실행 방법 (fastapi_app 폴더에서):
+    pytest test_embedding_backend.py
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Ensure we can import from the app directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import embedding_backend as eb
+
+
+@pytest.fixture(scope="module")
+def reference_model():
+    pytest.importorskip("sentence_transformers")
+    try:
+        return eb.load_backend("torch")
+    except OSError as e:
+        pytest.skip(f"임베딩 모델을 내려받을 수 없음: {e}")
+
+
+@pytest.mark.parametrize("backend", ["torch-int8", "onnx", "onnx-int8"])
+def test_backend_matches_fp32(backend, reference_model, tmp_path, monkeypatch):
+    # onnx-int8 export 결과는 테스트 임시 폴더에 저장
+    monkeypatch.setattr(eb, "EMBEDDING_ONNX_DIR", str(tmp_path / "embedding-onnx"))
+    try:
+        model = eb.load_backend(backend)
+    except ImportError as e:
+        pytest.skip(f"'{backend}' 백엔드 의존성 없음: {e}")
+
+    ok, min_sim, mean_sim = eb.verify_against_reference(model, reference_model)
+    assert ok, (f"'{backend}' fp32 대비 코사인 유사도 min={min_sim:.4f} (mean={mean_sim:.4f}) "
+                f"< {eb.EMBEDDING_COSINE_TOLERANCE}")
+
+
+class _FakeModel:
+    """문장마다 고정된 벡터를 돌려주는 모델 (noise 만큼 방향을 틀어 정확도 저하를 흉내)"""
+
+    def __init__(self, noise: float = 0.0):
+        self.noise = noise
+
+    def encode(self, sentences, **kwargs):
+        rows = []
+        for sentence in sentences:
+            rng = np.random.default_rng(abs(hash(sentence)) % (2 ** 32))
+            vector = rng.normal(size=16)
+            rows.append(vector + self.noise * rng.normal(size=16))
+        return np.array(rows, dtype=np.float32)
+
+
+@pytest.mark.parametrize("noise, expected_backend", [(0.0, "torch-int8"), (1.0, "torch")])
+def test_load_embedding_model_falls_back_below_tolerance(noise, expected_backend, monkeypatch):
+    """허용 오차 미달이면 fp32 torch 로 되돌림 (모델 다운로드 없이 선택 로직만 확인)"""
+    monkeypatch.setattr(eb, "EMBEDDING_VERIFY", True)
+    monkeypatch.setattr(eb, "_load_torch", lambda model_name, device=None: _FakeModel())
+    monkeypatch.setitem(eb._LOADERS, "torch-int8", lambda model_name: _FakeModel(noise))
+
+    model, backend = eb.load_embedding_model("torch-int8")
+    assert backend == expected_backend
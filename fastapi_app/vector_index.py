@@ -0,0 +1,294 @@
+# fastapi_app/vector_index.py
+"""
+search_vectors.embedding ANN 인덱스 관리
+
+- 행 수가 VECTOR_INDEX_MIN_ROWS 를 넘으면 HNSW(기본) 또는 ivfflat 인덱스를 생성
+- ivfflat 은 코퍼스가 커져 적정 lists 값이 2배 이상 벌어지면 새 인덱스로 교체(rebuild)
+- 빌드는 CREATE INDEX CONCURRENTLY 로 별도 커넥션에서 수행 (검색/등록을 막지 않음)
+- 요청 단위로 hnsw.ef_search / ivfflat.probes 를 SET LOCAL 로 조정 (정확도 ↔ 속도)
+"""
+import logging
+import math
+import os
+import re
+import threading
+import time
+from typing import List, Optional
+
+from database import get_db_connection, pooled_connection
+
+logger = logging.getLogger(__name__)
+
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "hnsw").lower()              # hnsw | ivfflat
+VECTOR_INDEX_MIN_ROWS = int(os.getenv("VECTOR_INDEX_MIN_ROWS", "1000"))          # 이 행 수부터 인덱스 생성
+VECTOR_INDEX_CHECK_INTERVAL = int(os.getenv("VECTOR_INDEX_CHECK_INTERVAL", "300"))  # 상태 점검 주기(초)
+VECTOR_INDEX_BUILD_MEM = os.getenv("VECTOR_INDEX_BUILD_MEM", "256MB")            # 빌드용 maintenance_work_mem
+HNSW_M = int(os.getenv("VECTOR_HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "64"))
+
+# 검색 시 ANN 으로 가져올 후보 수 / 기본 정확도 설정
+VECTOR_SEARCH_CANDIDATES = int(os.getenv("VECTOR_SEARCH_CANDIDATES", "100"))
+# HNSW 는 ef_search 개수까지만 결과를 돌려주므로 후보 수보다 작으면 안 됨
+DEFAULT_EF_SEARCH = int(os.getenv("VECTOR_EF_SEARCH", str(VECTOR_SEARCH_CANDIDATES)))
+DEFAULT_PROBES = int(os.getenv("VECTOR_IVF_PROBES", "0"))  # 0이면 sqrt(lists) 사용
+
+INDEX_NAME = "idx_search_vectors_embedding"
+REBUILD_INDEX_NAME = f"{INDEX_NAME}_new"
+
+_LISTS_RE = re.compile(r"lists\s*=\s*'?(\d+)")
+_METHOD_RE = re.compile(r"USING (\w+)")
+
+
+def ideal_lists(rows: int) -> int:
+    """pgvector 권장값: 100만 행까지 rows/1000, 그 이상은 sqrt(rows)"""
+    if rows <= 1_000_000:
+        return max(rows // 1000, 1)
+    return int(math.sqrt(rows))
+
+
+class VectorIndexManager:
+    """search_vectors 임베딩 인덱스의 생성/교체/상태 조회를 담당"""
+
+    def __init__(self, index_type: str = VECTOR_INDEX_TYPE, min_rows: int = VECTOR_INDEX_MIN_ROWS,
+                 check_interval: int = VECTOR_INDEX_CHECK_INTERVAL):
+        if index_type not in ("hnsw", "ivfflat"):
+            logger.warning(f"알 수 없는 VECTOR_INDEX_TYPE={index_type}, hnsw 로 대체합니다.")
+            index_type = "hnsw"
+        self.index_type = index_type
+        self.min_rows = min_rows
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()       # 동시에 두 번 빌드하지 않도록
+        self._stop = threading.Event()
+        self._thread = None
+        self.state = {
+            "status": "unknown",   # unknown | none | building | ready | failed
+            "index_type": None,
+            "lists": None,
+            "rows": None,
+            "rows_at_build": None,
+            "built_at": None,
+            "build_seconds": None,
+            "last_check": None,
+            "last_error": None,
+        }
+
+    # ---------------------------------------------------------
+    # 백그라운드 점검 루프
+    # ---------------------------------------------------------
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vector-index-manager", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"❌ 벡터 인덱스 점검 실패: {e}")
+            self._stop.wait(self.check_interval)
+
+    # ---------------------------------------------------------
+    # 상태 조회
+    # ---------------------------------------------------------
+    def _count_rows(self, cur) -> int:
+        """reltuples 추정치 사용 (ANALYZE 전이면 count(*)로 대체)"""
+        cur.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = 'search_vectors'::regclass")
+        row = cur.fetchone()
+        if row and row[0] and row[0] > 0:
+            return int(row[0])
+        cur.execute("SELECT count(*) FROM search_vectors")
+        return int(cur.fetchone()[0])
+
+    def _existing_indexes(self, cur) -> dict:
+        """관리 대상 인덱스 -> (정의, 유효 여부)"""
+        cur.execute("""
+            SELECT c.relname, pg_get_indexdef(i.indexrelid), i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = 'search_vectors'::regclass AND c.relname IN (%s, %s)
+        """, (INDEX_NAME, REBUILD_INDEX_NAME))
+        return {name: (indexdef, valid) for name, indexdef, valid in cur.fetchall()}
+
+    def _parse_indexdef(self, indexdef: str):
+        method = _METHOD_RE.search(indexdef)
+        lists = _LISTS_RE.search(indexdef)
+        return (method.group(1) if method else None), (int(lists.group(1)) if lists else None)
+
+    def refresh(self) -> dict:
+        """DB 카탈로그에서 현재 인덱스 상태를 다시 읽어 state 에 반영"""
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            rows = self._count_rows(cur)
+            indexes = self._existing_indexes(cur)
+            cur.close()
+
+        self.state["rows"] = rows
+        self.state["last_check"] = time.time()
+        current = indexes.get(INDEX_NAME)
+        if self.state["status"] != "building":
+            if current and current[1]:
+                method, lists = self._parse_indexdef(current[0])
+                self.state.update(status="ready", index_type=method, lists=lists)
+            elif self.state["status"] != "failed":
+                self.state.update(status="none", index_type=None, lists=None)
+        return indexes
+
+    def progress(self) -> Optional[dict]:
+        """빌드 중이면 pg_stat_progress_create_index 진행률 반환"""
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total
+                FROM pg_stat_progress_create_index
+                WHERE relid = 'search_vectors'::regclass
+            """)
+            row = cur.fetchone()
+            cur.close()
+        if not row:
+            return None
+        phase, blocks_done, blocks_total, tuples_done, tuples_total = row
+        percent = None
+        if tuples_total:
+            percent = round(tuples_done * 100.0 / tuples_total, 1)
+        elif blocks_total:
+            percent = round(blocks_done * 100.0 / blocks_total, 1)
+        return {
+            "phase": phase,
+            "blocks_done": blocks_done,
+            "blocks_total": blocks_total,
+            "tuples_done": tuples_done,
+            "tuples_total": tuples_total,
+            "percent": percent,
+        }
+
+    def status(self) -> dict:
+        """관리자 엔드포인트용 상태 요약"""
+        self.refresh()
+        info = dict(self.state)
+        info["configured_type"] = self.index_type
+        info["min_rows"] = self.min_rows
+        info["progress"] = self.progress() if info["status"] == "building" else None
+        return info
+
+    # ---------------------------------------------------------
+    # 생성 / 교체
+    # ---------------------------------------------------------
+    def _needs_build(self, rows: int, indexes: dict) -> Optional[int]:
+        """빌드가 필요하면 사용할 lists 값(hnsw 는 0), 아니면 None"""
+        if rows < self.min_rows:
+            return None
+        target_lists = ideal_lists(rows) if self.index_type == "ivfflat" else 0
+
+        current = indexes.get(INDEX_NAME)
+        if not current or not current[1]:
+            return target_lists
+
+        method, lists = self._parse_indexdef(current[0])
+        if method != self.index_type:
+            return target_lists
+        # ivfflat 은 코퍼스 증가로 적정 lists 가 2배 이상 벌어지면 다시 빌드
+        if self.index_type == "ivfflat" and lists and target_lists >= lists * 2:
+            return target_lists
+        return None
+
+    def check(self, force: bool = False) -> bool:
+        """필요하면 인덱스를 (재)생성. 빌드를 수행했으면 True"""
+        indexes = self.refresh()
+        rows = self.state["rows"]
+        lists = self._needs_build(rows, indexes)
+        if lists is None and not (force and rows >= 1):
+            return False
+        if lists is None:
+            lists = ideal_lists(rows) if self.index_type == "ivfflat" else 0
+        return self.build(lists, rows)
+
+    def _index_sql(self, name: str, lists: int) -> str:
+        if self.index_type == "ivfflat":
+            return (f"CREATE INDEX CONCURRENTLY {name} ON search_vectors "
+                    f"USING ivfflat (embedding vector_cosine_ops) WITH (lists = {int(lists)})")
+        return (f"CREATE INDEX CONCURRENTLY {name} ON search_vectors "
+                f"USING hnsw (embedding vector_cosine_ops) "
+                f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})")
+
+    def build(self, lists: int, rows: int) -> bool:
+        """새 이름으로 빌드한 뒤 기존 인덱스와 교체 (검색은 계속 기존 인덱스 사용)"""
+        if not self._lock.acquire(blocking=False):
+            logger.info("벡터 인덱스 빌드가 이미 진행 중입니다.")
+            return False
+
+        previous_status = self.state["status"]
+        self.state.update(status="building", last_error=None)
+        started = time.time()
+        conn = None
+        try:
+            # CONCURRENTLY 는 트랜잭션 밖에서만 가능하므로 풀과 별도의 autocommit 커넥션 사용
+            conn = get_db_connection()
+            conn.autocommit = True
+            cur = conn.cursor()
+            cur.execute("SET maintenance_work_mem = %s", (VECTOR_INDEX_BUILD_MEM,))
+
+            # 이전 빌드가 실패하면 INVALID 인덱스가 남으므로 먼저 정리
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {REBUILD_INDEX_NAME}")
+
+            logger.info(f"🔧 벡터 인덱스 빌드 시작 (type={self.index_type}, lists={lists}, rows={rows})")
+            cur.execute(self._index_sql(REBUILD_INDEX_NAME, lists))
+
+            cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+            cur.execute(f"ALTER INDEX {REBUILD_INDEX_NAME} RENAME TO {INDEX_NAME}")
+            cur.execute("ANALYZE search_vectors")
+            cur.close()
+
+            elapsed = time.time() - started
+            self.state.update(
+                status="ready",
+                index_type=self.index_type,
+                lists=lists or None,
+                rows_at_build=rows,
+                built_at=time.time(),
+                build_seconds=round(elapsed, 2),
+            )
+            logger.info(f"✅ 벡터 인덱스 빌드 완료 ({elapsed:.1f}s)")
+            return True
+        except Exception as e:
+            logger.error(f"❌ 벡터 인덱스 빌드 실패: {e}")
+            self.state.update(status="failed" if previous_status != "ready" else "ready", last_error=str(e))
+            return False
+        finally:
+            if conn:
+                conn.close()
+            self._lock.release()
+
+    # ---------------------------------------------------------
+    # 요청 단위 검색 파라미터
+    # ---------------------------------------------------------
+    def search_param_statements(self, ef_search: Optional[int] = None, probes: Optional[int] = None) -> List[str]:
+        """
+        현재 트랜잭션에만 적용되는 ANN 검색 파라미터 설정문 (SET LOCAL).
+        SET 은 바인딩 파라미터를 받지 않으므로 정수로 범위를 잘라 문자열로 만듭니다. (asyncpg 경로와 공용)
+        """
+        index_type = self.state.get("index_type")
+        if index_type == "hnsw":
+            value = ef_search or DEFAULT_EF_SEARCH
+            return [f"SET LOCAL hnsw.ef_search = {max(1, min(int(value), 1000))}"]
+        if index_type == "ivfflat":
+            lists = self.state.get("lists") or 1
+            value = probes or DEFAULT_PROBES or int(math.sqrt(lists))
+            return [f"SET LOCAL ivfflat.probes = {max(1, min(int(value), lists))}"]
+        return []
+
+    def apply_search_params(self, cur, ef_search: Optional[int] = None, probes: Optional[int] = None):
+        """
+        현재 트랜잭션에만 적용되는 ANN 검색 파라미터 설정 (SET LOCAL).
+        값이 클수록 정확도(recall)는 오르고 지연은 늘어납니다.
+        """
+        for statement in self.search_param_statements(ef_search, probes):
+            cur.execute(statement)
+
+vector_index = VectorIndexManager()
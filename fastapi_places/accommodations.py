@@ -2,8 +2,8 @@
 ?? API ???
 ?? ?? ?? ?????
 """
-import httpx
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
 import asyncio
 import zlib
@@ -11,13 +11,54 @@ from translation_client import translate_batch_proxy
 
 from services.config import KAKAO_REST_API_KEY
 from services.external_places import search_google_places, search_kakao_places
-from services.places_search import remove_duplicate_places
+from services.http_clients import KAKAO, upstream_get
+from services.places_search import iter_ndjson, new_search_cursor, remove_duplicate_places, stream_place_search
+from services.search_cursor import search_cursor_store
 
 router = APIRouter(prefix="/accommodations", tags=["Accommodations"])
 
 
 # ==================== 숙소 전용 서비스 함수 ====================
 
+ACCOMMODATION_KEYWORDS = [
+    "호텔", "모텔", "펜션", "게스트하우스", "리조트", "민박", "숙박", "여관",
+    "hotel", "motel", "resort", "inn", "lodging", "hostel"
+]
+
+ACCOMMODATION_TYPE_KEYWORDS = {
+    "호텔": "호텔",
+    "모텔": "모텔",
+    "펜션": "펜션",
+    "게스트하우스": "게스트하우스",
+    "리조트": "리조트",
+    "민박": "민박",
+}
+
+
+def is_accommodation_place(result: dict) -> bool:
+    """이름/카테고리에 숙소 키워드가 있으면 True (category_main 을 "숙박"으로 설정)"""
+    name = result.get("name", "").lower()
+    category_str = " ".join(result.get("category_detail", [])).lower()
+    
+    is_accommodation = any(
+        kw.lower() in name or kw.lower() in category_str
+        for kw in ACCOMMODATION_KEYWORDS
+    )
+    if is_accommodation:
+        result["category_main"] = "숙박"
+    return is_accommodation
+
+
+def _in_city(result: dict, city: str) -> bool:
+    return city in result.get("address", "") or result.get("city") == city
+
+
+def build_accommodation_query(city: str, type: Optional[str] = None) -> str:
+    if type and type in ACCOMMODATION_TYPE_KEYWORDS:
+        return f"{city} {ACCOMMODATION_TYPE_KEYWORDS[type]}"
+    return f"{city} 숙박"
+
+
 async def search_accommodations_hybrid(query: str, city: str, limit: int = 30) -> List[dict]:
     """
     숙소 전용 검색 (카카오 + 구글)
@@ -31,32 +72,12 @@ async def search_accommodations_hybrid(query: str, city: str, limit: int = 30) -
     all_results = kakao_results + google_results
     
     # 숙소 키워드 필터링
-    accommodation_keywords = [
-        "호텔", "모텔", "펜션", "게스트하우스", "리조트", "민박", "숙박", "여관",
-        "hotel", "motel", "resort", "inn", "lodging", "hostel"
-    ]
-    
-    filtered_results = []
-    for result in all_results:
-        name = result.get("name", "").lower()
-        category_str = " ".join(result.get("category_detail", [])).lower()
-        
-        is_accommodation = any(
-            kw.lower() in name or kw.lower() in category_str
-            for kw in accommodation_keywords
-        )
-        
-        if is_accommodation:
-            result["category_main"] = "숙박"
-            filtered_results.append(result)
+    filtered_results = [r for r in all_results if is_accommodation_place(r)]
     
     unique_results = remove_duplicate_places(filtered_results)
     
     if city:
-        unique_results = [
-            r for r in unique_results
-            if city in r.get("address", "") or r.get("city") == city
-        ]
+        unique_results = [r for r in unique_results if _in_city(r, city)]
     
     return unique_results[:limit]
 
@@ -79,19 +100,7 @@ async def search_accommodations(
     - GET /api/v1/accommodations?city=부산&type=호텔
     - GET /api/v1/accommodations?city=제주&type=펜션&page=2
     """
-    type_keywords = {
-        "호텔": "호텔",
-        "모텔": "모텔",
-        "펜션": "펜션",
-        "게스트하우스": "게스트하우스",
-        "리조트": "리조트",
-        "민박": "민박",
-    }
-    
-    if type and type in type_keywords:
-        search_query = f"{city} {type_keywords[type]}"
-    else:
-        search_query = f"{city} 숙박"
+    search_query = build_accommodation_query(city, type)
     
     all_results = await search_accommodations_hybrid(search_query, city, limit=50)
     
@@ -145,6 +154,42 @@ async def search_accommodations(
     }
 
 
+@router.get("/stream")
+async def stream_accommodations(
+    city: Optional[str] = Query(None, min_length=1, description="도시명 (첫 페이지)"),
+    type: Optional[str] = Query(None, description="숙소 유형 (첫 페이지)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (다음 페이지)"),
+    lang: Optional[str] = Query(None, description="타겟 언어")
+):
+    """
+    커서 기반 숙소 검색 (NDJSON 스트리밍)
+    
+    page 방식(GET /api/v1/accommodations)은 매 페이지마다 전체 결과를 다시 만들어 자르지만,
+    여기서는 업스트림 페이지를 커서로 이어서 가져옵니다. 응답 형식은 /places/search/stream 과 같음.
+    
+    사용 예시:
+    - GET /api/v1/accommodations/stream?city=부산&type=호텔
+    - GET /api/v1/accommodations/stream?cursor=<next_cursor>
+    """
+    if cursor:
+        state = search_cursor_store.take(cursor)
+        if state is None:
+            raise HTTPException(status_code=410, detail="검색 커서가 만료되었습니다. 다시 검색해주세요.")
+    elif city:
+        state = new_search_cursor(
+            build_accommodation_query(city, type),
+            result_filter=lambda r: is_accommodation_place(r) and _in_city(r, city),
+        )
+    else:
+        raise HTTPException(status_code=400, detail="city 또는 cursor 가 필요합니다")
+    
+    return StreamingResponse(
+        iter_ndjson(stream_place_search(state, lang)),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/types")
 async def get_accommodation_types():
     """지원하는 숙소 유형 목록"""
@@ -199,7 +244,7 @@ async def search_nearby_accommodations(
     search_keyword = type_keywords.get(type, "숙박")
     
     # 카카오 API 좌표 기반 검색
-    url = "https://dapi.kakao.com/v2/local/search/keyword.json"
+    url = "/v2/local/search/keyword.json"
     headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
     params = {
         "query": search_keyword,
@@ -211,117 +256,115 @@ async def search_nearby_accommodations(
     }
     
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = await upstream_get(KAKAO, "keyword", url, headers=headers, params=params)
+        data = response.json()
+        
+        results = []
+        accommodation_keywords = [
+            "호텔", "모텔", "펜션", "게스트하우스", "리조트", "민박", "숙박", "여관",
+            "hotel", "motel", "resort", "inn", "lodging", "hostel"
+        ]
+        
+        for doc in data.get("documents", []):
+            name = doc.get("place_name", "").lower()
+            category_str = doc.get("category_name", "").lower()
             
-            results = []
-            accommodation_keywords = [
-                "호텔", "모텔", "펜션", "게스트하우스", "리조트", "민박", "숙박", "여관",
-                "hotel", "motel", "resort", "inn", "lodging", "hostel"
-            ]
+            # 숙소 필터링
+            is_accommodation = any(
+                kw.lower() in name or kw.lower() in category_str
+                for kw in accommodation_keywords
+            )
             
-            for doc in data.get("documents", []):
-                name = doc.get("place_name", "").lower()
-                category_str = doc.get("category_name", "").lower()
+            if is_accommodation:
+                results.append({
+                    "provider": "KAKAO",
+                    "place_api_id": doc.get("id"),
+                    "name": doc.get("place_name"),
+                    "address": doc.get("address_name") or doc.get("road_address_name", ""),
+                    "latitude": float(doc.get("y", 0)),
+                    "longitude": float(doc.get("x", 0)),
+                    "distance": int(doc.get("distance", 0)),
+                    "category_main": "숙박",
+                    "category_detail": doc.get("category_name", "").split(" > "),
+                    "thumbnail_url": None
+                })
+        
+        # [AI 번역 적용]
+        if lang:
+            try:
+                items_to_translate = []
+                # results 리스트 사용 (limit 적용 전 전체 결과 혹은 일부)
+                # 여기서는 results 전체를 대상으로 번역하지 않고 limit만큼 자른 후 번역하는 것이 효율적일 수 있으나
+                # 로직상 results 전체가 많지 않으므로(15개) 그냥 진행하거나 slicing 후 처리.
+                # 코드가 results[:limit]를 반환하므로, 슬라이싱된 리스트를 변수에 담고 번역.
                 
-                # 숙소 필터링
-                is_accommodation = any(
-                    kw.lower() in name or kw.lower() in category_str
-                    for kw in accommodation_keywords
-                )
+                final_results = results[:limit]
                 
-                if is_accommodation:
-                    results.append({
-                        "provider": "KAKAO",
-                        "place_api_id": doc.get("id"),
-                        "name": doc.get("place_name"),
-                        "address": doc.get("address_name") or doc.get("road_address_name", ""),
-                        "latitude": float(doc.get("y", 0)),
-                        "longitude": float(doc.get("x", 0)),
-                        "distance": int(doc.get("distance", 0)),
-                        "category_main": "숙박",
-                        "category_detail": doc.get("category_name", "").split(" > "),
-                        "thumbnail_url": None
-                    })
-            
-            # [AI 번역 적용]
-            if lang:
-                try:
-                    items_to_translate = []
-                    # results 리스트 사용 (limit 적용 전 전체 결과 혹은 일부)
-                    # 여기서는 results 전체를 대상으로 번역하지 않고 limit만큼 자른 후 번역하는 것이 효율적일 수 있으나
-                    # 로직상 results 전체가 많지 않으므로(15개) 그냥 진행하거나 slicing 후 처리.
-                    # 코드가 results[:limit]를 반환하므로, 슬라이싱된 리스트를 변수에 담고 번역.
+                for res in final_results:
+                    entity_id_name = res.get("place_api_id") or (zlib.adler32(res.get("name", "").encode('utf-8')) & 0xffffffff)
                     
-                    final_results = results[:limit]
+                    items_to_translate.append({
+                        "text": res.get("name", ""),
+                        "entity_type": "place_name",
+                        "entity_id": entity_id_name,
+                        "field": "name"
+                    })
+                    items_to_translate.append({
+                        "text": res.get("address", ""),
+                        "entity_type": "place_address",
+                        "entity_id": entity_id_name,
+                        "field": "address"
+                    })
+                    items_to_translate.append({
+                        "text": res.get("category_main", ""),
+                        "entity_type": "place_category",
+                        "entity_id": entity_id_name,
+                        "field": "category_main"
+                    })
+
+                if items_to_translate:
+                    translated_map = await translate_batch_proxy(items_to_translate, lang)
                     
+                    current_idx = 0
                     for res in final_results:
-                        entity_id_name = res.get("place_api_id") or (zlib.adler32(res.get("name", "").encode('utf-8')) & 0xffffffff)
-                        
-                        items_to_translate.append({
-                            "text": res.get("name", ""),
-                            "entity_type": "place_name",
-                            "entity_id": entity_id_name,
-                            "field": "name"
-                        })
-                        items_to_translate.append({
-                            "text": res.get("address", ""),
-                            "entity_type": "place_address",
-                            "entity_id": entity_id_name,
-                            "field": "address"
-                        })
-                        items_to_translate.append({
-                            "text": res.get("category_main", ""),
-                            "entity_type": "place_category",
-                            "entity_id": entity_id_name,
-                            "field": "category_main"
-                        })
-
-                    if items_to_translate:
-                        translated_map = await translate_batch_proxy(items_to_translate, lang)
+                        if current_idx in translated_map:
+                            res["name"] = translated_map[current_idx]
+                        current_idx += 1
+                        if current_idx in translated_map:
+                            res["address"] = translated_map[current_idx]
+                        current_idx += 1
+                        if current_idx in translated_map:
+                            res["category_main_translated"] = translated_map[current_idx]
+                        current_idx += 1
                         
-                        current_idx = 0
-                        for res in final_results:
-                            if current_idx in translated_map:
-                                res["name"] = translated_map[current_idx]
-                            current_idx += 1
-                            if current_idx in translated_map:
-                                res["address"] = translated_map[current_idx]
-                            current_idx += 1
-                            if current_idx in translated_map:
-                                res["category_main_translated"] = translated_map[current_idx]
-                            current_idx += 1
-                            
-                    return {
-                        "lat": lat,
-                        "lng": lng,
-                        "radius": radius,
-                        "type": type,
-                        "total": len(results),
-                        "results": final_results
-                    }
-                except Exception as e:
-                    print(f"Translation failed: {e}")
-                    # 실패 시 원본 반환
-                    return {
-                        "lat": lat,
-                        "lng": lng,
-                        "radius": radius,
-                        "type": type,
-                        "total": len(results),
-                        "results": results[:limit]
-                    }
+                return {
+                    "lat": lat,
+                    "lng": lng,
+                    "radius": radius,
+                    "type": type,
+                    "total": len(results),
+                    "results": final_results
+                }
+            except Exception as e:
+                print(f"Translation failed: {e}")
+                # 실패 시 원본 반환
+                return {
+                    "lat": lat,
+                    "lng": lng,
+                    "radius": radius,
+                    "type": type,
+                    "total": len(results),
+                    "results": results[:limit]
+                }
 
-            return {
-                "lat": lat,
-                "lng": lng,
-                "radius": radius,
-                "type": type,
-                "total": len(results),
-                "results": results[:limit]
-            }
+        return {
+            "lat": lat,
+            "lng": lng,
+            "radius": radius,
+            "type": type,
+            "total": len(results),
+            "results": results[:limit]
+        }
     
     except Exception as e:
         return {"error": f"검색 실패: {str(e)}"}
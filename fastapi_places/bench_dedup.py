@@ -0,0 +1,104 @@
+"""
+remove_duplicate_places 벤치마크: 기존 O(n²) 방식 vs 격자 버킷 방식 (DuplicatePlaceIndex)
+
+서울 범위에 합성 후보(카카오 + 일부는 같은 장소의 구글 결과, 이름 표기만 조금 다름)를 만들어
+처리 시간과 남은 장소 수를 비교하고, 두 방식이 같은 장소를 남기는지 확인합니다.
+
+사용 예 (fastapi_places 폴더에서):
+    python bench_dedup.py
+    python bench_dedup.py --sizes 1000 5000 10000 --legacy-max 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+# Ensure we can import from the app directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.places_search import normalize_name, remove_duplicate_places
+
+BASE_NAMES = ["성심당", "스타벅스", "이디야커피", "교촌치킨", "본죽", "김밥천국", "CU", "GS25", "올리브영", "다이소",
+              "파리바게뜨", "투썸플레이스", "맘스터치", "롯데리아", "해운대 돼지국밥", "명동 칼국수"]
+BRANCHES = ["강남점", "역삼점", "홍대점", "신촌점", "종로점", "명동점", "잠실점", "여의도점", "성수점", "이태원점"]
+
+
+def legacy_remove_duplicate_places(places):
+    """변경 전 구현 (비교용)"""
+    unique = []
+    for place in places:
+        name = normalize_name(place.get("name", ""))
+        lat = place.get("latitude", 0)
+        lng = place.get("longitude", 0)
+        is_duplicate = False
+        for existing in unique:
+            existing_name = normalize_name(existing.get("name", ""))
+            if name == existing_name:
+                if abs(lat - existing.get("latitude", 0)) < 0.001 and abs(lng - existing.get("longitude", 0)) < 0.001:
+                    is_duplicate = True
+                    break
+        if not is_duplicate:
+            unique.append(place)
+    return unique
+
+
+def build_candidates(n: int, duplicate_ratio: float, seed: int = 42):
+    rng = random.Random(seed)
+    kakao = []
+    google = []
+    while len(kakao) + len(google) < n:
+        name = f"{rng.choice(BASE_NAMES)} {rng.choice(BRANCHES)}"
+        lat = 37.45 + rng.random() * 0.2
+        lng = 126.85 + rng.random() * 0.3
+        kakao.append({
+            "provider": "KAKAO", "place_api_id": f"k{len(kakao)}", "name": name,
+            "address": "서울 어딘가", "latitude": Decimal(f"{lat:.7f}"), "longitude": Decimal(f"{lng:.7f}"),
+            "category_main": None, "thumbnail_url": None,
+        })
+        if rng.random() < duplicate_ratio and len(kakao) + len(google) < n:
+            # 같은 장소의 구글 결과: 좌표는 수십 m 차이, 이름은 공백/기호만 다름
+            google.append({
+                "provider": "GOOGLE", "place_api_id": f"g{len(google)}", "name": name.replace(" ", "") + "!",
+                "address": "대한민국 서울특별시", "latitude": Decimal(f"{lat + rng.uniform(-0.0004, 0.0004):.7f}"),
+                "longitude": Decimal(f"{lng + rng.uniform(-0.0004, 0.0004):.7f}"),
+                "category_main": "카페", "thumbnail_url": "https://example.com/thumb.jpg",
+            })
+    return kakao + google  # 카카오 결과가 먼저 (실제 검색과 같은 순서)
+
+
+def timed(fn, candidates, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(candidates)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장소 중복 제거 전/후 비교")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 1000, 2000, 5000, 10000])
+    parser.add_argument("--duplicate-ratio", type=float, default=0.4, help="카카오 결과 중 구글 중복이 있는 비율")
+    parser.add_argument("--legacy-max", type=int, default=5000, help="이보다 큰 크기에서는 기존 방식 생략 (너무 느림)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'candidates':>10} {'kept':>6} {'legacy ms':>10} {'grid ms':>9} {'speedup':>8} {'same':>5}")
+    for n in args.sizes:
+        candidates = build_candidates(n, args.duplicate_ratio)
+        grid_s, grid = timed(remove_duplicate_places, candidates, args.repeat)
+        if n <= args.legacy_max:
+            legacy_s, legacy = timed(legacy_remove_duplicate_places, candidates, 1 if n > 2000 else args.repeat)
+            same = [p["place_api_id"] for p in legacy] == [p["place_api_id"] for p in grid]
+            print(f"{n:>10} {len(grid):>6} {legacy_s * 1000:>10.1f} {grid_s * 1000:>9.1f} "
+                  f"{legacy_s / grid_s:>7.1f}x {str(same):>5}")
+        else:
+            print(f"{n:>10} {len(grid):>6} {'-':>10} {grid_s * 1000:>9.1f} {'-':>8} {'-':>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ FastAPI Places - Main Application
 장소 검색 및 현지인 추천 API 서버
 """
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -15,8 +16,22 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+from services.external_places import close_search_caches
+from services.http_clients import close_upstream_clients, open_upstream_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """카카오/구글 API 공유 HTTP 클라이언트를 앱 수명 동안 유지"""
+    open_upstream_clients()
+    yield
+    await close_upstream_clients()
+    await close_search_caches()
+
+
 # FastAPI 앱 생성
 app = FastAPI(
+    lifespan=lifespan,
     title="Korea Trip - Places API",
     description=("장소 검색, 상세, 리뷰, 북마크, 로컬 칼럼을 제공하는 API입니다. "
                 "보호된 엔드포인트는 Bearer 토큰이 필요합니다."),
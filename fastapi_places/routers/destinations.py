@@ -8,14 +8,12 @@ from sqlalchemy.orm import Session
 
 from database import get_db
 from models import (
-    LocalBadge,
     LocalColumn,
     LocalColumnSection,
     Place,
     PlanDetail,
     Shortform,
     TravelPlan,
-    User,
 )
 from schemas import (
     CityContentResponse,
@@ -25,6 +23,7 @@ from schemas import (
     ShortformListResponse,
     TravelPlanListResponse,
 )
+from services.enrichment import load_active_badges, load_users
 from services.external_places import search_kakao_places
 from services.translation_helpers import translate_city_content
 
@@ -254,27 +253,6 @@ async def get_city_content(
         .all()
     )
 
-    # 칼럼 데이터 변환
-    column_data = []
-    for column in columns:
-        user = db.query(User).filter(User.id == column.user_id).first()
-        badge = db.query(LocalBadge).filter(
-            LocalBadge.user_id == column.user_id,
-            LocalBadge.is_active == True,
-        ).first()
-        column_data.append(
-            LocalColumnListResponse(
-                id=column.id,
-                user_id=column.user_id,
-                user_nickname=user.nickname if user else None,
-                user_level=badge.level if badge else None,
-                title=column.title,
-                thumbnail_url=column.thumbnail_url,
-                view_count=column.view_count,
-                created_at=column.created_at,
-            )
-        )
-
     # 숏폼 10개 (제목 또는 location에 도시명 포함 + PUBLIC만)
     shortforms = (
         db.query(Shortform)
@@ -290,28 +268,6 @@ async def get_city_content(
         .all()
     )
 
-    # 숏폼 데이터 변환
-    shortform_data = []
-    for sf in shortforms:
-        user = db.query(User).filter(User.id == sf.user_id).first()
-        shortform_data.append(
-            ShortformListResponse(
-                id=sf.id,
-                user_id=sf.user_id,
-                user_nickname=user.nickname if user else None,
-                title=sf.title,
-                content=sf.content,
-                thumbnail_url=sf.thumbnail_url,
-                video_url=sf.video_url,
-                location=sf.location,
-                duration=sf.duration,
-                source_lang=sf.source_lang,
-                total_likes=sf.total_likes,
-                total_views=sf.total_views,
-                created_at=sf.created_at,
-            )
-        )
-
     # 여행일정 15개 (is_public=True AND (title OR description OR plan_details->place->city))
     # 1. 제목에 도시명 포함
     plan_title_match = TravelPlan.title.ilike(f"%{city_name}%")
@@ -341,10 +297,59 @@ async def get_city_content(
         .all()
     )
 
+    # 칼럼/숏폼/여행일정 작성자와 칼럼 작성자 뱃지를 한 번에 조회
+    author_ids = (
+        [column.user_id for column in columns]
+        + [sf.user_id for sf in shortforms]
+        + [plan.user_id for plan in travel_plans]
+    )
+    users = load_users(db, author_ids)
+    badges = load_active_badges(db, [column.user_id for column in columns])
+
+    # 칼럼 데이터 변환
+    column_data = []
+    for column in columns:
+        user = users.get(column.user_id)
+        badge = badges.get(column.user_id)
+        column_data.append(
+            LocalColumnListResponse(
+                id=column.id,
+                user_id=column.user_id,
+                user_nickname=user.nickname if user else None,
+                user_level=badge.level if badge else None,
+                title=column.title,
+                thumbnail_url=column.thumbnail_url,
+                view_count=column.view_count,
+                created_at=column.created_at,
+            )
+        )
+
+    # 숏폼 데이터 변환
+    shortform_data = []
+    for sf in shortforms:
+        user = users.get(sf.user_id)
+        shortform_data.append(
+            ShortformListResponse(
+                id=sf.id,
+                user_id=sf.user_id,
+                user_nickname=user.nickname if user else None,
+                title=sf.title,
+                content=sf.content,
+                thumbnail_url=sf.thumbnail_url,
+                video_url=sf.video_url,
+                location=sf.location,
+                duration=sf.duration,
+                source_lang=sf.source_lang,
+                total_likes=sf.total_likes,
+                total_views=sf.total_views,
+                created_at=sf.created_at,
+            )
+        )
+
     # 여행일정 데이터 변환
     travel_plan_data = []
     for plan in travel_plans:
-        user = db.query(User).filter(User.id == plan.user_id).first()
+        user = users.get(plan.user_id)
         travel_plan_data.append(
             TravelPlanListResponse(
                 id=plan.id,
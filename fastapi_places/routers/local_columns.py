@@ -23,6 +23,7 @@ from schemas import (
     LocalColumnSectionResponse,
 )
 from services.badges import check_local_badge_active
+from services.enrichment import load_active_badges, load_place_names, load_section_images, load_users
 from services.external_places import get_or_create_place_by_api_id
 from services.media_helpers import delete_image_file, save_image_file
 from services.translation_helpers import translate_local_column_detail, translate_local_column_list
@@ -34,6 +35,32 @@ router = APIRouter()
 
 # ==================== 현지인 칼럼 ====================
 
+def _build_section_responses(db: Session, sections: List[LocalColumnSection]) -> List[LocalColumnSectionResponse]:
+    """섹션 응답 구성 (이미지와 장소명은 섹션 전체를 IN 쿼리 1번씩으로 조회)"""
+    images_by_section = load_section_images(db, [section.id for section in sections])
+    place_names = load_place_names(db, [section.place_id for section in sections])
+
+    return [
+        LocalColumnSectionResponse(
+            id=section.id,
+            title=section.title,
+            content=section.content,
+            place_id=section.place_id,
+            place_name=place_names.get(section.place_id),
+            order=section.order,
+            images=[
+                LocalColumnSectionImageResponse(
+                    id=img.id,
+                    image_url=img.image_url,
+                    order=img.order,
+                )
+                for img in images_by_section.get(section.id, [])
+            ],
+        )
+        for section in sections
+    ]
+
+
 @router.get("/local-columns", response_model=List[LocalColumnListResponse])
 async def get_local_columns(
     city: Optional[str] = Query(None, description="도시 필터"),
@@ -88,16 +115,15 @@ async def get_local_columns(
     # 페이징 적용
     offset = (page - 1) * limit
     columns = q.offset(offset).limit(limit).all()
-    # 사용자 닉네임 및 뱃지 레벨 조회
+    # 사용자 닉네임 및 뱃지 레벨 조회 (작성자 전체를 한 번에)
+    users = load_users(db, [column.user_id for column in columns])
+    badges = load_active_badges(db, [column.user_id for column in columns])
     result = []
 
     # [AI 번역 준비]
     for column in columns:
-        user = db.query(User).filter(User.id == column.user_id).first()
-        badge = db.query(LocalBadge).filter(
-            LocalBadge.user_id == column.user_id,
-            LocalBadge.is_active == True,
-        ).first()
+        user = users.get(column.user_id)
+        badge = badges.get(column.user_id)
 
         item = LocalColumnListResponse(
             id=column.id,
@@ -143,35 +169,7 @@ async def get_local_column_detail(
         LocalColumnSection.column_id == column_id
     ).order_by(LocalColumnSection.order).all()
 
-    section_data = []
-    for section in sections:
-        images = db.query(LocalColumnSectionImage).filter(
-            LocalColumnSectionImage.section_id == section.id
-        ).order_by(LocalColumnSectionImage.order).all()
-
-        # 장소명 조회
-        place_name = None
-        if section.place_id:
-            place = db.query(Place).filter(Place.id == section.place_id).first()
-            if place:
-                place_name = place.name
-
-        section_data.append(LocalColumnSectionResponse(
-            id=section.id,
-            title=section.title,
-            content=section.content,
-            place_id=section.place_id,
-            place_name=place_name,
-            order=section.order,
-            images=[
-                LocalColumnSectionImageResponse(
-                    id=img.id,
-                    image_url=img.image_url,
-                    order=img.order,
-                )
-                for img in images
-            ],
-        ))
+    section_data = _build_section_responses(db, sections)
 
     # 사용자 정보 및 뱃지 레벨 조회
     user = db.query(User).filter(User.id == column.user_id).first()
@@ -336,17 +334,14 @@ async def create_local_column(
         # 7. 응답 모델 구성
         db.refresh(column)
         response_sections = []
+        # 장소명 조회 (섹션 전체를 한 번에)
+        place_names = load_place_names(db, [section.place_id for section in sections_to_commit])
         for section in sections_to_commit:
             db.refresh(section)
             images_for_response = [
                 img for img in images_to_commit if img.section == section
             ]
-            # 장소명 조회
-            place_name = None
-            if section.place_id:
-                place = db.query(Place).filter(Place.id == section.place_id).first()
-                if place:
-                    place_name = place.name
+            place_name = place_names.get(section.place_id)
 
             response_sections.append(LocalColumnSectionResponse(
                 id=section.id,
@@ -527,11 +522,9 @@ async def update_local_column(
                 LocalColumnSection.column_id == column_id
             ).all()
 
+            old_images_by_section = load_section_images(db, [old_section.id for old_section in old_sections])
             for old_section in old_sections:
-                old_images = db.query(LocalColumnSectionImage).filter(
-                    LocalColumnSectionImage.section_id == old_section.id
-                ).all()
-                for old_img in old_images:
+                for old_img in old_images_by_section.get(old_section.id, []):
                     # keep_images에 없는 이미지만 삭제 예정
                     if old_img.image_url not in all_keep_images:
                         old_images_to_delete.append(old_img.image_url)
@@ -608,35 +601,7 @@ async def update_local_column(
         LocalColumnSection.column_id == column_id
     ).order_by(LocalColumnSection.order).all()
 
-    section_data = []
-    for section in sections:
-        images = db.query(LocalColumnSectionImage).filter(
-            LocalColumnSectionImage.section_id == section.id
-        ).order_by(LocalColumnSectionImage.order).all()
-
-        # 장소명 조회
-        place_name = None
-        if section.place_id:
-            place = db.query(Place).filter(Place.id == section.place_id).first()
-            if place:
-                place_name = place.name
-
-        section_data.append(LocalColumnSectionResponse(
-            id=section.id,
-            title=section.title,
-            content=section.content,
-            place_id=section.place_id,
-            place_name=place_name,
-            order=section.order,
-            images=[
-                LocalColumnSectionImageResponse(
-                    id=img.id,
-                    image_url=img.image_url,
-                    order=img.order
-                )
-                for img in images
-            ]
-        ))
+    section_data = _build_section_responses(db, sections)
 
     user = db.query(User).filter(User.id == user_id).first()
     badge = db.query(LocalBadge).filter(
@@ -690,11 +655,8 @@ def delete_local_column(
     # 섹션 이미지 파일 삭제
     sections = db.query(LocalColumnSection).filter(LocalColumnSection.column_id == column_id).all()
     
-    for section in sections:
-        images = db.query(LocalColumnSectionImage).filter(
-            LocalColumnSectionImage.section_id == section.id
-        ).all()
-
+    images_by_section = load_section_images(db, [section.id for section in sections])
+    for images in images_by_section.values():
         for img in images:
             delete_image_file(img.image_url)
 
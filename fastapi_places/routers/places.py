@@ -16,6 +16,7 @@ from services.external_places import (
     search_kakao_places,
 )
 from services.geo import geocode_address, reverse_geocode
+from services.http_clients import KAKAO, upstream_get
 from services.translation_helpers import (
     translate_place_detail_basic,
     translate_place_detail_with_city,
@@ -65,23 +66,21 @@ async def get_place_detail_by_api_id(
 
     if provider == "KAKAO":
         # 카카오: 검색 API 직접 호출해서 phone, place_url 가져오기
-        import httpx
-
         if KAKAO_REST_API_KEY:
             try:
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    response = await client.get(
-                        "https://dapi.kakao.com/v2/local/search/keyword.json",
-                        headers={"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"},
-                        params={"query": name, "size": 5},
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        for doc in data.get("documents", []):
-                            if doc.get("id") == place_api_id:
-                                phone = doc.get("phone", "")
-                                place_url = doc.get("place_url", "")
-                                break
+                response = await upstream_get(
+                    KAKAO,
+                    "keyword",
+                    "/v2/local/search/keyword.json",
+                    headers={"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"},
+                    params={"query": name, "size": 5},
+                )
+                data = response.json()
+                for doc in data.get("documents", []):
+                    if doc.get("id") == place_api_id:
+                        phone = doc.get("phone", "")
+                        place_url = doc.get("place_url", "")
+                        break
             except Exception:
                 logger.exception("카카오 상세 조회 실패")
 
@@ -337,23 +336,21 @@ async def get_place_detail_by_db_id(
 
     if place.provider == "KAKAO":
         # 카카오: 검색 API 직접 호출해서 phone, place_url 가져오기
-        import httpx
-
         if KAKAO_REST_API_KEY:
             try:
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    response = await client.get(
-                        "https://dapi.kakao.com/v2/local/search/keyword.json",
-                        headers={"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"},
-                        params={"query": place.name, "size": 5},
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        for doc in data.get("documents", []):
-                            if doc.get("id") == place.place_api_id:
-                                phone = doc.get("phone", "")
-                                place_url = doc.get("place_url", "")
-                                break
+                response = await upstream_get(
+                    KAKAO,
+                    "keyword",
+                    "/v2/local/search/keyword.json",
+                    headers={"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"},
+                    params={"query": place.name, "size": 5},
+                )
+                data = response.json()
+                for doc in data.get("documents", []):
+                    if doc.get("id") == place.place_api_id:
+                        phone = doc.get("phone", "")
+                        place_url = doc.get("place_url", "")
+                        break
             except Exception:
                 logger.exception("카카오 상세 조회 실패")
 
@@ -9,6 +9,7 @@ from auth import require_auth
 from database import get_db
 from models import Place, PlaceReview, User
 from schemas import ReviewResponse
+from services.enrichment import load_users
 from services.reviews import (
     remove_place_thumbnail,
     update_place_review_stats,
@@ -61,10 +62,11 @@ async def get_place_reviews(
     # 페이지네이션
     reviews = query.offset(offset).limit(limit).all()
 
-    # 사용자 닉네임 조회
+    # 사용자 닉네임 조회 (작성자 전체를 한 번에)
+    users = load_users(db, [review.user_id for review in reviews])
     review_data = []
     for review in reviews:
-        user = db.query(User).filter(User.id == review.user_id).first()
+        user = users.get(review.user_id)
         review_data.append(
             {
                 "id": review.id,
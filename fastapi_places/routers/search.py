@@ -1,13 +1,21 @@
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from database import get_db
 from schemas import PlaceAutocompleteSuggestion
 from services.external_places import search_kakao_places
-from services.places_search import search_places_hybrid
+from services.places_search import (
+    build_search_query,
+    iter_ndjson,
+    new_search_cursor,
+    search_places_hybrid,
+    stream_place_search,
+)
+from services.search_cursor import search_cursor_store
 from services.translation_helpers import translate_place_search_results
 
 
@@ -37,6 +45,41 @@ async def search_places(
     return {"query": query, "total": len(all_results), "results": all_results}
 
 
+@router.get("/search/stream")
+async def stream_search_places(
+    query: Optional[str] = Query(None, min_length=1, description="검색어 (첫 페이지)"),
+    category: Optional[str] = Query(None, description="카테고리 필터 (첫 페이지)"),
+    city: Optional[str] = Query(None, description="도시 필터 (첫 페이지)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (다음 페이지)"),
+    lang: Optional[str] = Query(None, description="타겟 언어 (예: eng_Latn)"),
+):
+    """
+    커서 기반 장소 검색 (NDJSON 스트리밍)
+
+    업스트림(카카오/구글)별로 1페이지씩 가져와 먼저 응답한 쪽부터 한 줄씩 보냅니다.
+    - {"type": "places", "provider": "KAKAO", "page": 1, "results": [...]}
+    - {"type": "provider_error", "provider": "GOOGLE", "page": 1}
+    - {"type": "end", "page": 1, "has_more": true, "next_cursor": "..."}  (마지막 줄)
+
+    다음 페이지는 cursor=next_cursor 로 요청 (앞 페이지와 중복된 장소는 제외, 커서는 1회용).
+    커서가 만료됐으면 410 → 처음부터 다시 검색.
+    """
+    if cursor:
+        state = search_cursor_store.take(cursor)
+        if state is None:
+            raise HTTPException(status_code=410, detail="검색 커서가 만료되었습니다. 다시 검색해주세요.")
+    elif query:
+        state = new_search_cursor(build_search_query(query, category), city=city)
+    else:
+        raise HTTPException(status_code=400, detail="query 또는 cursor 가 필요합니다")
+
+    return StreamingResponse(
+        iter_ndjson(stream_place_search(state, lang)),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/autocomplete")
 async def autocomplete_places(
     q: str = Query(..., min_length=2, description="검색어 (최소 2글자)"),
@@ -0,0 +1,61 @@
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from models import LocalBadge, LocalColumnSectionImage, Place, User
+
+# ==================== 응답 부가 정보 일괄 조회 ====================
+# 목록 응답의 항목마다 작성자/뱃지/이미지/장소를 따로 조회하지 않도록 (N+1)
+# 필요한 id 를 먼저 모은 뒤 종류별로 IN 쿼리 1번씩 조회해 {id: 값} 으로 돌려줍니다.
+# id 가 하나도 없으면 쿼리하지 않습니다.
+
+
+def _unique_ids(ids: Iterable[Optional[int]]) -> List[int]:
+    return list({i for i in ids if i is not None})
+
+
+def load_users(db: Session, user_ids: Iterable[Optional[int]]) -> Dict[int, User]:
+    """{user_id: User}"""
+    ids = _unique_ids(user_ids)
+    if not ids:
+        return {}
+    return {user.id: user for user in db.query(User).filter(User.id.in_(ids)).all()}
+
+
+def load_active_badges(db: Session, user_ids: Iterable[Optional[int]]) -> Dict[int, LocalBadge]:
+    """{user_id: 활성 뱃지}. 활성 뱃지가 여러 개면 먼저 만든 것"""
+    ids = _unique_ids(user_ids)
+    if not ids:
+        return {}
+    badges = db.query(LocalBadge).filter(
+        LocalBadge.user_id.in_(ids),
+        LocalBadge.is_active == True,
+    ).order_by(LocalBadge.id).all()
+
+    result: Dict[int, LocalBadge] = {}
+    for badge in badges:
+        result.setdefault(badge.user_id, badge)
+    return result
+
+
+def load_place_names(db: Session, place_ids: Iterable[Optional[int]]) -> Dict[int, str]:
+    """{place_id: 장소명}"""
+    ids = _unique_ids(place_ids)
+    if not ids:
+        return {}
+    return {place_id: name for place_id, name in db.query(Place.id, Place.name).filter(Place.id.in_(ids)).all()}
+
+
+def load_section_images(db: Session, section_ids: Iterable[Optional[int]]) -> Dict[int, List[LocalColumnSectionImage]]:
+    """{section_id: [이미지 (order 순)]}. 이미지가 없는 섹션은 키 없음"""
+    ids = _unique_ids(section_ids)
+    if not ids:
+        return {}
+    images = db.query(LocalColumnSectionImage).filter(
+        LocalColumnSectionImage.section_id.in_(ids)
+    ).order_by(LocalColumnSectionImage.section_id, LocalColumnSectionImage.order).all()
+
+    result: Dict[int, List[LocalColumnSectionImage]] = {}
+    for image in images:
+        result.setdefault(image.section_id, []).append(image)
+    return result
@@ -1,13 +1,21 @@
+import asyncio
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-import httpx
 from sqlalchemy.orm import Session
 
 from models import Place
 from services.categories import GOOGLE_CATEGORY_MAP, map_category_to_main
 from services.config import GOOGLE_MAPS_API_KEY, KAKAO_REST_API_KEY
 from services.geo import extract_city_from_address, is_korea_location
+from services.http_clients import GOOGLE, KAKAO, count_upstream_error, upstream_get
+from services.upstream_cache import PLACES_CACHE_ENABLED, UpstreamCache, create_shared_backend
+
+# 카카오 키워드 검색: 페이지당 최대 15개, 최대 45페이지
+KAKAO_PAGE_SIZE = 15
+KAKAO_MAX_PAGE = 45
+# 구글 next_page_token 이 유효해질 때까지 기다리는 시간 (초)
+GOOGLE_PAGE_TOKEN_DELAY = 1.5
 
 
 # ==================== 외부 API 통합 ====================
@@ -67,114 +75,190 @@ async def get_or_create_place_by_api_id(
     return place
 
 
+# ==================== 검색 결과 캐시 ====================
+# 키: (provider, 정규화된 검색어, limit). 결과의 위도/경도(Decimal)는 공유 저장소에 문자열로 저장
+
+def _normalize_query(query: str) -> str:
+    return " ".join((query or "").split()).lower()
+
+
+def _encode_places(places: List[Dict]) -> List[Dict]:
+    return [{**p, "latitude": str(p["latitude"]), "longitude": str(p["longitude"])} for p in places]
+
+
+def _decode_places(items: List[Dict]) -> List[Dict]:
+    return [{**p, "latitude": Decimal(p["latitude"]), "longitude": Decimal(p["longitude"])} for p in items]
+
+
+_shared_cache_backend = create_shared_backend()
+kakao_search_cache = UpstreamCache("kakao_search", backend=_shared_cache_backend,
+                                   encode=_encode_places, decode=_decode_places)
+google_search_cache = UpstreamCache("google_search", backend=_shared_cache_backend,
+                                    encode=_encode_places, decode=_decode_places)
+
+
+async def _cached_search(cache: UpstreamCache, query: str, limit: int, fetch) -> List[Dict]:
+    if not PLACES_CACHE_ENABLED:
+        return await fetch(query, limit)
+    results = await cache.get_or_load(f"{_normalize_query(query)}|{limit}", lambda: fetch(query, limit))
+    # 호출측에서 결과 dict 를 수정하므로 (id, 번역 등) 캐시된 객체를 그대로 넘기지 않음
+    return [dict(r) for r in results]
+
+
+async def close_search_caches():
+    """앱 종료 시 공유 캐시 연결 정리"""
+    if _shared_cache_backend is not None:
+        await _shared_cache_backend.close()
+
+
 async def search_kakao_places(query: str, limit: int = 15) -> List[Dict]:
     """
-    카카오맵 API로 장소 검색
+    카카오맵 API로 장소 검색 (검색 결과 캐시 사용)
     """
     if not KAKAO_REST_API_KEY:
         return []
 
-    url = "https://dapi.kakao.com/v2/local/search/keyword.json"
+    try:
+        return await _cached_search(kakao_search_cache, query, limit, _fetch_kakao_places)
+    except Exception as e:
+        print(f"❌ 카카오맵 API 에러: {e}")
+
+        return []
+
+
+async def _fetch_kakao_places(query: str, limit: int) -> List[Dict]:
+    """카카오 키워드 검색 API 호출. 실패 시 예외 (실패 결과는 캐시하지 않음)"""
+    results, _ = await fetch_kakao_page(query, page=1, size=limit)
+    return results
+
+
+async def fetch_kakao_page(query: str, page: int = 1, size: int = KAKAO_PAGE_SIZE) -> Tuple[List[Dict], bool]:
+    """
+    카카오 키워드 검색 1페이지 (커서 검색용, 캐시 없음). 실패 시 예외.
+    Returns: (장소 목록, 마지막 페이지 여부)
+    """
+    url = "/v2/local/search/keyword.json"
     headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
     params = {
         "query": query,
-        "size": limit
+        "size": size,
+        "page": page
     }
 
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            results = []
-            for doc in data.get("documents", []):
-                # 카테고리 파싱 (예: "음식점 > 한식 > 찜,탕,찌개" -> ["음식점", "한식", "찜,탕,찌개"])
-                category_detail = doc.get("category_name", "").split(" > ")
-
-                results.append({
-                    "provider": "KAKAO",
-                    "place_api_id": doc.get("id"),
-                    "name": doc.get("place_name"),
-                    "address": doc.get("address_name") or doc.get("road_address_name", ""),
-                    "city": extract_city_from_address(doc.get("address_name", "")),
-                    "latitude": Decimal(doc.get("y", "0")),
-                    "longitude": Decimal(doc.get("x", "0")),
-                    "category_main": map_category_to_main(category_detail),
-                    "category_detail": category_detail,
-                    "thumbnail_url": None  # 카카오 API는 썸네일 미제공
-                })
-
-            return results
+    response = await upstream_get(KAKAO, "keyword", url, headers=headers, params=params)
+    data = response.json()
 
-    except Exception as e:
-        print(f"❌ 카카오맵 API 에러: {e}")
+    results = []
+    for doc in data.get("documents", []):
+        # 카테고리 파싱 (예: "음식점 > 한식 > 찜,탕,찌개" -> ["음식점", "한식", "찜,탕,찌개"])
+        category_detail = doc.get("category_name", "").split(" > ")
 
-        return []
+        results.append({
+            "provider": "KAKAO",
+            "place_api_id": doc.get("id"),
+            "name": doc.get("place_name"),
+            "address": doc.get("address_name") or doc.get("road_address_name", ""),
+            "city": extract_city_from_address(doc.get("address_name", "")),
+            "latitude": Decimal(doc.get("y", "0")),
+            "longitude": Decimal(doc.get("x", "0")),
+            "category_main": map_category_to_main(category_detail),
+            "category_detail": category_detail,
+            "thumbnail_url": None  # 카카오 API는 썸네일 미제공
+        })
+
+    is_end = data.get("meta", {}).get("is_end", True) or page >= KAKAO_MAX_PAGE
+    return results, is_end
 
 
 async def search_google_places(query: str, limit: int = 15) -> List[Dict]:
     """
-    구글맵 API로 장소 검색
+    구글맵 API로 장소 검색 (검색 결과 캐시 사용)
     """
     if not GOOGLE_MAPS_API_KEY:
         return []
 
-    url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-    params = {
-        "query": f"{query} 대한민국",  # 한국 내 검색 강제
-        "key": GOOGLE_MAPS_API_KEY,
-        "language": "ko"
-    }
-
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            results = []
-            for place in data.get("results", [])[:limit]:
-                location = place.get("geometry", {}).get("location", {})
-                lat = Decimal(str(location.get("lat", 0)))
-                lng = Decimal(str(location.get("lng", 0)))
-
-                # 한국 범위 내 필터링
-                if not is_korea_location(float(lat), float(lng)):
-                    continue
-
-                # 카테고리 영어 → 한국어 변환
-                types_en = place.get("types", [])
-                types_ko = [GOOGLE_CATEGORY_MAP.get(t, t) for t in types_en]
-
-                # category_main 추출 (첫 번째 의미있는 카테고리)
-                category_main = None
-                for t in types_en:
-                    if t in GOOGLE_CATEGORY_MAP and t not in ["point_of_interest", "establishment"]:
-                        category_main = GOOGLE_CATEGORY_MAP[t]
-                        break
-
-                results.append({
-                    "provider": "GOOGLE",
-                    "place_api_id": place.get("place_id"),
-                    "name": place.get("name"),
-                    "address": place.get("formatted_address", ""),
-                    "city": extract_city_from_address(place.get("formatted_address", "")),
-                    "latitude": lat,
-                    "longitude": lng,
-                    "category_main": category_main,
-                    "category_detail": types_ko,
-                    "thumbnail_url": None  # 썸네일은 별도 API 필요
-                })
-
-            return results
-
+        return await _cached_search(google_search_cache, query, limit, _fetch_google_places)
     except Exception as e:
         print(f"❌ 구글맵 API 에러: {e}")
 
         return []
 
 
+async def _fetch_google_places(query: str, limit: int) -> List[Dict]:
+    """구글 Text Search API 호출. 실패 시 예외 (실패 결과는 캐시하지 않음)"""
+    results, _ = await fetch_google_page(query)
+    return results[:limit]
+
+
+async def fetch_google_page(query: str, page_token: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    구글 Text Search 1페이지 (최대 20개, 커서 검색용, 캐시 없음). 실패 시 예외.
+    page_token 이 있으면 이전 응답의 next_page_token 으로 다음 페이지를 요청합니다.
+    Returns: (장소 목록, 다음 페이지 토큰 또는 None)
+    """
+    url = "/maps/api/place/textsearch/json"
+    if page_token:
+        params = {"pagetoken": page_token, "key": GOOGLE_MAPS_API_KEY}
+    else:
+        params = {
+            "query": f"{query} 대한민국",  # 한국 내 검색 강제
+            "key": GOOGLE_MAPS_API_KEY,
+            "language": "ko"
+        }
+
+    response = await upstream_get(GOOGLE, "textsearch", url, params=params)
+    data = response.json()
+
+    # next_page_token 은 발급 직후 잠깐 동안 INVALID_REQUEST 로 응답하므로 1번만 다시 시도
+    if page_token and data.get("status") == "INVALID_REQUEST":
+        await asyncio.sleep(GOOGLE_PAGE_TOKEN_DELAY)
+        response = await upstream_get(GOOGLE, "textsearch", url, params=params)
+        data = response.json()
+
+    # 구글은 키 오류/한도 초과도 HTTP 200 + status 로 알려줌
+    status = data.get("status")
+    if status not in ("OK", "ZERO_RESULTS"):
+        count_upstream_error(GOOGLE, "textsearch", status or "UNKNOWN")
+        raise RuntimeError(f"Google Places status={status}: {data.get('error_message', '')}")
+
+    results = []
+    for place in data.get("results", []):
+        location = place.get("geometry", {}).get("location", {})
+        lat = Decimal(str(location.get("lat", 0)))
+        lng = Decimal(str(location.get("lng", 0)))
+
+        # 한국 범위 내 필터링
+        if not is_korea_location(float(lat), float(lng)):
+            continue
+
+        # 카테고리 영어 → 한국어 변환
+        types_en = place.get("types", [])
+        types_ko = [GOOGLE_CATEGORY_MAP.get(t, t) for t in types_en]
+
+        # category_main 추출 (첫 번째 의미있는 카테고리)
+        category_main = None
+        for t in types_en:
+            if t in GOOGLE_CATEGORY_MAP and t not in ["point_of_interest", "establishment"]:
+                category_main = GOOGLE_CATEGORY_MAP[t]
+                break
+
+        results.append({
+            "provider": "GOOGLE",
+            "place_api_id": place.get("place_id"),
+            "name": place.get("name"),
+            "address": place.get("formatted_address", ""),
+            "city": extract_city_from_address(place.get("formatted_address", "")),
+            "latitude": lat,
+            "longitude": lng,
+            "category_main": category_main,
+            "category_detail": types_ko,
+            "thumbnail_url": None  # 썸네일은 별도 API 필요
+        })
+
+    return results, data.get("next_page_token")
+
+
 async def get_google_place_details(place_id: str) -> Optional[Dict]:
     """
     구글 Place Details API로 영업시간 등 상세 정보 조회
@@ -182,7 +266,7 @@ async def get_google_place_details(place_id: str) -> Optional[Dict]:
     if not GOOGLE_MAPS_API_KEY:
         return None
 
-    url = "https://maps.googleapis.com/maps/api/place/details/json"
+    url = "/maps/api/place/details/json"
     params = {
         "place_id": place_id,
         "fields": "opening_hours,formatted_phone_number,website",
@@ -191,24 +275,23 @@ async def get_google_place_details(place_id: str) -> Optional[Dict]:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = await upstream_get(GOOGLE, "details", url, params=params)
+        data = response.json()
 
-            if data.get("status") != "OK":
-                return None
+        if data.get("status") != "OK":
+            if data.get("status") not in ("NOT_FOUND", "ZERO_RESULTS"):
+                count_upstream_error(GOOGLE, "details", data.get("status", "UNKNOWN"))
+            return None
 
-            result = data.get("result", {})
-            opening_hours = result.get("opening_hours", {})
+        result = data.get("result", {})
+        opening_hours = result.get("opening_hours", {})
 
-            return {
-                "opening_hours": opening_hours.get("weekday_text", []),
-                "phone": result.get("formatted_phone_number", ""),
-                "website": result.get("website", "")
-            }
+        return {
+            "opening_hours": opening_hours.get("weekday_text", []),
+            "phone": result.get("formatted_phone_number", ""),
+            "website": result.get("website", "")
+        }
 
     except Exception as e:
         print(f"❌ 구글 Place Details API 에러: {e}")
         return None
-
@@ -1,7 +1,5 @@
 from typing import Optional
 
-import httpx
-
 from services.config import (
     KAKAO_REST_API_KEY,
     KOREA_LAT_MAX,
@@ -9,6 +7,7 @@ from services.config import (
     KOREA_LON_MAX,
     KOREA_LON_MIN,
 )
+from services.http_clients import KAKAO, upstream_get
 
 
 # ==================== 헬퍼 함수 ====================
@@ -47,7 +46,7 @@ async def reverse_geocode(latitude: float, longitude: float) -> Optional[str]:
     if not KAKAO_REST_API_KEY:
         return None
 
-    url = "https://dapi.kakao.com/v2/local/geo/coord2address.json"
+    url = "/v2/local/geo/coord2address.json"
     headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
     params = {
         "x": longitude,
@@ -55,17 +54,15 @@ async def reverse_geocode(latitude: float, longitude: float) -> Optional[str]:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=3.0) as client:
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("documents"):
-                address = data["documents"][0].get("address", {})
-                region = address.get("region_1depth_name", "")
-                # "서울특별시" -> "서울"
-                city = region.replace("특별시", "").replace("광역시", "").replace("도", "").strip()
-                return city
+        response = await upstream_get(KAKAO, "coord2address", url, headers=headers, params=params, timeout=3.0)
+        data = response.json()
+
+        if data.get("documents"):
+            address = data["documents"][0].get("address", {})
+            region = address.get("region_1depth_name", "")
+            # "서울특별시" -> "서울"
+            city = region.replace("특별시", "").replace("광역시", "").replace("도", "").strip()
+            return city
 
     except Exception as e:
         print(f"❌ 역지오코딩 에러: {e}")
@@ -89,31 +86,29 @@ async def geocode_address(address: str) -> Optional[dict]:
     if not KAKAO_REST_API_KEY:
         return None
 
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
+    url = "/v2/local/search/address.json"
     headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
     params = {"query": address}
 
     try:
-        async with httpx.AsyncClient(timeout=3.0) as client:
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("documents"):
-                doc = data["documents"][0]
-
-                # 도로명 주소 우선, 없으면 지번 주소
-                road_address = doc.get("road_address")
-                if road_address:
-                    address_name = road_address.get("address_name")
-                else:
-                    address_name = doc.get("address", {}).get("address_name")
-
-                return {
-                    "road_address": address_name,
-                    "latitude": float(doc.get("y")),
-                    "longitude": float(doc.get("x"))
-                }
+        response = await upstream_get(KAKAO, "address", url, headers=headers, params=params, timeout=3.0)
+        data = response.json()
+
+        if data.get("documents"):
+            doc = data["documents"][0]
+
+            # 도로명 주소 우선, 없으면 지번 주소
+            road_address = doc.get("road_address")
+            if road_address:
+                address_name = road_address.get("address_name")
+            else:
+                address_name = doc.get("address", {}).get("address_name")
+
+            return {
+                "road_address": address_name,
+                "latitude": float(doc.get("y")),
+                "longitude": float(doc.get("x"))
+            }
 
     except Exception as e:
         print(f"❌ 주소 검색 에러: {e}")
@@ -0,0 +1,117 @@
+import logging
+import os
+import time
+from typing import Dict
+
+import httpx
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# ==================== 외부 API 공유 HTTP 클라이언트 ====================
+# 호출마다 httpx.AsyncClient 를 새로 만들면 매번 TCP+TLS 핸드셰이크를 하므로
+# 업스트림(카카오/구글)별로 앱 수명 동안 클라이언트 1개를 두고 연결을 재사용합니다.
+# main.py 의 lifespan 에서 open_upstream_clients / close_upstream_clients 호출.
+
+KAKAO = "kakao"
+GOOGLE = "google"
+
+UPSTREAM_BASE_URLS = {
+    KAKAO: "https://dapi.kakao.com",
+    GOOGLE: "https://maps.googleapis.com",
+}
+
+PLACES_HTTP_MAX_CONNECTIONS = int(os.getenv("PLACES_HTTP_MAX_CONNECTIONS", "20"))
+PLACES_HTTP_MAX_KEEPALIVE = int(os.getenv("PLACES_HTTP_MAX_KEEPALIVE", "10"))
+PLACES_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("PLACES_HTTP_KEEPALIVE_EXPIRY", "30"))
+PLACES_HTTP_TIMEOUT = float(os.getenv("PLACES_HTTP_TIMEOUT", "5.0"))
+
+# HTTP/2 는 h2 패키지가 있을 때만 (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+UPSTREAM_LATENCY = Histogram(
+    "places_upstream_request_seconds",
+    "외부 장소 API 응답 시간(초)",
+    ["upstream", "endpoint"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+UPSTREAM_ERRORS = Counter(
+    "places_upstream_errors_total",
+    "외부 장소 API 호출 실패 수",
+    ["upstream", "endpoint", "reason"],
+)
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def _create_client(upstream: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=UPSTREAM_BASE_URLS[upstream],
+        http2=HTTP2_AVAILABLE,
+        timeout=PLACES_HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=PLACES_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=PLACES_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=PLACES_HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def open_upstream_clients():
+    """앱 시작 시 업스트림별 클라이언트 생성"""
+    for upstream in UPSTREAM_BASE_URLS:
+        if upstream not in _clients:
+            _clients[upstream] = _create_client(upstream)
+    logger.info(f"외부 API HTTP 클라이언트 준비 (http2={HTTP2_AVAILABLE}, "
+                f"max_connections={PLACES_HTTP_MAX_CONNECTIONS})")
+
+
+async def close_upstream_clients():
+    """앱 종료 시 연결 정리"""
+    while _clients:
+        _, client = _clients.popitem()
+        await client.aclose()
+
+
+def get_upstream_client(upstream: str) -> httpx.AsyncClient:
+    """
+    업스트림 공유 클라이언트.
+    lifespan 밖(스크립트 등)에서 서비스 함수를 직접 호출한 경우에만 여기서 생성합니다.
+    """
+    client = _clients.get(upstream)
+    if client is None:
+        client = _clients[upstream] = _create_client(upstream)
+    return client
+
+
+def count_upstream_error(upstream: str, endpoint: str, reason: str):
+    """HTTP 200 이지만 본문에 오류 상태가 온 경우 (구글 REQUEST_DENIED, OVER_QUERY_LIMIT 등)"""
+    UPSTREAM_ERRORS.labels(upstream, endpoint, reason).inc()
+
+
+async def upstream_get(upstream: str, endpoint: str, path: str, **kwargs) -> httpx.Response:
+    """
+    공유 클라이언트로 GET 요청 + 지연 시간/오류 지표 기록.
+    4xx/5xx 는 raise_for_status 로 예외를 올리므로 호출측의 기존 예외 처리 그대로 사용.
+    """
+    client = get_upstream_client(upstream)
+    started = time.perf_counter()
+    try:
+        response = await client.get(path, **kwargs)
+    except httpx.TimeoutException:
+        UPSTREAM_ERRORS.labels(upstream, endpoint, "timeout").inc()
+        raise
+    except httpx.HTTPError:
+        UPSTREAM_ERRORS.labels(upstream, endpoint, "connection").inc()
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels(upstream, endpoint).observe(time.perf_counter() - started)
+
+    if response.is_error:
+        UPSTREAM_ERRORS.labels(upstream, endpoint, f"http_{response.status_code}").inc()
+    response.raise_for_status()
+    return response
@@ -1,10 +1,35 @@
 ﻿import asyncio
-from typing import Dict, List, Optional
+import json
+import logging
+import math
+import re
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
+from database import SessionLocal
 from models import Place
-from services.external_places import search_google_places, search_kakao_places
+from services.config import GOOGLE_MAPS_API_KEY, KAKAO_REST_API_KEY
+from services.external_places import (
+    fetch_google_page,
+    fetch_kakao_page,
+    search_google_places,
+    search_kakao_places,
+)
+from services.search_cursor import SEARCH_CURSOR_REQUESTS, PlaceSearchCursor, search_cursor_store
+from services.translation_helpers import translate_place_search_results
+
+logger = logging.getLogger(__name__)
+
+# 공백, 특수문자 제거 (한글, 영문, 숫자만 유지)
+_NAME_STRIP_RE = re.compile(r'[^\w가-힣]')
+
+# 같은 장소로 보는 좌표 차이 (위도/경도 각각 0.001도, 약 100m)
+DUPLICATE_COORD_THRESHOLD = 0.001
+
+# 중복 병합 시 옮기지 않는 필드 (출처별 식별자는 sources 로 따로 기록)
+_SOURCE_FIELDS = ("provider", "place_api_id", "id", "sources")
 
 
 def normalize_name(name: str) -> str:
@@ -13,47 +38,92 @@ def normalize_name(name: str) -> str:
     - 공백, 특수문자 제거
     - 소문자 변환
     """
-    import re
     if not name:
         return ""
-    # 공백, 특수문자 제거 (한글, 영문, 숫자만 유지)
-    normalized = re.sub(r'[^\w가-힣]', '', name.lower())
+    normalized = _NAME_STRIP_RE.sub('', name.lower())
     return normalized
 
 
-def remove_duplicate_places(places: List[Dict]) -> List[Dict]:
+def _is_empty(value) -> bool:
+    return value is None or value == "" or value == []
+
+
+class DuplicatePlaceIndex:
     """
-    이름 + 좌표 기반 중복 제거
-    - 이름 정규화 후 완전 일치 비교
-    - 좌표 거리로 중복 판단 (100m 이내)
-    - 카카오 결과 우선 (먼저 들어온 것 유지)
+    이름 + 좌표 기반 중복 판별 인덱스
+    - 이름은 넣을 때 1번만 정규화
+    - (정규화된 이름, 약 100m 격자 칸) 으로 버킷을 나누고, 주변 3x3 칸의 같은 이름만 비교
+      → 후보 n개에 대해 O(n) (기존 방식은 남은 장소 전체와 비교해 O(n²))
+    - 먼저 들어온 장소를 유지하고 (카카오 우선), 뒤에 온 중복은 버리지 않고 빈 필드를 채우며 출처를 sources 에 기록
+    대량 import 에서도 add() 를 반복 호출해 그대로 사용할 수 있습니다.
     """
-    unique = []
 
-    for place in places:
+    def __init__(self, threshold: float = DUPLICATE_COORD_THRESHOLD):
+        self.threshold = threshold
+        self.places: List[Dict] = []
+        # (이름, 격자 칸) -> [(위도, 경도, 들어온 순서, 장소)]
+        self._buckets: Dict[Tuple[str, int, int], List[Tuple[float, float, int, Dict]]] = {}
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.threshold), math.floor(lng / self.threshold)
+
+    def find(self, name: str, lat: float, lng: float) -> Optional[Dict]:
+        """정규화된 이름이 같고 위도/경도 차이가 각각 threshold 미만인, 먼저 들어온 장소"""
+        cell_lat, cell_lng = self._cell(lat, lng)
+        match = None
+        match_order = None
+        for d_lat in (-1, 0, 1):
+            for d_lng in (-1, 0, 1):
+                bucket = self._buckets.get((name, cell_lat + d_lat, cell_lng + d_lng), ())
+                for kept_lat, kept_lng, order, kept in bucket:
+                    if abs(lat - kept_lat) < self.threshold and abs(lng - kept_lng) < self.threshold:
+                        # 여러 개면 가장 먼저 들어온 장소 (기존 순차 비교와 같은 결과)
+                        if match_order is None or order < match_order:
+                            match, match_order = kept, order
+        return match
+
+    def add(self, place: Dict) -> bool:
+        """새 장소면 True, 기존 장소에 병합했으면 False"""
         name = normalize_name(place.get("name", ""))
-        lat = place.get("latitude", 0)
-        lng = place.get("longitude", 0)
+        lat = float(place.get("latitude") or 0)
+        lng = float(place.get("longitude") or 0)
 
-        is_duplicate = False
-        for existing in unique:
-            existing_name = normalize_name(existing.get("name", ""))
-            existing_lat = existing.get("latitude", 0)
-            existing_lng = existing.get("longitude", 0)
+        existing = self.find(name, lat, lng)
+        if existing is not None:
+            self._merge(existing, place)
+            return False
 
-            # 정규화된 이름이 완전히 같은 경우만 체크
-            if name == existing_name:
-                # 좌표 거리 체크 (약 100m 이내면 중복)
-                lat_diff = abs(lat - existing_lat)
-                lng_diff = abs(lng - existing_lng)
-                if lat_diff < 0.001 and lng_diff < 0.001:
-                    is_duplicate = True
-                    break
+        kept = dict(place)  # 병합하면서 원본 dict 를 바꾸지 않도록
+        self._buckets.setdefault((name, *self._cell(lat, lng)), []).append((lat, lng, len(self.places), kept))
+        self.places.append(kept)
+        return True
 
-        if not is_duplicate:
-            unique.append(place)
+    @staticmethod
+    def _merge(kept: Dict, duplicate: Dict):
+        """중복 장소의 정보로 기존 장소의 빈 필드를 채우고 출처 목록에 추가"""
+        sources = kept.get("sources")
+        if sources is None:
+            sources = kept["sources"] = [{"provider": kept.get("provider"), "place_api_id": kept.get("place_api_id")}]
+        sources.append({"provider": duplicate.get("provider"), "place_api_id": duplicate.get("place_api_id")})
 
-    return unique
+        for field, value in duplicate.items():
+            if field in _SOURCE_FIELDS:
+                continue
+            if _is_empty(kept.get(field)) and not _is_empty(value):
+                kept[field] = value
+
+
+def remove_duplicate_places(places: List[Dict]) -> List[Dict]:
+    """
+    이름 + 좌표 기반 중복 제거
+    - 이름 정규화 후 완전 일치 비교
+    - 좌표 거리로 중복 판단 (100m 이내)
+    - 카카오 결과 우선 (먼저 들어온 것 유지), 구글 등 뒤에 온 중복의 정보는 병합 (sources)
+    """
+    index = DuplicatePlaceIndex()
+    for place in places:
+        index.add(place)
+    return index.places
 
 
 # async def search_places_hybrid(query: str, category: Optional[str] = None,
@@ -85,30 +155,68 @@ def remove_duplicate_places(places: List[Dict]) -> List[Dict]:
 #         filtered_results = [r for r in filtered_results if r.get("city") == city]
 
 #     return filtered_results[:limit]
+
+
+# 카테고리 필터 → 검색어에 붙일 키워드
+CATEGORY_SEARCH_KEYWORDS = {
+    "숙박": "호텔",
+    "호텔": "호텔",
+    "모텔": "모텔",
+    "펜션": "펜션",
+    "음식점": "맛집",
+    "카페": "카페",
+    "관광명소": "관광",
+}
+
+
+def build_search_query(query: str, category: Optional[str] = None) -> str:
+    """카테고리가 있으면 검색어에 키워드 추가"""
+    if not category:
+        return query
+    keyword = CATEGORY_SEARCH_KEYWORDS.get(category, category)
+    if keyword in query:  # 중복 방지
+        return query
+    return f"{query} {keyword}"
+
+
+def attach_db_place_info(results: List[Dict], db: Session) -> List[Dict]:
+    """DB에 이미 있는 장소면 id, 썸네일, 평점, 리뷰 수를 결과에 추가"""
+    # 검색 결과의 API ID 목록 추출
+    api_ids = [r["place_api_id"] for r in results if r.get("place_api_id")]
+    if not api_ids:
+        return results
+
+    # DB에서 해당 API ID를 가진 장소 조회
+    existing_places = db.query(Place).filter(Place.place_api_id.in_(api_ids)).all()
+
+    # {place_api_id: Place} 매핑 생성
+    place_map = {p.place_api_id: p for p in existing_places}
+
+    # 결과에 DB 정보 추가
+    for result in results:
+        api_id = result.get("place_api_id")
+        if api_id and api_id in place_map:
+            db_place = place_map[api_id]
+            result["id"] = db_place.id
+            # DB에 저장된 썸네일이 있으면 사용
+            if db_place.thumbnail_urls:
+                result["thumbnail_urls"] = db_place.thumbnail_urls
+            # 평점 및 리뷰 수 추가
+            result["average_rating"] = float(db_place.average_rating) if db_place.average_rating else 0.0
+            result["review_count"] = db_place.review_count or 0
+
+    return results
+
+
 async def search_places_hybrid(query: str, category: Optional[str] = None,
                                 city: Optional[str] = None, db: Session = None) -> List[Dict]:
     """
     카카오 + 구글 병렬 검색 후 결과 통합
-    모든 결과 반환 (페이지네이션 없음)
+    모든 결과 반환 (페이지네이션 없음, 페이지 단위는 stream_place_search 사용)
     DB에 이미 있는 장소인지 확인하여 id 포함
     """
-    # ★ 추가: 카테고리가 있으면 검색어에 키워드 추가
-    search_query = query
-    if category:
-        category_keywords = {
-            "숙박": "호텔",
-            "호텔": "호텔",
-            "모텔": "모텔",
-            "펜션": "펜션",
-            "음식점": "맛집",
-            "카페": "카페",
-            "관광명소": "관광",
-        }
-        keyword = category_keywords.get(category, category)
-        if keyword not in query:  # 중복 방지
-            search_query = f"{query} {keyword}"
-
-    # ★ 수정: query → search_query로 변경
+    search_query = build_search_query(query, category)
+
     kakao_task = search_kakao_places(search_query, limit=15)
     google_task = search_google_places(search_query, limit=15)
 
@@ -123,27 +231,106 @@ async def search_places_hybrid(query: str, category: Optional[str] = None,
 
     # ★ DB 존재 여부 확인 및 추가 정보 주입
     if db:
-        # 검색 결과의 API ID 목록 추출
-        api_ids = [r["place_api_id"] for r in unique_results if r.get("place_api_id")]
-
-        if api_ids:
-            # DB에서 해당 API ID를 가진 장소 조회
-            existing_places = db.query(Place).filter(Place.place_api_id.in_(api_ids)).all()
-
-            # {place_api_id: Place} 매핑 생성
-            place_map = {p.place_api_id: p for p in existing_places}
-
-            # 결과에 DB 정보 추가
-            for result in unique_results:
-                api_id = result.get("place_api_id")
-                if api_id and api_id in place_map:
-                    db_place = place_map[api_id]
-                    result["id"] = db_place.id
-                    # DB에 저장된 썸네일이 있으면 사용
-                    if db_place.thumbnail_urls:
-                        result["thumbnail_urls"] = db_place.thumbnail_urls
-                    # 평점 및 리뷰 수 추가
-                    result["average_rating"] = float(db_place.average_rating) if db_place.average_rating else 0.0
-                    result["review_count"] = db_place.review_count or 0
-
-    return unique_results
\ No newline at end of file
+        attach_db_place_info(unique_results, db)
+
+    return unique_results
+
+
+# ==================== 커서 기반 스트리밍 검색 ====================
+# 한 번에 업스트림별로 1페이지씩만 가져오고 (카카오 15개, 구글 20개), 먼저 응답한 쪽 결과부터 NDJSON 한 줄로 보냅니다.
+# 다음 페이지 위치와 이미 보낸 장소는 서버 측 커서(services.search_cursor)에 남겨
+# 다음 요청은 앞 페이지를 다시 조회하지 않고 이어서 가져오고, 앞 페이지와 겹치는 장소는 보내지 않습니다.
+
+def new_search_cursor(search_query: str, city: Optional[str] = None,
+                      result_filter: Optional[Callable[[Dict], bool]] = None) -> PlaceSearchCursor:
+    """첫 페이지용 커서 (API 키가 없는 업스트림은 처음부터 끝난 것으로 처리)"""
+    SEARCH_CURSOR_REQUESTS.labels("new").inc()
+    return PlaceSearchCursor(search_query, DuplicatePlaceIndex(), city=city, result_filter=result_filter,
+                             kakao_enabled=bool(KAKAO_REST_API_KEY), google_enabled=bool(GOOGLE_MAPS_API_KEY))
+
+
+async def _fetch_next_page(cursor: PlaceSearchCursor, provider: str) -> Tuple[str, Optional[List[Dict]]]:
+    """
+    업스트림 1곳의 다음 페이지를 가져오고 커서 위치를 옮김. (provider, 결과) 반환.
+    실패하면 결과 None 이고 그 업스트림은 이 커서에서 끝난 것으로 처리 (다른 업스트림 페이지는 계속).
+    """
+    try:
+        if provider == "KAKAO":
+            results, is_end = await fetch_kakao_page(cursor.query, cursor.kakao_page)
+            cursor.kakao_page = None if is_end else cursor.kakao_page + 1
+        else:
+            results, next_token = await fetch_google_page(cursor.query, cursor.google_token)
+            cursor.google_started = True
+            cursor.google_token = next_token
+        return provider, results
+    except Exception as e:
+        logger.warning(f"커서 검색 {provider} 페이지 조회 실패: {e}")
+        if provider == "KAKAO":
+            cursor.kakao_page = None
+        else:
+            cursor.google_started, cursor.google_token = True, None
+        return provider, None
+
+
+def _take_new_places(cursor: PlaceSearchCursor, results: List[Dict]) -> List[Dict]:
+    """필터를 통과하고 이 커서에서 아직 보내지 않은 장소만"""
+    new_places = []
+    for place in results:
+        if cursor.city and place.get("city") != cursor.city:
+            continue
+        if cursor.result_filter and not cursor.result_filter(place):
+            continue
+        if cursor.seen.add(place):
+            new_places.append(dict(place))
+    return new_places
+
+
+async def stream_place_search(cursor: PlaceSearchCursor, lang: Optional[str] = None) -> AsyncIterator[Dict]:
+    """
+    커서의 다음 페이지를 업스트림별로 동시에 요청하고, 응답이 오는 순서대로 이벤트 dict 를 내보냄
+    - {"type": "places", "provider", "page", "results"}: 업스트림 1곳의 새 장소 (중복/필터 제외)
+    - {"type": "provider_error", "provider", "page"}: 그 업스트림 조회 실패
+    - {"type": "end", "page", "has_more", "next_cursor"}: 마지막 줄. next_cursor 로 다음 페이지 요청
+    스트림이 중간에 끊기면 (클라이언트 종료) 남은 요청을 취소하고 커서도 저장하지 않음.
+    """
+    cursor.page += 1
+    providers = []
+    if not cursor.kakao_done:
+        providers.append("KAKAO")
+    if not cursor.google_done:
+        providers.append("GOOGLE")
+
+    tasks = [asyncio.create_task(_fetch_next_page(cursor, provider)) for provider in providers]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            provider, results = await next_done
+            if results is None:
+                yield {"type": "provider_error", "provider": provider, "page": cursor.page}
+                continue
+
+            new_places = _take_new_places(cursor, results)
+            if new_places:
+                try:
+                    with SessionLocal() as db:
+                        attach_db_place_info(new_places, db)
+                except Exception:
+                    # DB 정보는 부가 정보이므로 실패해도 검색 결과는 그대로 보냄
+                    logger.exception("검색 결과 DB 정보 조회 실패")
+                if lang:
+                    try:
+                        new_places = await translate_place_search_results(new_places, lang)
+                    except Exception:
+                        logger.exception("번역 실패")
+            yield {"type": "places", "provider": provider, "page": cursor.page, "results": new_places}
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    next_cursor = search_cursor_store.save(cursor) if cursor.has_more else None
+    yield {"type": "end", "page": cursor.page, "has_more": cursor.has_more, "next_cursor": next_cursor}
+
+
+async def iter_ndjson(events: AsyncIterator[Dict]) -> AsyncIterator[str]:
+    """이벤트 dict -> NDJSON 한 줄씩 (Decimal 등은 jsonable_encoder 로 변환)"""
+    async for event in events:
+        yield json.dumps(jsonable_encoder(event), ensure_ascii=False) + "\n"
@@ -0,0 +1,96 @@
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from prometheus_client import Counter
+
+# ==================== 검색 커서 (서버 측 페이지 상태) ====================
+# 커서 검색은 다음 페이지를 요청할 때 앞 페이지를 다시 조회하지 않도록
+# 검색어, 업스트림별 다음 페이지 위치, 이미 보낸 장소(중복 제거 인덱스)를 서버 메모리에 잠깐 보관합니다.
+# - 토큰은 1번만 사용 (다음 페이지 응답 끝에 새 토큰 발급) → 같은 커서로 동시에 요청해도 상태가 꼬이지 않음
+# - 레플리카 간 공유하지 않으므로 만료/다른 레플리카로 간 커서는 410 으로 응답하고 클라이언트가 처음부터 다시 검색
+
+PLACES_SEARCH_CURSOR_TTL = float(os.getenv("PLACES_SEARCH_CURSOR_TTL", "300"))         # 마지막 사용 후 유지 시간 (초)
+PLACES_SEARCH_CURSOR_MAX_ENTRIES = int(os.getenv("PLACES_SEARCH_CURSOR_MAX_ENTRIES", "2000"))
+
+SEARCH_CURSOR_REQUESTS = Counter(
+    "places_search_cursor_requests_total",
+    "커서 검색 요청 결과",
+    ["result"],  # new / resumed / expired
+)
+
+
+class PlaceSearchCursor:
+    """
+    커서 1개의 검색 상태
+    - kakao_page: 다음에 요청할 카카오 페이지 번호 (None 이면 끝)
+    - google_token: 다음 구글 페이지 토큰, google_started: 첫 페이지를 받았는지 (토큰 None + started 면 끝)
+    - seen: 지금까지 보낸 장소의 DuplicatePlaceIndex (페이지 간 중복 제거)
+    - result_filter: 보낼 장소만 True (숙소 검색 등). 필요하면 장소 dict 를 수정해도 됨
+    """
+
+    def __init__(self, query: str, seen, city: Optional[str] = None,
+                 result_filter: Optional[Callable[[Dict], bool]] = None,
+                 kakao_enabled: bool = True, google_enabled: bool = True):
+        self.query = query
+        self.city = city
+        self.result_filter = result_filter
+        self.kakao_page: Optional[int] = 1 if kakao_enabled else None
+        self.google_token: Optional[str] = None
+        self.google_started = not google_enabled
+        self.page = 0
+        self.seen = seen
+
+    @property
+    def kakao_done(self) -> bool:
+        return self.kakao_page is None
+
+    @property
+    def google_done(self) -> bool:
+        return self.google_started and not self.google_token
+
+    @property
+    def has_more(self) -> bool:
+        return not (self.kakao_done and self.google_done)
+
+
+class SearchCursorStore:
+    """토큰 -> (마지막 사용 시각, 커서) LRU. 프로세스 메모리에만 보관."""
+
+    def __init__(self, ttl: float = PLACES_SEARCH_CURSOR_TTL, max_entries: int = PLACES_SEARCH_CURSOR_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._store: "OrderedDict[str, Tuple[float, PlaceSearchCursor]]" = OrderedDict()
+
+    def _purge_expired(self, now: float):
+        # 가장 오래 쓰지 않은 것부터 있으므로 앞에서부터 만료된 것만 제거
+        while self._store:
+            token, (used_at, _) = next(iter(self._store.items()))
+            if now - used_at <= self.ttl:
+                break
+            del self._store[token]
+
+    def save(self, cursor: PlaceSearchCursor) -> str:
+        """새 토큰을 발급해 저장"""
+        now = time.time()
+        self._purge_expired(now)
+        token = secrets.token_urlsafe(16)
+        self._store[token] = (now, cursor)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+        return token
+
+    def take(self, token: str) -> Optional[PlaceSearchCursor]:
+        """토큰의 커서를 꺼냄 (1회용). 없거나 만료됐으면 None"""
+        self._purge_expired(time.time())
+        entry = self._store.pop(token, None)
+        SEARCH_CURSOR_REQUESTS.labels("expired" if entry is None else "resumed").inc()
+        return None if entry is None else entry[1]
+
+    def stats(self) -> dict:
+        return {"entries": len(self._store), "max_entries": self.max_entries, "ttl": self.ttl}
+
+
+search_cursor_store = SearchCursorStore()
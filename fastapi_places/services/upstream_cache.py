@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+# ==================== 외부 API 응답 캐시 ====================
+# 같은 검색어("서울 맛집", "부산 숙박")로 카카오/구글을 반복 호출하지 않도록
+# - fresh_ttl 동안은 캐시 그대로 응답
+# - 그 뒤 stale_ttl 동안은 이전 값을 바로 응답하고 백그라운드에서 갱신 (stale-while-revalidate)
+# - 같은 키의 동시 miss 는 업스트림 호출 1번을 같이 기다림 (request coalescing)
+# - PLACES_CACHE_REDIS_URL 이 있으면 Redis 를 공유 저장소로 사용해 여러 레플리카가 hit 를 공유
+
+PLACES_CACHE_ENABLED = os.getenv("PLACES_CACHE_ENABLED", "true").lower() == "true"
+PLACES_CACHE_TTL = float(os.getenv("PLACES_CACHE_TTL", "600"))              # fresh (초)
+PLACES_CACHE_STALE_TTL = float(os.getenv("PLACES_CACHE_STALE_TTL", "3600"))  # fresh 이후 stale 로 응답 가능한 시간 (초)
+PLACES_CACHE_MAX_ENTRIES = int(os.getenv("PLACES_CACHE_MAX_ENTRIES", "5000"))
+PLACES_CACHE_REDIS_URL = os.getenv("PLACES_CACHE_REDIS_URL", "")
+
+UPSTREAM_CACHE_REQUESTS = Counter(
+    "places_upstream_cache_requests_total",
+    "외부 API 응답 캐시 조회 결과",
+    ["namespace", "result"],  # hit / stale / shared_hit / coalesced / miss
+)
+
+
+class RedisCacheBackend:
+    """여러 레플리카가 공유하는 2차 저장소 (redis.asyncio). 실패해도 요청은 메모리 캐시/업스트림으로 진행."""
+
+    def __init__(self, url: str, prefix: str = "places:upstream:"):
+        import redis.asyncio as redis_asyncio  # 선택 의존성
+
+        self.prefix = prefix
+        self._redis = redis_asyncio.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    async def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        raw = await self._redis.get(self.prefix + key)
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return data["stored_at"], data["value"]
+
+    async def set(self, key: str, stored_at: float, value: Any, ttl: float):
+        payload = json.dumps({"stored_at": stored_at, "value": value}, ensure_ascii=False)
+        await self._redis.set(self.prefix + key, payload, ex=max(1, int(ttl)))
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def create_shared_backend() -> Optional[RedisCacheBackend]:
+    if not PLACES_CACHE_REDIS_URL:
+        return None
+    try:
+        return RedisCacheBackend(PLACES_CACHE_REDIS_URL)
+    except ImportError:
+        logger.warning("PLACES_CACHE_REDIS_URL 이 설정됐지만 redis 패키지가 없어 메모리 캐시만 사용합니다.")
+        return None
+
+
+class UpstreamCache:
+    """
+    키 -> (저장 시각, 값) LRU 캐시 + 동시 요청 병합 + stale-while-revalidate.
+    값은 공유 저장소에 넣을 때 encode(JSON 직렬화 가능 형태), 꺼낼 때 decode 합니다.
+    """
+
+    def __init__(self, namespace: str, fresh_ttl: float = PLACES_CACHE_TTL,
+                 stale_ttl: float = PLACES_CACHE_STALE_TTL, max_entries: int = PLACES_CACHE_MAX_ENTRIES,
+                 backend=None, encode: Callable[[Any], Any] = lambda v: v,
+                 decode: Callable[[Any], Any] = lambda v: v):
+        self.namespace = namespace
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.backend = backend
+        self.encode = encode
+        self.decode = decode
+        self._store: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    # ---------- 메모리 저장소 ----------
+    def _get_local(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.fresh_ttl + self.stale_ttl:
+            del self._store[key]
+            return None
+        self._store.move_to_end(key)
+        return entry
+
+    def _put_local(self, key: str, stored_at: float, value: Any):
+        self._store[key] = (stored_at, value)
+        self._store.move_to_end(key)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+
+    # ---------- 공유 저장소 ----------
+    async def _get_shared(self, key: str) -> Optional[Tuple[float, Any]]:
+        if self.backend is None:
+            return None
+        try:
+            entry = await self.backend.get(f"{self.namespace}:{key}")
+        except Exception as e:
+            logger.warning(f"공유 캐시 조회 실패 ({self.namespace}): {e}")
+            return None
+        if entry is None:
+            return None
+        stored_at, encoded = entry
+        if time.time() - stored_at > self.fresh_ttl + self.stale_ttl:
+            return None
+        value = self.decode(encoded)
+        self._put_local(key, stored_at, value)
+        return stored_at, value
+
+    async def _set_shared(self, key: str, stored_at: float, value: Any):
+        if self.backend is None:
+            return
+        try:
+            await self.backend.set(f"{self.namespace}:{key}", stored_at, self.encode(value),
+                                   self.fresh_ttl + self.stale_ttl)
+        except Exception as e:
+            logger.warning(f"공유 캐시 저장 실패 ({self.namespace}): {e}")
+
+    # ---------- 조회 ----------
+    async def _fetch(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        stored_at = time.time()
+        self._put_local(key, stored_at, value)
+        await self._set_shared(key, stored_at, value)
+        return value
+
+    def _start_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Tuple[asyncio.Task, bool]:
+        """
+        같은 키의 업스트림 호출은 1개만 (별도 task 라 먼저 요청한 쪽이 취소돼도 나머지는 결과를 받음).
+        (task, 새로 시작했는지) 반환. 예외는 기다리던 호출 모두에 전달되고 캐시에는 저장하지 않음.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            return task, False
+        task = asyncio.create_task(self._fetch(key, loader))
+        self._inflight[key] = task
+
+        def done(t: asyncio.Task):
+            if self._inflight.get(key) is t:
+                del self._inflight[key]
+            if not t.cancelled() and t.exception() is not None:
+                logger.warning(f"외부 API 호출 실패 ({self.namespace}:{key}): {t.exception()}")
+
+        task.add_done_callback(done)
+        return task, True
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        fresh 면 그대로, stale 이면 이전 값 반환 + 백그라운드 갱신, 없으면 loader 호출 (동시 요청 병합).
+        반환값은 캐시와 공유되므로 호출측에서 수정하려면 복사해서 사용.
+        """
+        entry = self._get_local(key)
+        result = "hit"
+        if entry is None:
+            entry = await self._get_shared(key)
+            result = "shared_hit"
+
+        if entry is not None:
+            stored_at, value = entry
+            if time.time() - stored_at <= self.fresh_ttl:
+                UPSTREAM_CACHE_REQUESTS.labels(self.namespace, result).inc()
+                return value
+            UPSTREAM_CACHE_REQUESTS.labels(self.namespace, "stale").inc()
+            self._start_load(key, loader)  # 백그라운드 갱신 (이미 진행 중이면 그대로)
+            return value
+
+        task, started = self._start_load(key, loader)
+        UPSTREAM_CACHE_REQUESTS.labels(self.namespace, "miss" if started else "coalesced").inc()
+        return await asyncio.shield(task)
+
+    def clear(self):
+        self._store.clear()
+
+    def stats(self) -> dict:
+        return {"namespace": self.namespace, "entries": len(self._store), "max_entries": self.max_entries,
+                "fresh_ttl": self.fresh_ttl, "stale_ttl": self.stale_ttl, "inflight": len(self._inflight),
+                "shared_backend": self.backend is not None}
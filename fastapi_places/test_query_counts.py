@@ -0,0 +1,171 @@
+"""
+목록/상세 API 의 DB 쿼리 수 확인 (작성자/뱃지/섹션 이미지/장소 N+1 회귀 방지)
+
+SQLite 메모리 DB 에 데이터를 적게(1개) / 많게(작성자, 칼럼, 리뷰 등 여러 개) 넣고
+엔드포인트 함수를 직접 호출해 실행된 SQL 문 수를 셉니다. 데이터 양과 관계없이 같아야 합니다.
+
+실행 방법 (fastapi_places 폴더에서):
+    python test_query_counts.py
+    pytest test_query_counts.py
+"""
+import asyncio
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Ensure we can import from the app directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import Base
+from models import (
+    LocalBadge,
+    LocalColumn,
+    LocalColumnSection,
+    LocalColumnSectionImage,
+    Place,
+    PlaceReview,
+    Shortform,
+    TravelPlan,
+    User,
+)
+from routers.destinations import get_city_content
+from routers.local_columns import get_local_column_detail, get_local_columns
+from routers.reviews import get_place_reviews
+
+CITY = "서울"
+SMALL = 1
+LARGE = 8
+
+# 엔드포인트별 SQL 문 수 (데이터 양과 무관)
+EXPECTED_STATEMENTS = {
+    # 칼럼 목록 + 작성자 IN + 뱃지 IN
+    "local_columns": 3,
+    # 칼럼 + 조회수 UPDATE + 칼럼 재조회(commit 후) + 섹션 + 섹션 이미지 IN + 장소명 IN + 작성자 + 뱃지
+    "local_column_detail": 8,
+    # 리뷰 목록 + 작성자 IN + 전체 개수
+    "place_reviews": 3,
+    # 장소 + 칼럼 + 숏폼 + 여행일정 + 작성자 IN + 뱃지 IN
+    "city_content": 6,
+}
+
+
+def _create_session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@contextmanager
+def count_statements(engine):
+    """블록 안에서 실행된 SQL 문 수 (counter["n"])"""
+    counter = {"n": 0}
+
+    def before_cursor_execute(*args):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _seed(db, n: int) -> dict:
+    """작성자 n명 (각자 활성 뱃지 1개), 칼럼/리뷰/숏폼/여행일정 n개씩, 장소 15개"""
+    places = [
+        Place(name=f"장소{i}", address=f"{CITY} 중구 {i}", city=CITY,
+              latitude=Decimal("37.5"), longitude=Decimal("126.9"), place_api_id=f"p{i}")
+        for i in range(15)
+    ]
+    db.add_all(places)
+    users = [User(username=f"user{i}", nickname=f"닉네임{i}") for i in range(n)]
+    db.add_all(users)
+    db.flush()
+
+    today = date.today()
+    columns = []
+    for i, user in enumerate(users):
+        db.add(LocalBadge(user_id=user.id, city=CITY, level=i % 5 + 1, is_active=True,
+                          first_authenticated_at=today, last_authenticated_at=today,
+                          next_authentication_due=today))
+        column = LocalColumn(user_id=user.id, title=f"{CITY} 칼럼 {i}", content="내용")
+        for s in range(n):
+            section = LocalColumnSection(place_id=places[s % len(places)].id, order=s, title=f"섹션{s}",
+                                         content="섹션 내용")
+            section.images = [LocalColumnSectionImage(image_url=f"/media/{i}-{s}-{k}.jpg", order=k)
+                              for k in range(2)]
+            column.sections.append(section)
+        columns.append(column)
+        db.add(PlaceReview(place_id=places[0].id, user_id=user.id, rating=5, content="좋아요"))
+        db.add(Shortform(user_id=user.id, video_url="/v.mp4", title=f"{CITY} 숏폼 {i}"))
+        db.add(TravelPlan(user_id=user.id, title=f"{CITY} 여행 {i}", start_date=today, end_date=today,
+                          is_public=True))
+    db.add_all(columns)
+    db.commit()
+    return {"column_id": columns[0].id, "place_id": places[0].id}
+
+
+def _statement_count(name: str, n: int) -> int:
+    engine, session_factory = _create_session_factory()
+    with session_factory() as seed_db:
+        ids = _seed(seed_db, n)
+
+    # 시드할 때의 identity map 을 쓰지 않도록 새 세션으로 요청
+    with session_factory() as db, count_statements(engine) as counter:
+        if name == "local_columns":
+            result = asyncio.run(get_local_columns(city=None, query=None, writer=None, lang=None, page=1,
+                                                   limit=20, db=db, user_id_from_token=None))
+            assert len(result) == n and all(item.user_nickname and item.user_level for item in result)
+        elif name == "local_column_detail":
+            result = asyncio.run(get_local_column_detail(column_id=ids["column_id"], lang=None, db=db))
+            assert len(result.sections) == n
+            assert all(section.place_name and len(section.images) == 2 for section in result.sections)
+        elif name == "place_reviews":
+            result = asyncio.run(get_place_reviews(place_id=ids["place_id"], page=1, limit=20, order_by="latest",
+                                                   has_image=False, lang=None, db=db))
+            assert result["total"] == n and all(review["user_nickname"] for review in result["reviews"])
+        elif name == "city_content":
+            result = asyncio.run(get_city_content(city_name=CITY, target_lang="ko", db=db))
+            assert len(result.local_columns) == n and len(result.shortforms) == n and len(result.travel_plans) == n
+            assert all(column.user_level for column in result.local_columns)
+        else:
+            raise ValueError(name)
+    return counter["n"]
+
+
+def _assert_constant(name: str):
+    small = _statement_count(name, SMALL)
+    large = _statement_count(name, LARGE)
+    assert small == large == EXPECTED_STATEMENTS[name], (
+        f"{name}: 데이터 {SMALL}개 {small}번, {LARGE}개 {large}번 (기대값 {EXPECTED_STATEMENTS[name]}번)"
+    )
+
+
+def test_local_columns_query_count():
+    _assert_constant("local_columns")
+
+
+def test_local_column_detail_query_count():
+    _assert_constant("local_column_detail")
+
+
+def test_place_reviews_query_count():
+    _assert_constant("place_reviews")
+
+
+def test_city_content_query_count():
+    _assert_constant("city_content")
+
+
+if __name__ == "__main__":
+    for endpoint in EXPECTED_STATEMENTS:
+        print(f"{endpoint:22s} {SMALL}개: {_statement_count(endpoint, SMALL)}번, "
+              f"{LARGE}개: {_statement_count(endpoint, LARGE)}번")
+        _assert_constant(endpoint)
+    print("OK")